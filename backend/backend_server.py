@@ -1,24 +1,29 @@
 ﻿
 import os
 import sys
-import io
+import asyncio
+import gc
 import logging
+import threading
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import wraps
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from PIL import Image
+import numpy as np
 import uvicorn
 
 # Metrics collection imports
-from scripts.metrics_integration import metrics_collector, track_api_latency, track_model_inference
+from scripts.metrics_integration import SharedMetrics, metrics_collector, track_api_latency, track_model_inference
 
 # Setup path - add parent directory to path so imports work
 project_root = Path(__file__).parent.parent
@@ -33,8 +38,10 @@ except ImportError:
     config = Config
 
 # Now import services with absolute imports
-from services.cloudinary_service import CloudinaryImageService
-from services.pinecone_service import PineconeVectorService
+from services.vector_store import create_vector_store
+from services.local_image_service import create_image_service, LOCAL_IMAGE_URL_PREFIX
+from backend.executors import run_cpu, run_io, get_executor_stats, inference_threads, shutdown_pools
+from ml.image_loading import decode_rgb
 
 # Load .env after path setup
 load_dotenv()
@@ -44,41 +51,414 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 feature_extractor = None
-cloudinary_service = None
-pinecone_service = None
+image_service = None
+vector_store = None
 quantum_algorithm = None
+inference_batcher = None
+quantum_term_store = None
+embedding_cache = None
+faiss_replica = None
+index_stats = None
+query_cache = None
+vector_cache = None
+replica_consistent = False
+replica_checked_at = 0.0
+# True in a pre-fork server's parent: torch stays at one thread until configure_worker
+prefork_parent = False
+# Set in pre-forked workers (configure_worker) so metrics summaries cover every worker
+metrics_share = None
+
+# Startup warmup progress reported by /ready
+readiness = {'status': 'warming', 'steps': {}, 'started_at': None, 'ready_at': None, 'error': None}
+
+# Local stores that allow one writer process (the replica saves its index and
+# records from process memory), plus the query cache, whose invalidation only
+# sees this process's writes. MmapRowStore-backed stores (quantum terms, vector
+# values, embedding cache disk tier) lock row allocation and are shared.
+SINGLE_PROCESS_STORES = {
+    'ENABLE_FAISS_REPLICA': 'FAISS replica',
+    'ENABLE_QUERY_CACHE': 'query result cache',
+}
+
+# Display names for the configured storage backends
+VECTOR_STORE_NAMES = {'pinecone': 'Pinecone', 'embedded': 'Embedded'}
+STORAGE_NAMES = {'cloudinary': 'Cloudinary', 'local': 'Local disk'}
 
 # Initialize metrics collector
 metrics_collector.project_name = "Quantum Flow - Image Analysis API"
+metrics_collector.reservoir_size = config.METRICS_RESERVOIR_SIZE
+metrics_collector.verbose = config.METRICS_VERBOSE
 
 
+def single_flight(getter):
+    """Serialize a lazy singleton getter so concurrent first calls build the instance once"""
+    lock = threading.RLock()
+
+    @wraps(getter)
+    def wrapper():
+        with lock:
+            return getter()
+    return wrapper
+
+
+def apply_thread_budget():
+    """Size torch's thread pool so concurrent inference calls do not oversubscribe the cores"""
+    if prefork_parent:
+        return
+    import torch
+    torch.set_num_threads(inference_threads())
+
+
+@single_flight
 def get_feature_extractor():
     """Initialize ResNet-50 feature extractor"""
     global feature_extractor
     if feature_extractor is None:
+        apply_thread_budget()
         from ml.unified_feature_extractor import UnifiedFeatureExtractor
-        feature_extractor = UnifiedFeatureExtractor(
-            feature_dim=config.FEATURE_DIMENSION,
-            use_amp=True
-        )
+        feature_extractor = UnifiedFeatureExtractor.from_config(config)
         logger.info("✅ ResNet-50 feature extractor initialized")
     return feature_extractor
 
 
-def get_cloudinary_service():
-    global cloudinary_service
-    if cloudinary_service is None:
-        cloudinary_service = CloudinaryImageService()
-    return cloudinary_service
+@single_flight
+def get_inference_batcher():
+    """Initialize shared micro-batching queue in front of the feature extractor"""
+    global inference_batcher
+    if inference_batcher is None:
+        from ml.inference_batcher import InferenceBatcher
+        inference_batcher = InferenceBatcher(
+            get_feature_extractor(),
+            max_batch_size=config.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=config.INFERENCE_MAX_WAIT_MS
+        )
+    return inference_batcher
+
+
+@single_flight
+def get_embedding_cache():
+    """Initialize content-addressed cache of upload embeddings"""
+    global embedding_cache
+    if embedding_cache is None and config.ENABLE_EMBEDDING_CACHE:
+        from ml.embedding_cache import EmbeddingCache
+        extractor = get_feature_extractor()
+        embedding_cache = EmbeddingCache(
+            config.EMBEDDING_CACHE_DIR,
+            extractor.model_version,
+            extractor.get_feature_dim(),
+            memory_items=config.EMBEDDING_CACHE_MEMORY_ITEMS,
+            disk_items=config.EMBEDDING_CACHE_DISK_ITEMS
+        )
+        logger.info("✅ Embedding cache initialized")
+    return embedding_cache
+
+
+def decode_image(contents: bytes) -> Image.Image:
+    """Decode uploaded bytes into an RGB PIL image (no extra copy when already RGB)"""
+    # Reduced decode target follows the extractor's IMAGE_DECODE_MODE
+    return decode_rgb(contents, get_feature_extractor().decode_min_side)
+
+
+async def extract_image_features(image):
+    """Extract features for one image, batched with concurrent requests when enabled"""
+    if config.ENABLE_INFERENCE_BATCHING:
+        batcher = inference_batcher or await run_cpu(get_inference_batcher)
+        return await batcher.extract_features_async(image)
+    return await run_cpu(lambda: get_feature_extractor().extract_features(image))
+
+
+async def embed_upload(contents: bytes):
+    """Features for uploaded bytes; repeat uploads skip decode and inference"""
+    cache = None
+    if config.ENABLE_EMBEDDING_CACHE:
+        cache = embedding_cache or await run_cpu(get_embedding_cache)
+        key, features = await run_cpu(cache.lookup, contents)
+        if features is not None:
+            return features
+
+    image = await run_cpu(decode_image, contents)
+    features = await extract_image_features(image)
+
+    if cache is not None:
+        # Writes the disk tier (mmap row, key log, possible resize), so off the event loop
+        await run_io(cache.put, key, features)
+    return features
+
 
+def quantum_rerank(quantum_algo, features, candidates):
+    """Score candidates with the quantum algorithm in one batch and sort them in place"""
+    term_store = get_quantum_term_store()
 
-def get_pinecone_service():
-    global pinecone_service
-    if pinecone_service is None:
-        pinecone_service = PineconeVectorService()
-    return pinecone_service
+    if term_store is not None:
+        # Precomputed terms (backfilled from vector values when missing)
+        scores, available = term_store.score(
+            features,
+            [c['id'] for c in candidates],
+            [c.get('values') for c in candidates]
+        )
+        scored = [c for c, ok in zip(candidates, available) if ok]
+        quantum_scores = scores[available]
+    else:
+        # Candidates with vector values (from the vector store) are re-ranked together
+        scored = [c for c in candidates if c.get('values') is not None and len(c['values']) > 0]
+        quantum_scores = []
+        if scored:
+            candidate_matrix = np.asarray([c['values'] for c in scored], dtype=np.float32)
+            quantum_scores = quantum_algo.calculate_similarity_batch(features, candidate_matrix)
+
+    for candidate, quantum_sim in zip(scored, quantum_scores):
+        candidate['quantum_score'] = float(quantum_sim)
+        candidate['classical_score'] = float(candidate['score'])
+        candidate['similarity_boost'] = float(quantum_sim - candidate['score'])
+
+    for candidate in candidates:
+        if 'quantum_score' not in candidate:
+            # Fallback to classical score if no vector values
+            logger.warning(f"⚠️ No vector values for {candidate['id']}, using classical score")
+            candidate['quantum_score'] = candidate['score']
+            candidate['classical_score'] = candidate['score']
+            candidate['similarity_boost'] = 0.0
+
+    # Sort by quantum score
+    candidates.sort(key=lambda x: x['quantum_score'], reverse=True)
+    return candidates
+
+
+def quantum_breakdown(quantum_algo, features, candidates):
+    """Build the detailed per-candidate quantum breakdown in one batch"""
+    if not candidates:
+        return []
+
+    candidate_matrix = np.asarray([
+        candidate['values'] if candidate.get('values') is not None and len(candidate['values']) > 0
+        else candidate.get('metadata', {}).get('features') or features
+        for candidate in candidates
+    ], dtype=np.float32)
+    breakdowns = quantum_algo.calculate_similarity_with_breakdown_batch(
+        features,
+        candidate_matrix
+    )
+
+    detailed_results = []
+    for candidate, breakdown in zip(candidates, breakdowns):
+        metrics = {
+            'overall_similarity': float(breakdown['similarity']),
+            'classical_cosine': float(breakdown['classical']),
+            'quantum_fidelity': float(breakdown['quantum_fidelity']),
+            'phase_coherence': float(breakdown['phase_coherence']),
+            'amplitude_estimated': float(breakdown['amplitude_estimated']),
+            'combined': float(breakdown['combined'])
+        }
+        if 'entanglement' in breakdown:
+            metrics['entanglement'] = float(breakdown['entanglement'])
+
+        detailed_results.append({
+            'image_url': candidate['metadata'].get('cloudinary_url'),
+            'filename': candidate['metadata'].get('filename'),
+            'category': candidate['metadata'].get('category'),
+            'metrics': metrics,
+            'quantum_advantage': float(breakdown['similarity'] - breakdown['classical'])
+        })
+    return detailed_results
+
+
+@single_flight
+def get_image_service():
+    """Initialize configured image storage (Cloudinary or local disk)"""
+    global image_service
+    if image_service is None:
+        image_service = create_image_service()
+    return image_service
+
+
+@single_flight
+def get_vector_store():
+    """Initialize configured vector store (Pinecone or embedded)"""
+    global vector_store
+    if vector_store is None:
+        vector_store = create_vector_store()
+        term_store = get_quantum_term_store()
+        if term_store is not None:
+            vector_store.add_write_listener(term_store)
+        replica = get_faiss_replica()
+        if replica is not None:
+            vector_store.add_write_listener(replica)
+        cache = get_query_cache()
+        if cache is not None:
+            vector_store.add_write_listener(cache)
+        values = get_vector_cache()
+        if values is not None:
+            vector_store.add_write_listener(values)
+    return vector_store
+
+
+@single_flight
+def get_vector_cache():
+    """Initialize local cache of vector values (filled as a vector-store write listener)"""
+    global vector_cache
+    if vector_cache is None and config.ENABLE_VECTOR_CACHE:
+        from services.vector_cache import VectorValueCache
+        vector_cache = VectorValueCache(config.VECTOR_CACHE_DIR, config.FEATURE_DIMENSION)
+        logger.info(f"✅ Vector value cache ready ({len(vector_cache.store)} vectors)")
+    return vector_cache
+
+
+def attach_vector_values(candidates):
+    """Give candidates searched without values their vectors: local cache first, then one fetch"""
+    store = get_vector_store()
+    if vector_cache is not None:
+        return vector_cache.attach(candidates, store.fetch)
+
+    missing = [c['id'] for c in candidates if not c.get('values')]
+    if not missing:
+        return 0
+    try:
+        fetched = store.fetch(missing)
+    except Exception as e:
+        logger.error(f"❌ Vector fetch failed: {e}")
+        return 0
+    for candidate in candidates:
+        if candidate['id'] in fetched:
+            candidate['values'] = fetched[candidate['id']]['values']
+    return len(fetched)
+
+
+@single_flight
+def get_query_cache():
+    """Initialize search result cache (invalidated as a vector-store write listener)"""
+    global query_cache
+    if query_cache is None and config.ENABLE_QUERY_CACHE:
+        from services.query_cache import QueryCache
+        query_cache = QueryCache(
+            max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+            max_mb=config.QUERY_CACHE_MAX_MB,
+            quantization=config.QUERY_CACHE_QUANTIZATION,
+            max_age=config.QUERY_CACHE_MAX_AGE
+        )
+        logger.info("✅ Query result cache initialized")
+    return query_cache
+
+
+@single_flight
+def get_index_stats():
+    """Initialize cached index statistics, counting writes as a listener"""
+    global index_stats
+    if index_stats is None:
+        from services.stats_service import IndexStatsService
+        stats_service = IndexStatsService(get_vector_store(), ttl=config.INDEX_STATS_TTL)
+        if config.WEB_WORKERS == 1:
+            # Other workers' writes are not seen here; with several, counts come from refreshes only
+            vector_store.add_write_listener(stats_service)
+        stats_service.refresh_async()
+        index_stats = stats_service
+    return index_stats
+
+
+async def index_statistics():
+    """Index stats from the cache; only requests before the first refresh wait for the store"""
+    stats_service = index_stats or await run_io(get_index_stats)
+    stats = stats_service.get_statistics()
+    if stats is None:
+        stats = await run_io(stats_service.refresh)
+    return stats
+
+
+@single_flight
+def get_faiss_replica():
+    """Load local FAISS replica of the vector index"""
+    global faiss_replica
+    if faiss_replica is None and config.ENABLE_FAISS_REPLICA:
+        try:
+            from services.faiss_replica import FaissReplica
+            faiss_replica = FaissReplica(
+                config.FAISS_REPLICA_DIR,
+                config.FEATURE_DIMENSION,
+                hnsw_m=config.FAISS_HNSW_M,
+                ef_search=config.FAISS_EF_SEARCH,
+                save_every=config.FAISS_REPLICA_SAVE_EVERY
+            )
+            logger.info(f"✅ FAISS replica ready ({len(faiss_replica)} vectors)")
+        except Exception as e:
+            logger.warning(f"⚠️ FAISS replica not available: {e}")
+            faiss_replica = None
+    return faiss_replica
+
+
+async def replica_is_consistent(replica) -> bool:
+    """Compare replica and index counts at most once per check interval"""
+    global replica_consistent, replica_checked_at
+    now = time.time()
+    if now - replica_checked_at < config.FAISS_REPLICA_CHECK_INTERVAL:
+        return replica_consistent
+    replica_checked_at = now
+
+    stats = await run_io(lambda: get_vector_store().get_statistics())
+    consistent = 'error' not in stats and stats['total_vector_count'] == len(replica)
+    if not consistent and replica.last_write_at > now - config.FAISS_REPLICA_CHECK_INTERVAL:
+        # Index stats lag behind our own recent writes; keep the previous verdict
+        return replica_consistent
+    if consistent != replica_consistent:
+        if consistent:
+            logger.info("✅ FAISS replica in sync, serving searches locally")
+        else:
+            logger.warning(
+                f"⚠️ FAISS replica out of sync ({len(replica)} vs "
+                f"{stats['total_vector_count']} vectors), searching the vector store"
+            )
+    replica_consistent = consistent
+    return replica_consistent
 
 
+async def search_vectors(
+    features,
+    top_k: int = 10,
+    category_filter: str = None,
+    min_score: float = 0.0,
+    include_values: bool = False
+):
+    """
+    Similarity search through the result cache, then the local replica when in sync, then the vector store
+
+    Matches carry 'values' only with include_values (re-ranking). With the
+    vector value cache enabled they are read locally instead of being
+    transferred with the search results.
+    """
+    if vector_store is None and (
+        config.ENABLE_FAISS_REPLICA or config.ENABLE_QUERY_CACHE or config.ENABLE_VECTOR_CACHE
+    ):
+        # Loads the replica/caches and registers them as write listeners
+        await run_io(get_vector_store)
+
+    # Values come back with the search only when they can't be read locally
+    remote_values = include_values and vector_cache is None
+
+    cache = query_cache
+    if cache is not None:
+        if index_stats is not None:
+            # Writes by other processes show up as index count changes at stats refreshes
+            cache.sync_external_writes(index_stats.external_changes)
+        key, generation, matches = cache.lookup(
+            features, top_k, category_filter, min_score, include_values=remote_values
+        )
+    if cache is None or matches is None:
+        replica = faiss_replica if config.ENABLE_FAISS_REPLICA else None
+        if replica is not None and await replica_is_consistent(replica):
+            matches = await run_cpu(
+                lambda: replica.search(features, top_k, category_filter, min_score, remote_values)
+            )
+        else:
+            matches = await run_io(
+                lambda: get_vector_store().search(features, top_k, category_filter, min_score, remote_values)
+            )
+        if cache is not None:
+            cache.put(key, generation, matches)
+
+    if include_values and not remote_values and matches:
+        await run_io(attach_vector_values, matches)
+    return matches
+
+
+@single_flight
 def get_quantum_algorithm():
     """Initialize quantum algorithm for enhanced similarity"""
     global quantum_algorithm
@@ -89,7 +469,9 @@ def get_quantum_algorithm():
             quantum_algorithm = AEQIPAlgorithm(
                 use_quantum_inspired=(config.QUANTUM_MODE == 'inspired'),
                 n_precision_qubits=config.QUANTUM_PRECISION_QUBITS,
-                enable_entanglement=config.ENABLE_QUANTUM_ENTANGLEMENT
+                enable_entanglement=config.ENABLE_QUANTUM_ENTANGLEMENT,
+                quantum_shots=config.QUANTUM_SHOTS,
+                exact_probabilities=config.QUANTUM_EXACT_PROBABILITIES
             )
             circuit_info = quantum_algorithm.get_circuit_info()
             logger.info(f"✅ Quantum algorithm ready! {circuit_info['total_qubits']} qubits")
@@ -99,7 +481,200 @@ def get_quantum_algorithm():
     return quantum_algorithm
 
 
-app = FastAPI(title='Quantum Image API', version='3.0.0')
+@single_flight
+def get_quantum_term_store():
+    """Initialize on-disk store of precomputed quantum terms (inspired mode only)"""
+    global quantum_term_store
+    if quantum_term_store is None and config.ENABLE_QUANTUM_TERM_STORE:
+        quantum_algo = get_quantum_algorithm()
+        if quantum_algo is not None and quantum_algo.use_quantum_inspired:
+            from ml.quantum.term_store import QuantumTermStore
+            quantum_term_store = QuantumTermStore(
+                quantum_algo,
+                config.QUANTUM_TERM_STORE_DIR,
+                config.FEATURE_DIMENSION
+            )
+            logger.info(f"✅ Quantum term store ready ({len(quantum_term_store.store)} vectors)")
+    return quantum_term_store
+
+
+def warmup_feature_extractor():
+    """Load the extractor and run inference at the batch sizes production uses"""
+    extractor = get_feature_extractor()
+    image = Image.new('RGB', (256, 256), (128, 128, 128))
+    batch_sizes = [1]
+    if config.ENABLE_INFERENCE_BATCHING:
+        get_inference_batcher()
+        batch_sizes.append(config.INFERENCE_MAX_BATCH_SIZE)
+    for _ in range(config.WARMUP_ITERATIONS):
+        for batch_size in batch_sizes:
+            if batch_size == 1:
+                extractor.extract_features(image)
+            else:
+                extractor.extract_batch_features([image] * batch_size)
+    get_embedding_cache()
+    return {'batch_sizes': batch_sizes, 'iterations': config.WARMUP_ITERATIONS}
+
+
+def warmup_vector_store():
+    """Create the vector store client with its listeners and load index stats"""
+    get_vector_store()
+    get_index_stats()
+    return {'quantum': get_quantum_algorithm() is not None}
+
+
+async def warmup():
+    """Build every singleton a search needs before the worker reports ready"""
+    readiness['started_at'] = datetime.utcnow().isoformat()
+    start = time.perf_counter()
+    steps = [('vector_store', run_io, warmup_vector_store),
+             ('feature_extractor', run_cpu, warmup_feature_extractor)]
+    try:
+        for name, run, step in steps:
+            readiness['steps'][name] = {'status': 'warming'}
+            step_start = time.perf_counter()
+            details = await run(step)
+            readiness['steps'][name] = {
+                'status': 'ready', 'seconds': round(time.perf_counter() - step_start, 3), **details
+            }
+        readiness['status'] = 'ready'
+        readiness['ready_at'] = datetime.utcnow().isoformat()
+        logger.info(f"✅ Warmup finished in {time.perf_counter() - start:.1f}s, worker ready")
+    except Exception as e:
+        readiness['steps'][name]['status'] = 'failed'
+        readiness['status'] = 'failed'
+        readiness['error'] = str(e)
+        logger.error(f"❌ Warmup failed: {e}")
+
+
+def shutdown_executors():
+    """Release pool threads when the worker stops"""
+    if inference_batcher is not None:
+        inference_batcher.shutdown()
+    if embedding_cache is not None:
+        embedding_cache.close()
+    if faiss_replica is not None and faiss_replica.get_stats()['unsaved_writes']:
+        faiss_replica.save()
+    shutdown_pools(wait=False)
+
+
+def restrict_local_stores(workers: int):
+    """
+    Keep several worker processes off stores that allow a single writer
+
+    The FAISS replica and the query cache are turned off. The embedded
+    vector store must be opened read-only.
+
+    Args:
+        workers: Number of worker processes the server runs
+
+    Raises:
+        RuntimeError: If the embedded vector store is writable
+    """
+    if workers <= 1:
+        return
+    if config.VECTOR_STORE_BACKEND == 'embedded' and not config.EMBEDDED_STORE_READ_ONLY:
+        raise RuntimeError(
+            f"WEB_WORKERS={workers} with the embedded vector store, which allows one writer process. "
+            "Use VECTOR_STORE_BACKEND=pinecone, EMBEDDED_STORE_READ_ONLY=true or WEB_WORKERS=1"
+        )
+
+    disabled = [name for flag, name in SINGLE_PROCESS_STORES.items() if getattr(config, flag)]
+    for flag in SINGLE_PROCESS_STORES:
+        setattr(config, flag, False)
+    if disabled:
+        logger.warning(f"⚠️ {workers} workers: turned off single-process stores: {', '.join(disabled)}")
+
+
+def prepare_prefork(workers: int):
+    """
+    Load model weights in a pre-fork server's parent process (gunicorn.conf.py)
+
+    Workers forked afterwards share the weights copy-on-write instead of each
+    loading its own copy. The parent runs no inference and keeps torch at one
+    thread, so no OpenMP pool exists to be broken by fork; warmup inferences
+    run in each worker.
+
+    Args:
+        workers: Number of worker processes the server will fork
+
+    Raises:
+        RuntimeError: If a configured store cannot be shared by the workers
+    """
+    global prefork_parent
+    import torch
+    restrict_local_stores(workers)
+    prefork_parent = True
+    torch.set_num_threads(1)
+    try:
+        get_feature_extractor()
+    except Exception as e:
+        logger.error(f"❌ Could not preload feature extractor, workers load it themselves: {e}")
+    get_quantum_algorithm()
+    if config.METRICS_SHARED_DIR:
+        SharedMetrics(config.METRICS_SHARED_DIR).clear()
+    # Keep the garbage collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+
+
+def configure_worker(workers: int):
+    """
+    Per-process setup in a forked worker: split the cores between workers and
+    share metrics through METRICS_SHARED_DIR
+
+    Args:
+        workers: Number of worker processes the server runs
+    """
+    global metrics_share, prefork_parent
+    restrict_local_stores(workers)
+    prefork_parent = False
+    # The CPU pool and torch threads are sized from this worker's share of the cores
+    config.WEB_WORKERS = workers
+    apply_thread_budget()
+    if workers > 1 and config.METRICS_SHARED_DIR:
+        metrics_share = SharedMetrics(config.METRICS_SHARED_DIR)
+    logger.info(f"Worker {os.getpid()} ready to serve ({inference_threads()} torch threads, {workers} workers)")
+
+
+def collected_metrics():
+    """Metrics of every worker (or just this process when serving with one)"""
+    if metrics_share is None:
+        return metrics_collector, 1
+    return metrics_share.merged(metrics_collector)
+
+
+async def publish_metrics():
+    """Publish this worker's metrics for the other workers every METRICS_PUBLISH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(config.METRICS_PUBLISH_INTERVAL)
+        try:
+            await run_io(metrics_share.publish, metrics_collector)
+        except Exception as e:
+            logger.error(f"Metrics publish error: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Warm the worker in the background (/health answers at once), clean up on exit"""
+    tasks = []
+    if config.ENABLE_WARMUP:
+        tasks.append(asyncio.create_task(warmup()))
+    else:
+        readiness['status'] = 'ready'  # singletons load on first use
+    if metrics_share is not None:
+        tasks.append(asyncio.create_task(publish_metrics()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        if metrics_share is not None:
+            metrics_share.publish(metrics_collector)
+        shutdown_executors()
+
+
+app = FastAPI(title='Quantum Image API', version='3.0.0', lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
@@ -110,7 +685,11 @@ app.add_middleware(
 
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=config.RATE_LIMIT_ENABLED,
+    storage_uri=config.RATE_LIMIT_STORAGE_URI
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
 
@@ -126,7 +705,7 @@ async def root():
     # Fallback: return API info (for dev/testing)
     quantum_info = {'enabled': False}
     if config.USE_QUANTUM_SIMILARITY:
-        quantum_algo = get_quantum_algorithm()
+        quantum_algo = await run_cpu(get_quantum_algorithm)
         if quantum_algo:
             quantum_info = {
                 'enabled': True,
@@ -136,11 +715,11 @@ async def root():
     
     return {
         'message': 'Quantum Image API v3.0',
-        'storage': 'Cloudinary',
-        'vectors': 'Pinecone',
+        'storage': STORAGE_NAMES.get(config.IMAGE_STORAGE_BACKEND, config.IMAGE_STORAGE_BACKEND),
+        'vectors': VECTOR_STORE_NAMES.get(config.VECTOR_STORE_BACKEND, config.VECTOR_STORE_BACKEND),
         'quantum': quantum_info,
         'features': ['rate-limiting', 'quantum-enhanced', 'batch-upload'],
-        'database_size': get_pinecone_service().get_statistics()['total_vector_count']
+        'database_size': (await index_statistics())['total_vector_count']
     }
 
 
@@ -149,7 +728,7 @@ async def api_info():
     """API information endpoint"""
     quantum_info = {'enabled': False}
     if config.USE_QUANTUM_SIMILARITY:
-        quantum_algo = get_quantum_algorithm()
+        quantum_algo = await run_cpu(get_quantum_algorithm)
         if quantum_algo:
             quantum_info = {
                 'enabled': True,
@@ -159,11 +738,11 @@ async def api_info():
     
     return {
         'message': 'Quantum Image API v3.0',
-        'storage': 'Cloudinary',
-        'vectors': 'Pinecone',
+        'storage': STORAGE_NAMES.get(config.IMAGE_STORAGE_BACKEND, config.IMAGE_STORAGE_BACKEND),
+        'vectors': VECTOR_STORE_NAMES.get(config.VECTOR_STORE_BACKEND, config.VECTOR_STORE_BACKEND),
         'quantum': quantum_info,
         'features': ['rate-limiting', 'quantum-enhanced', 'batch-upload'],
-        'database_size': get_pinecone_service().get_statistics()['total_vector_count']
+        'database_size': (await index_statistics())['total_vector_count']
     }
 
 
@@ -176,11 +755,10 @@ async def upload_image(request: Request, file: UploadFile = File(...)):
         contents = await file.read()
 
         # Extract features
-        image = Image.open(io.BytesIO(contents)).convert('RGB')
-        features = get_feature_extractor().extract_features(image)
+        features = await embed_upload(contents)
 
         # Search similar images
-        matches = get_pinecone_service().search(
+        matches = await search_vectors(
             features,
             top_k=10,
             min_score=config.GOOD_CONFIDENCE_THRESHOLD
@@ -219,18 +797,19 @@ async def upload_and_store(
         contents = await file.read()
 
         # Extract features
-        image = Image.open(io.BytesIO(contents)).convert('RGB')
-        features = get_feature_extractor().extract_features(image)
+        features = await embed_upload(contents)
 
-        # Upload to Cloudinary
+        # Upload to image storage
         filename = file.filename or 'untitled.jpg'
-        result = get_cloudinary_service().upload_image(
-            contents,
-            filename,
-            category
+        result = await run_io(
+            lambda: get_image_service().upload_image(
+                contents,
+                filename,
+                category
+            )
         )
 
-        # Store in Pinecone
+        # Store in vector index
         vector_id = result['public_id'].replace('/', '_')
         metadata = {
             'filename': file.filename,
@@ -238,10 +817,12 @@ async def upload_and_store(
             'cloudinary_url': result['secure_url'],
             'uploaded_at': datetime.utcnow().isoformat()
         }
-        get_pinecone_service().upsert_vector(vector_id, features, metadata)
+        await run_io(
+            lambda: get_vector_store().upsert_vector(vector_id, features, metadata)
+        )
 
         # Search similar
-        matches = get_pinecone_service().search(
+        matches = await search_vectors(
             features,
             top_k=10,
             category_filter=category,
@@ -273,7 +854,7 @@ async def upload_and_store(
 
 @app.get('/api/stats')
 async def get_stats():
-    stats = get_pinecone_service().get_statistics()
+    stats = await index_statistics()
     return {
         'success': True,
         'statistics': stats
@@ -290,43 +871,29 @@ async def search_images_quantum(request: Request, file: UploadFile = File(...)):
         contents = await file.read()
         
         # Extract features
-        image = Image.open(io.BytesIO(contents)).convert('RGB')
-        features = get_feature_extractor().extract_features(image)
+        features = await embed_upload(contents)
         
-        # Get candidates from Pinecone (classical search)
-        candidates = get_pinecone_service().search(
+        quantum_algo = await run_cpu(get_quantum_algorithm)
+        term_store = await run_cpu(get_quantum_term_store) if quantum_algo else None
+        
+        # Get candidates from the vector index (classical search); re-ranking
+        # without precomputed terms needs every candidate's vector values
+        candidates = await search_vectors(
             features,
-            top_k=50,  # Get more candidates for quantum re-ranking
-            min_score=0.70  # Lower threshold for candidates
+            top_k=config.QUANTUM_RERANK_CANDIDATES,  # More candidates for quantum re-ranking
+            min_score=0.70,  # Lower threshold for candidates
+            include_values=quantum_algo is not None and term_store is None
         )
         
         # Apply quantum re-ranking if enabled
-        quantum_algo = get_quantum_algorithm()
         if quantum_algo and len(candidates) > 0:
+            if term_store is not None:
+                # Values only for candidates whose terms were never computed
+                missing = [c for c in candidates if c['id'] not in term_store.store]
+                if missing:
+                    await run_io(attach_vector_values, missing)
             logger.info(f"⚛️ Applying quantum re-ranking to {len(candidates)} candidates")
-            
-            for candidate in candidates:
-                # Get candidate features (vector values from Pinecone)
-                candidate_features = candidate.get('values')
-                
-                if candidate_features and len(candidate_features) > 0:
-                    # Calculate quantum-enhanced similarity
-                    quantum_sim = quantum_algo.calculate_similarity(
-                        features,
-                        candidate_features
-                    )
-                    candidate['quantum_score'] = float(quantum_sim)
-                    candidate['classical_score'] = float(candidate['score'])
-                    candidate['similarity_boost'] = float(quantum_sim - candidate['score'])
-                else:
-                    # Fallback to classical score if no vector values
-                    logger.warning(f"⚠️ No vector values for {candidate['id']}, using classical score")
-                    candidate['quantum_score'] = candidate['score']
-                    candidate['classical_score'] = candidate['score']
-                    candidate['similarity_boost'] = 0.0
-            
-            # Sort by quantum score
-            candidates.sort(key=lambda x: x['quantum_score'], reverse=True)
+            await run_cpu(quantum_rerank, quantum_algo, features, candidates)
             search_method = 'quantum-enhanced'
         else:
             # Fallback to classical
@@ -372,43 +939,21 @@ async def search_quantum_detailed(request: Request, file: UploadFile = File(...)
         contents = await file.read()
         
         # Extract features
-        image = Image.open(io.BytesIO(contents)).convert('RGB')
-        features = get_feature_extractor().extract_features(image)
+        features = await embed_upload(contents)
         
         # Get candidates
-        candidates = get_pinecone_service().search(
+        candidates = await search_vectors(
             features,
             top_k=20,
-            min_score=0.70
+            min_score=0.70,
+            include_values=True
         )
         
-        quantum_algo = get_quantum_algorithm()
+        quantum_algo = await run_cpu(get_quantum_algorithm)
         if not quantum_algo:
             raise HTTPException(400, "Quantum algorithm not enabled")
         
-        detailed_results = []
-        for candidate in candidates:
-            # Get full quantum breakdown
-            breakdown = quantum_algo.calculate_similarity_with_breakdown(
-                features,
-                candidate.get('values', candidate.get('metadata', {}).get('features', features))
-            )
-            
-            detailed_results.append({
-                'image_url': candidate['metadata'].get('cloudinary_url'),
-                'filename': candidate['metadata'].get('filename'),
-                'category': candidate['metadata'].get('category'),
-                'metrics': {
-                    'overall_similarity': float(breakdown['similarity']),
-                    'classical_cosine': float(breakdown['classical']),
-                    'quantum_fidelity': float(breakdown['quantum_fidelity']),
-                    'phase_coherence': float(breakdown['phase_coherence']),
-                    'amplitude_estimated': float(breakdown['amplitude_estimated']),
-                    'combined': float(breakdown['combined'])
-                },
-                'quantum_advantage': float(breakdown['similarity'] - breakdown['classical'])
-            })
-        
+        detailed_results = await run_cpu(quantum_breakdown, quantum_algo, features, candidates)
         # Sort by overall similarity
         detailed_results.sort(key=lambda x: x['metrics']['overall_similarity'], reverse=True)
         
@@ -429,17 +974,25 @@ async def search_quantum_detailed(request: Request, file: UploadFile = File(...)
 
 @app.get('/health')
 async def health():
+    """Liveness: the process is serving requests (it may still be warming up)"""
     return {'status': 'healthy'}
 
 
+@app.get('/ready')
+async def ready():
+    """Readiness: 200 once warmup has loaded the models and clients, 503 while warming or failed"""
+    body = {**readiness, 'steps': dict(readiness['steps'])}
+    return JSONResponse(body, status_code=200 if readiness['status'] == 'ready' else 503)
+
+
 @app.get('/api/health')
 async def api_health():
     """Health check endpoint for frontend"""
     return {
         'status': 'healthy',
         'feature_extractor': 'ResNet-50',
-        'retrieval_system': 'Pinecone',
-        'storage': 'Cloudinary',
+        'retrieval_system': VECTOR_STORE_NAMES.get(config.VECTOR_STORE_BACKEND, config.VECTOR_STORE_BACKEND),
+        'storage': STORAGE_NAMES.get(config.IMAGE_STORAGE_BACKEND, config.IMAGE_STORAGE_BACKEND),
         'vectors': 'Quantum-Enhanced'
     }
 
@@ -459,7 +1012,7 @@ async def get_categories():
 async def search_by_features(request: Request, features: list):
     """Search images by feature vector"""
     try:
-        matches = get_pinecone_service().search(
+        matches = await search_vectors(
             features,
             top_k=10,
             min_score=config.GOOD_CONFIDENCE_THRESHOLD
@@ -484,13 +1037,13 @@ async def search_by_features(request: Request, features: list):
 
 @app.get('/api/image/{image_id}')
 async def get_image(image_id: str):
-    """Get image by ID (returns Cloudinary URL)"""
+    """Get image by ID (returns the stored image URL)"""
     try:
-        # Query Pinecone for image metadata
-        result = get_pinecone_service().index.fetch([image_id])
+        # Query the vector store for image metadata
+        result = await run_io(lambda: get_vector_store().fetch([image_id]))
         
-        if image_id in result['vectors']:
-            metadata = result['vectors'][image_id]['metadata']
+        if image_id in result:
+            metadata = result[image_id]['metadata']
             return {
                 'success': True,
                 'image_url': metadata.get('cloudinary_url'),
@@ -508,18 +1061,29 @@ async def get_image(image_id: str):
 
 @app.get('/api/metrics/summary')
 async def get_metrics_summary():
-    """Get performance metrics summary"""
+    """Get performance metrics summary (accuracy and latency cover every worker)"""
     try:
-        accuracy_summary = metrics_collector.get_accuracy_summary()
-        latency_summary = metrics_collector.get_latency_summary()
-        efficiency_summary = metrics_collector.get_efficiency_summary()
+        collector, workers = await run_io(collected_metrics)
+        accuracy_summary = collector.get_accuracy_summary()
+        latency_summary = collector.get_latency_summary()
+        efficiency_summary = collector.get_efficiency_summary()
         
         return {
             'success': True,
             'accuracy': accuracy_summary,
             'latency': latency_summary,
             'efficiency': efficiency_summary,
-            'timestamp': metrics_collector.metrics.get('timestamp')
+            # Cache and pool stats below are this worker's own
+            'workers': {'merged': workers, 'pid': os.getpid()},
+            'inference_batching': inference_batcher.get_stats() if inference_batcher else None,
+            'executors': get_executor_stats(),
+            'quantum_terms': quantum_term_store.get_stats() if quantum_term_store else None,
+            'embedding_cache': embedding_cache.get_stats() if embedding_cache else None,
+            'faiss_replica': faiss_replica.get_stats() if faiss_replica else None,
+            'index_stats': index_stats.get_stats() if index_stats else None,
+            'query_cache': query_cache.get_stats() if query_cache else None,
+            'vector_cache': vector_cache.get_stats() if vector_cache else None,
+            'timestamp': collector.metrics.get('timestamp')
         }
     except Exception as e:
         logger.error(f"Metrics summary error: {e}")
@@ -561,13 +1125,14 @@ async def record_accuracy(
 @app.get('/api/metrics/export')
 async def export_metrics_report():
     """Generate and export metrics as PowerPoint"""
-    try:
+    def generate_report():
         from scripts.performance_metrics import MetricsVisualizer, PowerPointReportGenerator
         
         logger.info("📊 Generating metrics report...")
+        collector, _ = collected_metrics()
         
         # Create visualizations
-        visualizer = MetricsVisualizer(metrics_collector)
+        visualizer = MetricsVisualizer(collector)
         visualizer.create_accuracy_comparison_chart()
         visualizer.create_latency_chart()
         visualizer.create_throughput_chart()
@@ -578,8 +1143,12 @@ async def export_metrics_report():
         logger.info(f"✓ Charts saved to {chart_dir}")
         
         # Generate PowerPoint
-        reporter = PowerPointReportGenerator(metrics_collector, visualizer)
+        reporter = PowerPointReportGenerator(collector, visualizer)
         report_file = reporter.generate_report("API_Performance_Report.pptx")
+        return report_file, chart_dir
+    
+    try:
+        report_file, chart_dir = await run_cpu(generate_report)
         
         return {
             'success': True,
@@ -597,20 +1166,30 @@ async def print_metrics_summary():
     """Print metrics summary to console and return"""
     try:
         logger.info("📊 METRICS SUMMARY:")
-        metrics_collector.print_summary()
+        collector, _ = await run_io(collected_metrics)
+        collector.print_summary()
         
         return {
             'success': True,
             'message': 'Metrics summary printed to console',
-            'accuracy': metrics_collector.get_accuracy_summary(),
-            'latency': metrics_collector.get_latency_summary(),
-            'efficiency': metrics_collector.get_efficiency_summary()
+            'accuracy': collector.get_accuracy_summary(),
+            'latency': collector.get_latency_summary(),
+            'efficiency': collector.get_efficiency_summary()
         }
     except Exception as e:
         logger.error(f"Print summary error: {e}")
         raise HTTPException(500, str(e))
 
 
+# Serve locally stored images when running without Cloudinary
+if config.IMAGE_STORAGE_BACKEND == 'local':
+    Path(config.LOCAL_IMAGE_DIR).mkdir(parents=True, exist_ok=True)
+    app.mount(
+        LOCAL_IMAGE_URL_PREFIX,
+        StaticFiles(directory=config.LOCAL_IMAGE_DIR),
+        name='local-images'
+    )
+
 # Serve frontend static files in production
 frontend_dist = project_root / 'frontend' / 'dist'
 if frontend_dist.exists():
@@ -16,6 +16,21 @@ class Config:
     PINECONE_API_KEY = os.getenv('PINECONE_API_KEY', '')
     PINECONE_ENVIRONMENT = os.getenv('PINECONE_ENVIRONMENT', 'us-east-1')
     PINECONE_INDEX_NAME = os.getenv('PINECONE_INDEX_NAME', 'quantum-images-prod')
+    # Batch upserts: vectors and estimated JSON bytes per request (API limit 2 MB),
+    # concurrent requests, retries of throttled/failed requests and the first backoff
+    PINECONE_UPSERT_BATCH_SIZE = int(os.getenv('PINECONE_UPSERT_BATCH_SIZE', '100'))
+    PINECONE_UPSERT_MAX_BYTES = int(os.getenv('PINECONE_UPSERT_MAX_BYTES', '1800000'))
+    PINECONE_UPSERT_CONCURRENCY = int(os.getenv('PINECONE_UPSERT_CONCURRENCY', '4'))
+    PINECONE_UPSERT_RETRIES = int(os.getenv('PINECONE_UPSERT_RETRIES', '3'))
+    PINECONE_UPSERT_BACKOFF = float(os.getenv('PINECONE_UPSERT_BACKOFF', '0.5'))  # seconds
+    
+    # Storage backends ('pinecone'/'embedded' vectors, 'cloudinary'/'local' images)
+    VECTOR_STORE_BACKEND = os.getenv('VECTOR_STORE_BACKEND', 'pinecone').lower()
+    EMBEDDED_STORE_DIR = os.getenv('EMBEDDED_STORE_DIR', 'data/vector_store')
+    # Search-only snapshot of an existing store; lets several web workers share it
+    EMBEDDED_STORE_READ_ONLY = os.getenv('EMBEDDED_STORE_READ_ONLY', 'false').lower() == 'true'
+    IMAGE_STORAGE_BACKEND = os.getenv('IMAGE_STORAGE_BACKEND', 'cloudinary').lower()
+    LOCAL_IMAGE_DIR = os.getenv('LOCAL_IMAGE_DIR', 'data/images')
     
     # Model Configuration
     MODEL_WEIGHTS_PATH = os.getenv('MODEL_WEIGHTS_PATH', 'consistent_resnet50_8d.pth')
@@ -24,6 +39,47 @@ class Config:
     FEATURE_EXTRACTOR = 'resnet50'  # Options: 'resnet50', 'vgg16'
     FEATURE_DIMENSION = int(os.getenv('FEATURE_DIMENSION', '2048'))  # 2048 or 512
     
+    # Inference precision ('fp32' or 'int8' static quantization, CPU only)
+    MODEL_PRECISION = os.getenv('MODEL_PRECISION', 'fp32').lower()
+    QUANTIZATION_CALIBRATION_DIR = os.getenv('QUANTIZATION_CALIBRATION_DIR', 'images')
+    QUANTIZATION_CALIBRATION_SAMPLES = int(os.getenv('QUANTIZATION_CALIBRATION_SAMPLES', '64'))
+    QUANTIZED_MODEL_DIR = os.getenv('QUANTIZED_MODEL_DIR', 'data/models')
+    
+    # Model weight artifacts (built once from torch hub weights, then memory-mapped offline)
+    ENABLE_MODEL_ARTIFACTS = os.getenv('ENABLE_MODEL_ARTIFACTS', 'true').lower() == 'true'
+    MODEL_ARTIFACT_DIR = os.getenv('MODEL_ARTIFACT_DIR', 'data/models')
+    MODEL_ARTIFACT_VERIFY = os.getenv('MODEL_ARTIFACT_VERIFY', 'true').lower() == 'true'
+    
+    # Image decoding ('full' or 'reduced': JPEG draft / reduce() near the 256px resize target)
+    IMAGE_DECODE_MODE = os.getenv('IMAGE_DECODE_MODE', 'full').lower()
+    
+    # Inference batching (groups concurrent requests into one forward pass)
+    ENABLE_INFERENCE_BATCHING = os.getenv('ENABLE_INFERENCE_BATCHING', 'true').lower() == 'true'
+    INFERENCE_MAX_BATCH_SIZE = int(os.getenv('INFERENCE_MAX_BATCH_SIZE', '8'))
+    INFERENCE_MAX_WAIT_MS = float(os.getenv('INFERENCE_MAX_WAIT_MS', '5'))
+    
+    # Embedding cache (keyed by upload bytes + model version)
+    ENABLE_EMBEDDING_CACHE = os.getenv('ENABLE_EMBEDDING_CACHE', 'true').lower() == 'true'
+    EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', 'data/embedding_cache')
+    EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv('EMBEDDING_CACHE_MEMORY_ITEMS', '2048'))
+    EMBEDDING_CACHE_DISK_ITEMS = int(os.getenv('EMBEDDING_CACHE_DISK_ITEMS', '100000'))  # 0 = memory only
+    
+    # Bulk ingestion pipeline (python -m ingestion)
+    INGEST_DECODE_WORKERS = int(os.getenv('INGEST_DECODE_WORKERS', '4'))
+    INGEST_INFERENCE_BATCH_SIZE = int(os.getenv('INGEST_INFERENCE_BATCH_SIZE', '16'))
+    INGEST_UPLOAD_WORKERS = int(os.getenv('INGEST_UPLOAD_WORKERS', '8'))
+    INGEST_UPSERT_BATCH_SIZE = int(os.getenv('INGEST_UPSERT_BATCH_SIZE', '100'))
+    INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '64'))  # items buffered between stages
+    INGEST_MANIFEST_PATH = os.getenv('INGEST_MANIFEST_PATH', 'data/ingest_manifest.sqlite')
+    INGEST_PROCESSES = int(os.getenv('INGEST_PROCESSES', '1'))  # >1: one extractor per worker process
+    INGEST_TORCH_THREADS = int(os.getenv('INGEST_TORCH_THREADS', '0'))  # per process; 0 = cores // processes
+    
+    # Execution pools (keep blocking work off the event loop)
+    CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', '0'))  # 0 = one per core (of this worker's share)
+    CPU_POOL_MAX_PENDING = int(os.getenv('CPU_POOL_MAX_PENDING', '64'))
+    IO_POOL_WORKERS = int(os.getenv('IO_POOL_WORKERS', '16'))
+    IO_POOL_MAX_PENDING = int(os.getenv('IO_POOL_MAX_PENDING', '128'))
+    
     # Quantum Configuration
     QUANTUM_MODE = os.getenv('QUANTUM_MODE', 'inspired')  # 'inspired' or 'qiskit'
     USE_QUANTUM_INSPIRED = (QUANTUM_MODE == 'inspired')  # Derived from QUANTUM_MODE
@@ -32,13 +88,62 @@ class Config:
     N_AUXILIARY_QUBITS = int(os.getenv('N_AUXILIARY_QUBITS', '7'))
     QUANTUM_PRECISION_QUBITS = int(os.getenv('QUANTUM_PRECISION_QUBITS', '7'))
     ENABLE_QUANTUM_ENTANGLEMENT = os.getenv('ENABLE_QUANTUM_ENTANGLEMENT', 'false').lower() == 'true'
+    QUANTUM_SHOTS = int(os.getenv('QUANTUM_SHOTS', '1024'))  # Qiskit mode only
+    QUANTUM_EXACT_PROBABILITIES = os.getenv('QUANTUM_EXACT_PROBABILITIES', 'false').lower() == 'true'
     ENABLE_QUANTUM_LOGGING = os.getenv('ENABLE_QUANTUM_LOGGING', 'true').lower() == 'true'
     
+    # Precomputed quantum terms (computed once per vector at ingest)
+    ENABLE_QUANTUM_TERM_STORE = os.getenv('ENABLE_QUANTUM_TERM_STORE', 'true').lower() == 'true'
+    QUANTUM_TERM_STORE_DIR = os.getenv('QUANTUM_TERM_STORE_DIR', 'data/quantum_terms')
+    QUANTUM_RERANK_CANDIDATES = int(os.getenv('QUANTUM_RERANK_CANDIDATES', '50'))
+    
+    # Local copy of vector values for re-ranking (searches then skip include_values)
+    ENABLE_VECTOR_CACHE = os.getenv('ENABLE_VECTOR_CACHE', 'true').lower() == 'true'
+    VECTOR_CACHE_DIR = os.getenv('VECTOR_CACHE_DIR', 'data/vector_cache')
+    
+    # Local FAISS replica of the vector index (build with scripts/maintenance/faiss_replica.py)
+    ENABLE_FAISS_REPLICA = os.getenv('ENABLE_FAISS_REPLICA', 'false').lower() == 'true'
+    FAISS_REPLICA_DIR = os.getenv('FAISS_REPLICA_DIR', 'data/faiss_replica')
+    FAISS_HNSW_M = int(os.getenv('FAISS_HNSW_M', '32'))
+    FAISS_EF_SEARCH = int(os.getenv('FAISS_EF_SEARCH', '128'))
+    FAISS_REPLICA_SAVE_EVERY = int(os.getenv('FAISS_REPLICA_SAVE_EVERY', '500'))
+    FAISS_REPLICA_CHECK_INTERVAL = float(os.getenv('FAISS_REPLICA_CHECK_INTERVAL', '60'))  # seconds
+    
+    # Cached index statistics for /, /api/info and /api/stats (refreshed in the background)
+    INDEX_STATS_TTL = float(os.getenv('INDEX_STATS_TTL', '30'))  # seconds
+    
+    # Search result cache (invalidated on index writes)
+    ENABLE_QUERY_CACHE = os.getenv('ENABLE_QUERY_CACHE', 'true').lower() == 'true'
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '1024'))
+    QUERY_CACHE_MAX_MB = float(os.getenv('QUERY_CACHE_MAX_MB', '64'))
+    QUERY_CACHE_QUANTIZATION = int(os.getenv('QUERY_CACHE_QUANTIZATION', '256'))  # steps per unit of a normalized component
+    QUERY_CACHE_MAX_AGE = float(os.getenv('QUERY_CACHE_MAX_AGE', '300'))  # seconds, 0 = no limit
+    
+    # Performance metrics (latency histograms are fixed-size; raw records are sampled)
+    METRICS_RESERVOIR_SIZE = int(os.getenv('METRICS_RESERVOIR_SIZE', '1000'))  # 0 = aggregates only
+    METRICS_VERBOSE = os.getenv('METRICS_VERBOSE', 'false').lower() == 'true'  # print every recorded metric
+    # Multi-worker serving: each worker publishes its metrics here and summaries merge them
+    METRICS_SHARED_DIR = os.getenv('METRICS_SHARED_DIR', 'data/metrics/workers')
+    METRICS_PUBLISH_INTERVAL = float(os.getenv('METRICS_PUBLISH_INTERVAL', '5'))  # seconds
+    
+    # Startup warmup (/ready reports 503 until models and clients are loaded)
+    ENABLE_WARMUP = os.getenv('ENABLE_WARMUP', 'true').lower() == 'true'
+    WARMUP_ITERATIONS = int(os.getenv('WARMUP_ITERATIONS', '2'))  # inference passes per batch size
+    
     # Server Configuration
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', '8000'))
     DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
     
+    # Multi-worker serving (gunicorn.conf.py: models load before fork and are shared copy-on-write)
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', '1'))
+    WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', '120'))  # seconds before a silent worker is restarted
+    TORCH_THREADS_PER_WORKER = int(os.getenv('TORCH_THREADS_PER_WORKER', '0'))  # 0 = cores / workers / concurrent inferences
+    
+    # Rate limits are counted per worker process unless the storage is shared (e.g. redis://redis:6379)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_STORAGE_URI = os.getenv('RATE_LIMIT_STORAGE_URI', 'memory://')
+    
     # Confidence Thresholds
     HIGH_CONFIDENCE_THRESHOLD = float(os.getenv('HIGH_CONFIDENCE_THRESHOLD', '0.95'))
     GOOD_CONFIDENCE_THRESHOLD = float(os.getenv('GOOD_CONFIDENCE_THRESHOLD', '0.85'))
@@ -50,12 +155,16 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate required configuration"""
-        required_vars = {
-            'CLOUDINARY_CLOUD_NAME': cls.CLOUDINARY_CLOUD_NAME,
-            'CLOUDINARY_API_KEY': cls.CLOUDINARY_API_KEY,
-            'CLOUDINARY_API_SECRET': cls.CLOUDINARY_API_SECRET,
-            'PINECONE_API_KEY': cls.PINECONE_API_KEY,
-        }
+        # Credentials are only needed for the cloud backends in use
+        required_vars = {}
+        if cls.IMAGE_STORAGE_BACKEND == 'cloudinary':
+            required_vars.update({
+                'CLOUDINARY_CLOUD_NAME': cls.CLOUDINARY_CLOUD_NAME,
+                'CLOUDINARY_API_KEY': cls.CLOUDINARY_API_KEY,
+                'CLOUDINARY_API_SECRET': cls.CLOUDINARY_API_SECRET,
+            })
+        if cls.VECTOR_STORE_BACKEND == 'pinecone':
+            required_vars['PINECONE_API_KEY'] = cls.PINECONE_API_KEY
         
         missing = [key for key, value in required_vars.items() if not value]
         
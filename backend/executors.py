@@ -0,0 +1,220 @@
+"""
+Execution Pools for the Backend Pipeline
+Keeps blocking decode, inference and network calls off the asyncio event loop
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Handle both module and direct imports
+try:
+    from backend.config import Config
+    config = Config
+except ImportError:
+    from config import Config
+    config = Config
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a concurrency limit and queue-depth metrics
+
+    At most max_workers tasks run at once; at most max_pending tasks may be
+    waiting for a worker. Further callers are suspended (without blocking the
+    event loop) until a slot frees up, which gives natural backpressure.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: Optional[int] = None):
+        """
+        Initialize the pool
+
+        Args:
+            name: Pool name used for thread names and metrics
+            max_workers: Maximum tasks running concurrently
+            max_pending: Maximum tasks queued behind running ones (default: 4x workers)
+        """
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = int(max_pending) if max_pending else self.max_workers * 4
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"{name}-pool"
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queue_depth = 0
+        self._queue_wait_total_ms = 0.0
+        self._run_time_total_ms = 0.0
+
+        logger.info(
+            f"Executor '{name}' ready (workers={self.max_workers}, "
+            f"max_pending={self.max_pending})"
+        )
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Create the admission semaphore lazily (inside the running loop)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_pending)
+        return self._slots
+
+    def _instrumented(self, fn: Callable, submitted_at: float) -> Callable:
+        """Wrap a task so queue wait and run time are recorded"""
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._queue_wait_total_ms += (started - submitted_at) * 1000
+            try:
+                result = fn()
+                with self._lock:
+                    self._completed += 1
+                return result
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._run_time_total_ms += (time.perf_counter() - started) * 1000
+        return task
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the pool and await its result
+
+        Args:
+            fn: Blocking callable
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            Return value of fn
+        """
+        call = functools.partial(fn, *args, **kwargs)
+        async with self._get_slots():
+            submitted_at = time.perf_counter()
+            with self._lock:
+                self._queued += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._queued)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                self._instrumented(call, submitted_at)
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+
+        Returns:
+            Dictionary with concurrency limits, queue depth and timings
+        """
+        with self._lock:
+            finished = self._completed + self._failed
+            started = finished + self._active
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'max_queue_depth': self._max_queue_depth,
+                'completed': self._completed,
+                'failed': self._failed,
+                'mean_queue_wait_ms': (self._queue_wait_total_ms / started) if started else 0.0,
+                'mean_run_time_ms': (self._run_time_total_ms / finished) if finished else 0.0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the underlying thread pool"""
+        self._executor.shutdown(wait=wait)
+
+
+_pools: Dict[str, BoundedExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, max_workers: int, max_pending: Optional[int] = None) -> BoundedExecutor:
+    """Get or create a named pool"""
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = BoundedExecutor(name, max_workers, max_pending)
+                _pools[name] = pool
+    return pool
+
+
+def cpu_share() -> int:
+    """Cores for this server process (the machine's cores split between WEB_WORKERS)"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS, Windows
+        cores = os.cpu_count() or 1
+    return max(1, cores // max(1, config.WEB_WORKERS))
+
+
+def inference_threads() -> int:
+    """
+    torch intra-op threads per forward pass, so that concurrent passes x
+    threads stay within cpu_share() (TORCH_THREADS_PER_WORKER overrides)
+
+    With batching a single batcher thread runs every forward pass; without it
+    each CPU pool thread may run one at the same time.
+    """
+    if config.TORCH_THREADS_PER_WORKER:
+        return config.TORCH_THREADS_PER_WORKER
+    concurrent = 1 if config.ENABLE_INFERENCE_BATCHING else (config.CPU_POOL_WORKERS or cpu_share())
+    return max(1, cpu_share() // concurrent)
+
+
+def get_cpu_pool() -> BoundedExecutor:
+    """Bounded pool for image decode, inference and re-ranking"""
+    return get_pool(
+        'cpu',
+        config.CPU_POOL_WORKERS or cpu_share(),
+        config.CPU_POOL_MAX_PENDING
+    )
+
+
+def get_io_pool() -> BoundedExecutor:
+    """Bounded pool for Pinecone and Cloudinary network calls"""
+    return get_pool('io', config.IO_POOL_WORKERS, config.IO_POOL_MAX_PENDING)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run a CPU-bound callable in the CPU pool"""
+    return await get_cpu_pool().run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking network call in the I/O pool"""
+    return await get_io_pool().run(fn, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every pool created so far"""
+    return {name: pool.get_stats() for name, pool in list(_pools.items())}
+
+
+def shutdown_pools(wait: bool = True):
+    """Shut down all pools (used on application shutdown)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=wait)
+        _pools.clear()
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for multi-worker serving
+Usage: gunicorn backend.backend_server:app  (from the project root; gunicorn reads this file)
+
+The app and its models load once in the parent process (preload_app) and the
+workers fork from it, so every worker shares the same model weights
+copy-on-write. Worker count and timeouts come from WEB_WORKERS / WEB_TIMEOUT.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.config import Config
+
+bind = f"{Config.HOST}:{Config.PORT}"
+workers = Config.WEB_WORKERS
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    """Check the stores can be shared and load model weights before any worker is forked"""
+    from backend.backend_server import prepare_prefork
+    prepare_prefork(server.cfg.workers)
+
+
+def post_fork(server, worker):
+    """Split torch threads between workers and share metrics"""
+    from backend.backend_server import configure_worker
+    configure_worker(server.cfg.workers)
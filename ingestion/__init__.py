@@ -0,0 +1,21 @@
+"""
+Bulk image ingestion (python -m ingestion)
+"""
+
+from ingestion.parallel import ParallelIngestion
+from ingestion.pipeline import (
+    CATEGORY_LAYOUTS,
+    CategoryLayout,
+    IngestionPipeline,
+    IngestionSettings,
+    StageStats,
+)
+
+__all__ = [
+    'CATEGORY_LAYOUTS',
+    'CategoryLayout',
+    'IngestionPipeline',
+    'IngestionSettings',
+    'ParallelIngestion',
+    'StageStats',
+]
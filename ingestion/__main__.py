@@ -0,0 +1,9 @@
+"""Run the ingestion CLI: python -m ingestion --category healthcare"""
+
+import sys
+
+from ingestion.cli import main
+
+# Guarded: worker processes re-import this module under another name
+if __name__ == '__main__':
+    sys.exit(main())
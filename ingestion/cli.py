@@ -0,0 +1,233 @@
+"""
+Command-line entry point for the ingestion pipeline
+
+Usage:
+    python -m ingestion --category healthcare --reset
+    python -m ingestion --category satellite
+    python -m ingestion --category satellite --status
+    python -m ingestion --category xray --folder /data/xray --decode-workers 8
+    python -m ingestion --category satellite --processes 4 --threads-per-process 2
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import Config
+from ingestion.manifest import IngestionManifest
+from ingestion.parallel import ParallelIngestion, thread_budget
+from ingestion.pipeline import CATEGORY_LAYOUTS, CategoryLayout, IngestionPipeline, IngestionSettings, format_report
+
+logger = logging.getLogger(__name__)
+
+
+def build_services():
+    """Feature extractor, image storage and vector store as configured"""
+    from ml.unified_feature_extractor import UnifiedFeatureExtractor
+    from services.local_image_service import create_image_service
+
+    extractor = UnifiedFeatureExtractor.from_config(Config)
+    image_service = create_image_service()
+    return extractor, image_service, build_vector_store()
+
+
+def build_vector_store(backend=None):
+    """Vector store (default: VECTOR_STORE_BACKEND) with the configured write listeners"""
+    from ml.quantum.ae_qip_v3 import AEQIPAlgorithm
+    from ml.quantum.term_store import QuantumTermStore
+    from services.vector_store import create_vector_store
+
+    vector_store = create_vector_store(backend)
+    if Config.ENABLE_QUANTUM_TERM_STORE:
+        # Precompute quantum re-ranking terms as vectors are upserted
+        vector_store.add_write_listener(QuantumTermStore(
+            AEQIPAlgorithm(),
+            Config.QUANTUM_TERM_STORE_DIR,
+            Config.FEATURE_DIMENSION
+        ))
+    return vector_store
+
+
+def reset_index(vector_store, assume_yes: bool = False) -> bool:
+    """Delete every vector after confirmation"""
+    logger.info("🗑️  Deleting all vectors")
+    count_before = vector_store.get_statistics()['total_vector_count']
+    logger.info(f"📊 Current vectors: {count_before}")
+    if count_before == 0:
+        logger.info("✅ Database already empty")
+        return True
+
+    if not assume_yes:
+        print(f"\n⚠️  WARNING: This will delete {count_before} vectors!")
+        print("Type 'DELETE' to confirm: ", end='')
+        if input().strip() != 'DELETE':
+            logger.warning("❌ Deletion cancelled")
+            return False
+
+    if not vector_store.delete_all_vectors():
+        logger.error("❌ Deletion failed")
+        return False
+
+    # Pinecone deletes propagate asynchronously
+    if Config.VECTOR_STORE_BACKEND == 'pinecone':
+        logger.info("⏳ Waiting for deletion to propagate...")
+        time.sleep(5)
+    count_after = vector_store.get_statistics()['total_vector_count']
+    logger.info(f"✅ Deletion complete ({count_before} → {count_after} vectors)")
+    return True
+
+
+def resolve_layout(args) -> CategoryLayout:
+    """Built-in layout for the category, or one built from --folder"""
+    layout = CATEGORY_LAYOUTS.get(args.category)
+    if layout is None and not args.folder:
+        raise SystemExit(f"Unknown category '{args.category}': pass --folder")
+    if layout is None:
+        layout = CategoryLayout(args.category, [args.folder])
+    elif args.folder:
+        layout = CategoryLayout(
+            layout.category, [args.folder], layout.include_subfolders, layout.root_names
+        )
+    if args.flat:
+        layout.include_subfolders = False
+    return layout
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Ingest a folder of images into the vector store')
+    parser.add_argument('--category', required=True,
+                        help=f"Category ({', '.join(CATEGORY_LAYOUTS)} or any name with --folder)")
+    parser.add_argument('--folder', help='Image folder (default: the category layout folder)')
+    parser.add_argument('--flat', action='store_true', help='Ignore subfolders')
+    parser.add_argument('--reset', action='store_true',
+                        help='Delete all vectors before ingesting (skipped when resuming an interrupted reset)')
+    parser.add_argument('--restart', action='store_true',
+                        help='With --reset, wipe the index even if an earlier reset run did not finish')
+    parser.add_argument('--yes', action='store_true', help='Skip the reset confirmation')
+    parser.add_argument('--manifest', default=Config.INGEST_MANIFEST_PATH,
+                        help='Progress manifest (default: INGEST_MANIFEST_PATH)')
+    parser.add_argument('--no-manifest', action='store_true', help='Ingest everything, record nothing')
+    parser.add_argument('--status', action='store_true', help='Print manifest progress and exit')
+    parser.add_argument('--limit', type=int, help='Ingest at most this many images')
+    parser.add_argument('--decode-workers', type=int)
+    parser.add_argument('--inference-batch-size', type=int)
+    parser.add_argument('--upload-workers', type=int)
+    parser.add_argument('--upsert-batch-size', type=int)
+    parser.add_argument('--queue-size', type=int)
+    parser.add_argument('--processes', type=int, default=Config.INGEST_PROCESSES,
+                        help='Worker processes, each with its own model (default: INGEST_PROCESSES)')
+    parser.add_argument('--threads-per-process', type=int, default=Config.INGEST_TORCH_THREADS,
+                        help='torch threads per worker process (default: cores // processes)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Log bytes read and peak RSS for every image')
+    parser.add_argument('--json', help='Write the run report to this JSON file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+    layout = resolve_layout(args)
+    settings = IngestionSettings.from_config(
+        Config,
+        decode_workers=args.decode_workers,
+        inference_batch_size=args.inference_batch_size,
+        upload_workers=args.upload_workers,
+        upsert_batch_size=args.upsert_batch_size,
+        queue_size=args.queue_size,
+        trace_memory=args.trace_memory or None
+    )
+
+    manifest = None if args.no_manifest else IngestionManifest(args.manifest)
+    if args.status:
+        if manifest is None:
+            raise SystemExit("--status needs the manifest")
+        for stage, count in sorted(manifest.summary(layout.category).items()):
+            print(f"{stage:<12} {count}")
+        return 0
+
+    try:
+        logger.info("🚀 Initializing services...")
+        if args.processes > 1:
+            # Workers load their own extractor and storage client
+            vector_store = build_vector_store()
+        else:
+            extractor, image_service, vector_store = build_services()
+        logger.info("✅ All services initialized")
+
+        if manifest is not None:
+            # Pinecone index name, or 'embedded:<dir>' for the embedded store
+            manifest.bind_target(vector_store.get_statistics().get('index_name', ''))
+
+        if args.reset:
+            # A reset run that crashed resumes instead of wiping its own progress
+            if manifest is not None and manifest.get_meta('reset_in_progress') == '1' and not args.restart:
+                logger.info("↩️  Resuming an unfinished reset run - index not wiped again (--restart to force)")
+            elif not reset_index(vector_store, args.yes):
+                logger.info("Exiting without uploading...")
+                return 1
+            elif manifest is not None:
+                # Index is empty again; storage uploads stay reusable
+                manifest.reset_upserts()
+                manifest.set_meta('reset_in_progress', '1')
+
+        count_before = vector_store.get_statistics()['total_vector_count']
+        logger.info(
+            f"⚙️  decode x{settings.decode_workers} | inference batch {settings.inference_batch_size} | "
+            f"upload x{settings.upload_workers} | upsert batch {settings.upsert_batch_size} | "
+            f"queues {settings.queue_size}"
+        )
+
+        if args.processes > 1:
+            logger.info(
+                f"⚙️  {args.processes} processes x "
+                f"{thread_budget(args.processes, args.threads_per_process)} torch threads"
+            )
+            pipeline = ParallelIngestion(
+                vector_store, settings, args.processes, args.threads_per_process, manifest
+            )
+        else:
+            pipeline = IngestionPipeline(extractor, image_service, vector_store, settings, manifest)
+        report = pipeline.run(layout, limit=args.limit)
+        if args.reset and manifest is not None and report['failed'] == 0 and args.limit is None:
+            manifest.set_meta('reset_in_progress', '0')
+
+        logger.info("\n" + "=" * 70)
+        logger.info(f"📊 {layout.category.upper()} INGESTION SUMMARY")
+        logger.info("=" * 70)
+        for line in format_report(report):
+            logger.info(line)
+        count_after = vector_store.get_statistics()['total_vector_count']
+        logger.info(f"📊 Vectors: {count_before} → {count_after}")
+        logger.info("=" * 70)
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"📄 Report written to {args.json}")
+
+        # A re-run with nothing left to do is a success
+        ok = report['discovered'] > 0 and (report['succeeded'] > 0 or report['failed'] == 0)
+        return 0 if ok else 1
+
+    except KeyboardInterrupt:
+        logger.warning("\n⚠️  Interrupted by user")
+        return 130
+    except Exception as e:
+        logger.error(f"❌ Fatal error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Ingestion Manifest
+SQLite record of every ingested file so interrupted or repeated runs only redo
+work that is missing, failed or out of date
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stage a file has completed, in order
+STAGE_UPLOADED = 'uploaded'
+STAGE_UPSERTED = 'upserted'
+
+_COLUMNS = (
+    'path', 'category', 'size', 'mtime_ns', 'content_hash', 'model_version',
+    'public_id', 'storage_url', 'vector_id', 'stage', 'failed_stage', 'error', 'updated_at'
+)
+
+
+class IngestionManifest:
+    """
+    One row per source file, keyed by absolute path
+
+    A row stores the file's size, mtime and content hash, the storage upload
+    result, the vector ID, the last stage completed and the last error. Files
+    whose stat and model version match an upserted row are skipped without being
+    read; a changed stat falls back to the content hash. Uploads are reused for
+    unchanged content, so storage is never written twice for the same file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the manifest
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # Worker processes share the file; wait for their write locks
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, category TEXT NOT NULL, size INTEGER, mtime_ns INTEGER, '
+            'content_hash TEXT, model_version TEXT, public_id TEXT, storage_url TEXT, '
+            'vector_id TEXT, stage TEXT, failed_stage TEXT, error TEXT, updated_at REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS files_category ON files (category)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._db.commit()
+
+    @staticmethod
+    def key(path) -> str:
+        return str(Path(path).resolve())
+
+    # ---------------------------------------------------------------- reads
+
+    def get(self, path) -> Optional[Dict[str, Any]]:
+        """Manifest row for a file, or None"""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM files WHERE path = ?", (self.key(path),)
+            ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    @staticmethod
+    def is_current(record: Optional[Dict[str, Any]], category: str, model_version: Optional[str]) -> bool:
+        """True if the row is upserted for this category and model"""
+        return (
+            record is not None
+            and record['stage'] == STAGE_UPSERTED
+            and record['category'] == category
+            and record['model_version'] == model_version
+        )
+
+    @staticmethod
+    def has_upload(record: Optional[Dict[str, Any]], category: str, content_hash: str) -> bool:
+        """True if the same content was already uploaded for this category"""
+        return (
+            record is not None
+            and record['stage'] in (STAGE_UPLOADED, STAGE_UPSERTED)
+            and record['category'] == category
+            and record['content_hash'] == content_hash
+            and bool(record['storage_url'])
+        )
+
+    def summary(self, category: Optional[str] = None) -> Dict[str, int]:
+        """Row counts by completed stage, plus rows carrying an error"""
+        where, params = ('WHERE category = ?', (category,)) if category else ('', ())
+        with self._lock:
+            counts = dict(self._db.execute(
+                f"SELECT COALESCE(stage, 'pending'), COUNT(*) FROM files {where} GROUP BY 1", params
+            ).fetchall())
+            counts['with_errors'] = self._db.execute(
+                f"SELECT COUNT(*) FROM files {where} {'AND' if where else 'WHERE'} error IS NOT NULL",
+                params
+            ).fetchone()[0]
+        return counts
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    # --------------------------------------------------------------- writes
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+            self._db.commit()
+
+    def touch(self, path, size: int, mtime_ns: int):
+        """Refresh the stat of a file whose content hash is unchanged"""
+        with self._lock:
+            self._db.execute(
+                'UPDATE files SET size = ?, mtime_ns = ?, updated_at = ? WHERE path = ?',
+                (size, mtime_ns, time.time(), self.key(path))
+            )
+            self._db.commit()
+
+    def record_upload(
+        self,
+        path,
+        category: str,
+        size: int,
+        mtime_ns: int,
+        content_hash: str,
+        model_version: Optional[str],
+        public_id: str,
+        storage_url: str,
+        vector_id: str
+    ):
+        """Storage upload done; vector not yet written"""
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO files ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (self.key(path), category, size, mtime_ns, content_hash, model_version,
+                 public_id, storage_url, vector_id, STAGE_UPLOADED, None, None, time.time())
+            )
+            self._db.commit()
+
+    def record_upserted(self, paths: Iterable):
+        """Vectors for these files are in the store"""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                'UPDATE files SET stage = ?, failed_stage = NULL, error = NULL, updated_at = ? '
+                'WHERE path = ?',
+                [(STAGE_UPSERTED, now, self.key(path)) for path in paths]
+            )
+            self._db.commit()
+
+    def record_failure(self, path, category: str, stage: str, error: str):
+        """Keep the last completed stage and remember why the next one failed"""
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO files (path, category, failed_stage, error, updated_at) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET '
+                'failed_stage = excluded.failed_stage, error = excluded.error, '
+                'updated_at = excluded.updated_at',
+                (self.key(path), category, stage, error, time.time())
+            )
+            self._db.commit()
+
+    def reset_upserts(self) -> int:
+        """
+        Mark every upserted file as uploaded only
+
+        Used after the vector index is wiped or replaced: vectors are written
+        again while storage uploads are reused.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                'UPDATE files SET stage = ? WHERE stage = ?', (STAGE_UPLOADED, STAGE_UPSERTED)
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def bind_target(self, target: str) -> bool:
+        """
+        Tie the manifest to one vector store
+
+        Returns:
+            True if the manifest previously described a different store
+            (its upserts were reset)
+        """
+        previous = self.get_meta('target')
+        changed = previous is not None and previous != target
+        if changed:
+            count = self.reset_upserts()
+            logger.warning(f"⚠️ Manifest was for {previous}; {count} files will be re-upserted to {target}")
+        self.set_meta('target', target)
+        return changed
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,329 @@
+"""
+Multi-process Ingestion
+Shards the file list over worker processes that each own a feature extractor
+and a torch thread budget; the parent process is the single vector writer
+"""
+
+import logging
+import os
+import queue
+import time
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ingestion.manifest import IngestionManifest
+from ingestion.pipeline import CategoryLayout, IngestionPipeline, IngestionSettings, StageStats
+
+logger = logging.getLogger(__name__)
+
+# Seconds between liveness checks while waiting for worker messages
+_POLL_INTERVAL = 1.0
+
+
+def cpu_count() -> int:
+    """Cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS, Windows
+        return os.cpu_count() or 1
+
+
+def thread_budget(processes: int, threads: int = 0) -> int:
+    """torch threads per worker so that processes x threads <= cores (threads=0: auto)"""
+    if threads > 0:
+        return threads
+    return max(1, cpu_count() // max(1, processes))
+
+
+def shard_paths(paths: List[Path], shards: int) -> List[List[Path]]:
+    """
+    Split files into shards of equal count and similar total size
+
+    Inference costs the same for every image while decoding grows with file
+    size, so files are dealt largest first in snake order (0..n-1, n-1..0).
+    """
+    sized = []
+    for path in paths:
+        try:
+            sized.append((path.stat().st_size, path))
+        except OSError:
+            sized.append((0, path))
+    sized.sort(key=lambda entry: -entry[0])
+
+    result: List[List[Path]] = [[] for _ in range(shards)]
+    for position, (_, path) in enumerate(sized):
+        index = position % shards
+        if (position // shards) % 2:
+            index = shards - 1 - index
+        result[index].append(path)
+    return result
+
+
+class _ShardPipeline(IngestionPipeline):
+    """Worker-side pipeline: vectors go to the writer process instead of the store"""
+
+    def __init__(self, results, worker_id: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._results = results
+        self._worker_id = worker_id
+
+    def _upsert(self, batch):
+        # Blocks when the writer falls behind (the results queue is bounded)
+        self._results.put(('vectors', self._worker_id, [
+            (item.vector, str(item.path), item.stale_id) for item in batch
+        ]))
+        self._upserted += len(batch)
+        return batch
+
+
+def _worker_main(worker_id, layout, folder, paths, settings, manifest_path, threads, results):
+    """Entry point of one worker process"""
+    # Before torch is imported: size the OpenMP/MKL pools to the budget
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    os.environ['MKL_NUM_THREADS'] = str(threads)
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - worker {worker_id} - %(levelname)s - %(message)s'
+    )
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+
+        from backend.config import Config
+        from ml.unified_feature_extractor import UnifiedFeatureExtractor
+        from services.local_image_service import create_image_service
+
+        extractor = UnifiedFeatureExtractor.from_config(Config)
+        results.put(('ready', worker_id, {'model_version': extractor.model_version}))
+
+        manifest = IngestionManifest(manifest_path) if manifest_path else None
+        pipeline = _ShardPipeline(
+            results, worker_id, extractor, create_image_service(), None, settings, manifest
+        )
+        report = pipeline.run(layout, folder, paths=paths)
+        if manifest is not None:
+            manifest.close()
+        results.put(('done', worker_id, report))
+    except Exception as e:
+        results.put(('error', worker_id, f"{type(e).__name__}: {e}"))
+
+
+class ParallelIngestion:
+    """
+    Process-pool ingestion
+
+    Each worker process loads the extractor once, limits torch to its thread
+    budget, and runs the staged pipeline (decode, batched inference, storage
+    upload) over its shard. Vectors flow back through one bounded queue to the
+    parent, which batches upserts, updates the manifest and runs the write
+    listeners, so the vector store only ever has one writer.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        settings: Optional[IngestionSettings] = None,
+        processes: int = 2,
+        threads_per_process: int = 0,
+        manifest: Optional[IngestionManifest] = None
+    ):
+        """
+        Args:
+            vector_store: VectorStore receiving the vectors (used in this process only)
+            settings: Per-worker stage settings; upsert_batch_size applies to the writer
+            processes: Worker processes
+            threads_per_process: torch threads per worker (0: cores // processes)
+            manifest: Progress manifest; workers open their own connection to its file
+        """
+        self.vector_store = vector_store
+        self.settings = settings or IngestionSettings()
+        self.processes = max(1, int(processes))
+        self.threads_per_process = thread_budget(self.processes, threads_per_process)
+        self.manifest = manifest
+
+        self._upsert_stats: Optional[StageStats] = None
+        self._failures: List[Dict[str, str]] = []
+        self._upserted = 0
+
+    def run(self, layout: CategoryLayout, folder: Optional[Path] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ingest every image of a category with worker processes
+
+        Returns:
+            Report in the IngestionPipeline.run format, plus per-worker totals
+        """
+        folder = Path(folder) if folder else layout.resolve_folder()
+        if folder is None or not folder.is_dir():
+            raise FileNotFoundError(f"No image folder for {layout.category}: {layout.folders}")
+
+        paths = list(IngestionPipeline.discover(layout, folder))
+        if limit is not None:
+            paths = paths[:limit]
+        processes = max(1, min(self.processes, len(paths)))
+        shards = shard_paths(paths, processes)
+
+        logger.info(
+            f"⚡ {len(paths)} {layout.category} images over {processes} processes "
+            f"x {self.threads_per_process} torch threads ({cpu_count()} cores)"
+        )
+
+        self._upsert_stats = StageStats('upsert', 1)
+        self._failures = []
+        self._upserted = 0
+
+        context = get_context('spawn')
+        results = context.Queue(maxsize=self.settings.queue_size)
+        manifest_path = str(self.manifest.path) if self.manifest is not None else None
+        workers = [
+            context.Process(
+                target=_worker_main,
+                args=(index, layout, folder, shard, self.settings, manifest_path,
+                      self.threads_per_process, results),
+                name=f'ingest-worker-{index}'
+            )
+            for index, shard in enumerate(shards)
+        ]
+
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        try:
+            reports, errors = self._write_loop(workers, results)
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+        elapsed = time.perf_counter() - start
+
+        for index, error in sorted(errors.items()):
+            logger.error(f"❌ Worker {index} failed ({len(shards[index])} files): {error}")
+            self._failures.append({'path': f'<shard {index}>', 'stage': 'worker', 'error': error})
+
+        return self._merge(layout, folder, reports, shards, elapsed)
+
+    def _write_loop(self, workers, results):
+        """Batch vectors from every worker into upserts until all workers finish"""
+        batch_size = self.settings.upsert_batch_size
+        pending = []
+        reports: Dict[int, Dict[str, Any]] = {}
+        errors: Dict[int, str] = {}
+        dead_once = set()
+        model_versions = set()
+
+        self._upsert_stats.start()
+        while len(reports) + len(errors) < len(workers):
+            try:
+                kind, worker_id, payload = results.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                # A dead worker's messages are flushed before it exits; give the
+                # queue one more poll before declaring the shard lost
+                for index, worker in enumerate(workers):
+                    if index in reports or index in errors or worker.is_alive():
+                        continue
+                    if index in dead_once:
+                        errors[index] = f"exited with code {worker.exitcode}"
+                    dead_once.add(index)
+                continue
+
+            if kind == 'ready':
+                model_versions.add(payload['model_version'])
+                # Workers must produce identical vectors for the same image
+                if len(model_versions) > 1:
+                    raise RuntimeError(f"Workers loaded different models: {sorted(model_versions)}")
+            elif kind == 'vectors':
+                pending.extend(payload)
+                while len(pending) >= batch_size:
+                    self._write(pending[:batch_size])
+                    pending = pending[batch_size:]
+            elif kind == 'done':
+                reports[worker_id] = payload
+            elif kind == 'error':
+                errors[worker_id] = payload
+
+        if pending:
+            self._write(pending)
+        self._upsert_stats.finish()
+        return reports, errors
+
+    def _write(self, records):
+        """Upsert one batch and record the vectors that landed in the manifest"""
+        t0 = time.perf_counter()
+        try:
+            errors = self.vector_store.upsert_vectors_batch_detailed([vector for vector, _, _ in records]).errors()
+        except Exception as e:
+            errors = {vector['id']: str(e) for vector, _, _ in records}
+
+        done = []
+        for vector, path, stale_id in records:
+            error = errors.get(vector['id'])
+            if error is None:
+                done.append((path, stale_id))
+                continue
+            logger.error(f"❌ upsert failed for {Path(path).name}: {error}")
+            self._failures.append({'path': path, 'stage': 'upsert', 'error': error})
+            if self.manifest is not None:
+                self.manifest.record_failure(path, vector['metadata']['category'], 'upsert', error)
+
+        self._upserted += len(done)
+        if self.manifest is not None and done:
+            self.manifest.record_upserted(path for path, _ in done)
+        for _, stale_id in done:
+            if stale_id:
+                self.vector_store.delete_vector(stale_id)
+        self._upsert_stats.record(len(done), len(records) - len(done), time.perf_counter() - t0)
+        if done:
+            logger.info(f"📦 Upserted {len(done)} vectors ({self._upserted} total)")
+
+    def _merge(self, layout, folder, reports, shards, elapsed) -> Dict[str, Any]:
+        """Combine worker reports with the writer's stats"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        for report in reports.values():
+            for stage in report['stages']:
+                if stage['stage'] == 'upsert':
+                    continue  # workers only forward; the writer's stats replace these
+                merged = stages.setdefault(stage['stage'], {
+                    'stage': stage['stage'], 'workers': 0, 'processed': 0, 'failed': 0,
+                    'skipped': 0, 'calls': 0, 'busy_s': 0.0, 'blocked_s': 0.0
+                })
+                for key in ('workers', 'processed', 'failed', 'skipped', 'calls', 'busy_s', 'blocked_s'):
+                    merged[key] += stage[key]
+        for merged in stages.values():
+            merged['elapsed_s'] = elapsed
+            merged['throughput'] = merged['processed'] / elapsed if elapsed > 0 else 0.0
+            merged['utilization'] = merged['busy_s'] / (elapsed * merged['workers']) if elapsed > 0 else 0.0
+
+        worker_reports = [reports[index] for index in sorted(reports)]
+        failures = [f for report in worker_reports for f in report['failures']] + self._failures
+        return {
+            'category': layout.category,
+            'folder': str(folder),
+            'processes': len(shards),
+            'threads_per_process': self.threads_per_process,
+            'discovered': sum(len(shard) for shard in shards),
+            'succeeded': self._upserted,
+            'skipped': sum(report['skipped'] for report in worker_reports),
+            'reused_uploads': sum(report['reused_uploads'] for report in worker_reports),
+            'failed': len(failures),
+            'elapsed_s': elapsed,
+            'rate': self._upserted / elapsed if elapsed > 0 else 0.0,
+            'bytes_read': sum(report['bytes_read'] for report in worker_reports),
+            'largest_image_bytes': max((report['largest_image_bytes'] for report in worker_reports), default=0),
+            # Per process; the box needs roughly processes x this
+            'peak_rss_mb': max((report['peak_rss_mb'] or 0 for report in worker_reports), default=None),
+            'stages': list(stages.values()) + [self._upsert_stats.as_dict()],
+            'failures': failures,
+            'images': [trace for report in worker_reports for trace in report['images']],
+            'workers': [{
+                'worker': index,
+                'files': len(shards[index]),
+                'forwarded': reports[index]['succeeded'] if index in reports else 0,
+                'elapsed_s': reports[index]['elapsed_s'] if index in reports else None,
+                'peak_rss_mb': reports[index]['peak_rss_mb'] if index in reports else None,
+            } for index in range(len(shards))],
+        }
@@ -0,0 +1,609 @@
+"""
+Staged Ingestion Pipeline
+Discovery -> read/decode -> batched inference -> storage upload -> batched upsert,
+connected by bounded queues so the slowest stage sets the pace
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ingestion.manifest import IngestionManifest
+from ml.image_loading import IMAGE_EXTENSIONS, decode_rgb, peak_rss_mb, read_file
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input; one per downstream worker
+_END = object()
+
+
+class CategoryLayout:
+    """Where a category's images live and how subfolders map to IDs"""
+
+    def __init__(
+        self,
+        category: str,
+        folders: Sequence[str],
+        include_subfolders: bool = True,
+        root_names: Sequence[str] = ()
+    ):
+        """
+        Args:
+            category: Category stored in vector metadata
+            folders: Candidate folders, the first existing one is used
+            include_subfolders: Also ingest images one level below the folder
+            root_names: Subfolder names that are the category itself (no subcategory)
+        """
+        self.category = category
+        self.folders = [str(folder) for folder in folders]
+        self.include_subfolders = include_subfolders
+        self.root_names = {name.lower() for name in root_names}
+
+    def resolve_folder(self) -> Optional[Path]:
+        """First candidate folder that exists"""
+        for folder in self.folders:
+            if Path(folder).is_dir():
+                return Path(folder)
+        return None
+
+    def subcategory(self, path: Path, folder: Path) -> Optional[str]:
+        """Subfolder name of an image below the category folder"""
+        if path.parent == folder or path.parent.name.lower() in self.root_names:
+            return None
+        return path.parent.name
+
+
+# Folder layouts of the bundled datasets
+CATEGORY_LAYOUTS = {
+    'healthcare': CategoryLayout(
+        'healthcare', ['images/healthcare', 'images/Healthcare'], root_names=['healthcare']
+    ),
+    'satellite': CategoryLayout(
+        'satellite', ['images/satellite'], root_names=['satellite']
+    ),
+    'surveillance': CategoryLayout(
+        'surveillance',
+        ['images/Survelliance/images', 'images/Surveillance/images'],
+        include_subfolders=False,
+        root_names=['surveillance', 'survelliance']
+    ),
+}
+
+
+class IngestionSettings:
+    """Per-stage concurrency and queue bounds"""
+
+    def __init__(
+        self,
+        decode_workers: int = 4,
+        inference_batch_size: int = 16,
+        upload_workers: int = 8,
+        upsert_batch_size: int = 100,
+        queue_size: int = 64,
+        trace_memory: bool = False
+    ):
+        self.decode_workers = max(1, int(decode_workers))
+        self.inference_batch_size = max(1, int(inference_batch_size))
+        self.upload_workers = max(1, int(upload_workers))
+        self.upsert_batch_size = max(1, int(upsert_batch_size))
+        self.queue_size = max(1, int(queue_size))
+        self.trace_memory = trace_memory  # per-image bytes read and peak RSS in the report
+
+    @classmethod
+    def from_config(cls, config, **overrides):
+        """Settings from the INGEST_* configuration values, with overrides"""
+        settings = {
+            'decode_workers': config.INGEST_DECODE_WORKERS,
+            'inference_batch_size': config.INGEST_INFERENCE_BATCH_SIZE,
+            'upload_workers': config.INGEST_UPLOAD_WORKERS,
+            'upsert_batch_size': config.INGEST_UPSERT_BATCH_SIZE,
+            'queue_size': config.INGEST_QUEUE_SIZE,
+            'trace_memory': False,
+        }
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**settings)
+
+
+class StageStats:
+    """Thread-safe counters for one pipeline stage"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0  # already ingested according to the manifest
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # waiting on a full downstream queue
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.perf_counter()
+
+    def finish(self):
+        with self._lock:
+            self.finished_at = time.perf_counter()
+
+    def record(self, processed: int, failed: int, seconds: float, skipped: int = 0):
+        with self._lock:
+            self.processed += processed
+            self.failed += failed
+            self.skipped += skipped
+            self.calls += 1
+            self.busy_seconds += seconds
+
+    def record_blocked(self, seconds: float):
+        with self._lock:
+            self.blocked_seconds += seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            end = self.finished_at or time.perf_counter()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            return {
+                'stage': self.name,
+                'workers': self.workers,
+                'processed': self.processed,
+                'failed': self.failed,
+                'skipped': self.skipped,
+                'calls': self.calls,
+                'elapsed_s': elapsed,
+                'busy_s': self.busy_seconds,
+                'blocked_s': self.blocked_seconds,
+                'throughput': self.processed / elapsed if elapsed > 0 else 0.0,
+                # Fraction of worker time spent doing work
+                'utilization': self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            }
+
+
+class _Item:
+    """One image travelling through the pipeline"""
+
+    __slots__ = (
+        'path', 'subcategory', 'size', 'mtime_ns', 'content_hash', 'previous',
+        'data', 'image', 'features', 'vector', 'stale_id', 'skipped'
+    )
+
+    def __init__(self, path: Path, subcategory: Optional[str]):
+        self.path = path
+        self.subcategory = subcategory
+        stat = path.stat()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.content_hash: Optional[str] = None
+        self.previous: Optional[Dict[str, Any]] = None  # manifest row from an earlier run
+        self.data: Optional[bytes] = None
+        self.image = None
+        self.features = None
+        self.vector: Optional[Dict[str, Any]] = None
+        self.stale_id: Optional[str] = None  # vector ID of an older version of the file
+        self.skipped = False
+
+
+class IngestionPipeline:
+    """
+    Bulk image ingestion into the image storage and vector store backends
+
+    Each stage runs its own worker threads and hands items downstream through a
+    bounded queue, so a slow stage applies backpressure instead of letting
+    decoded images pile up in memory. With a manifest, files already upserted
+    with the current model are skipped and unchanged uploads are reused.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        image_service,
+        vector_store,
+        settings: Optional[IngestionSettings] = None,
+        manifest: Optional[IngestionManifest] = None
+    ):
+        """
+        Args:
+            extractor: Object exposing extract_batch_features(images)
+            image_service: Object exposing upload_image(data, filename, category)
+            vector_store: VectorStore receiving the vectors
+            settings: Stage concurrency (default: IngestionSettings())
+            manifest: Progress record for resumable runs (default: none)
+        """
+        self.extractor = extractor
+        self.image_service = image_service
+        self.vector_store = vector_store
+        self.settings = settings or IngestionSettings()
+        self.manifest = manifest
+        self.model_version = getattr(extractor, 'model_version', None)
+        self.decode_min_side = getattr(extractor, 'decode_min_side', None)
+
+        self._category = None
+        self._failures: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+        self._upserted = 0
+        self._reused_uploads = 0
+        self._bytes_read = 0
+        self._largest_read = 0
+        self._image_traces: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def discover(layout: CategoryLayout, folder: Path) -> Iterator[Path]:
+        """Image files in the folder (and one level below if the layout allows)"""
+        for entry in sorted(folder.iterdir()):
+            if entry.is_file() and entry.suffix.lower() in IMAGE_EXTENSIONS:
+                yield entry
+            elif entry.is_dir() and layout.include_subfolders:
+                for child in sorted(entry.iterdir()):
+                    if child.is_file() and child.suffix.lower() in IMAGE_EXTENSIONS:
+                        yield child
+
+    def run(
+        self,
+        layout: CategoryLayout,
+        folder: Optional[Path] = None,
+        limit: Optional[int] = None,
+        paths: Optional[Iterable[Path]] = None
+    ) -> Dict[str, Any]:
+        """
+        Ingest every image of a category
+
+        Args:
+            layout: Category layout
+            folder: Folder override (default: layout.resolve_folder())
+            limit: Stop discovery after this many images
+            paths: Files to ingest instead of discovering the folder (e.g. one shard)
+
+        Returns:
+            Report with totals, per-stage stats and failures
+        """
+        folder = Path(folder) if folder else layout.resolve_folder()
+        if folder is None or not folder.is_dir():
+            raise FileNotFoundError(f"No image folder for {layout.category}: {layout.folders}")
+
+        s = self.settings
+        self._category = layout.category
+        self._failures = []
+        self._upserted = 0
+        self._reused_uploads = 0
+        self._bytes_read = 0
+        self._largest_read = 0
+        self._image_traces = []
+
+        found: Queue = Queue(maxsize=s.queue_size)
+        decoded: Queue = Queue(maxsize=s.queue_size)
+        embedded: Queue = Queue(maxsize=s.queue_size)
+        uploaded: Queue = Queue(maxsize=s.queue_size)
+
+        stats = {
+            'discover': StageStats('discover', 1),
+            'decode': StageStats('decode', s.decode_workers),
+            'inference': StageStats('inference', 1),
+            'upload': StageStats('upload', s.upload_workers),
+            'upsert': StageStats('upsert', 1),
+        }
+
+        def discover_worker():
+            stage = stats['discover']
+            stage.start()
+            count = 0
+            try:
+                for path in (paths if paths is not None else self.discover(layout, folder)):
+                    if limit is not None and count >= limit:
+                        break
+                    count += 1
+                    try:
+                        item = _Item(path, layout.subcategory(path, folder))
+                    except OSError as e:
+                        logger.error(f"❌ Cannot stat {path}: {e}")
+                        stage.record(0, 1, 0.0)
+                        continue
+                    if self._unchanged(item):
+                        stage.record(0, 0, 0.0, skipped=1)
+                        continue
+                    stage.record(1, 0, 0.0)
+                    self._put(found, item, stage)
+            except Exception as e:
+                logger.error(f"❌ Discovery failed in {folder}: {e}")
+            finally:
+                for _ in range(s.decode_workers):
+                    self._put(found, _END, stage)
+                stage.finish()
+
+        threads = [threading.Thread(target=discover_worker, name='ingest-discover', daemon=True)]
+        threads += self._start_stage(stats['decode'], found, decoded, self._decode, 1, 1)
+        threads += self._start_stage(
+            stats['inference'], decoded, embedded, self._infer,
+            s.inference_batch_size, s.upload_workers
+        )
+        threads += self._start_stage(
+            stats['upload'], embedded, uploaded,
+            lambda batch: self._upload(batch, layout.category), 1, 1
+        )
+        threads += self._start_stage(stats['upsert'], uploaded, None, self._upsert, s.upsert_batch_size, 0)
+
+        logger.info(f"⚡ Ingesting {layout.category} images from {folder}")
+        start = time.perf_counter()
+        threads[0].start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        stage_stats = [stage.as_dict() for stage in stats.values()]
+        return {
+            'category': layout.category,
+            'folder': str(folder),
+            'discovered': stats['discover'].processed + stats['discover'].skipped,
+            'succeeded': self._upserted,
+            'skipped': sum(stage['skipped'] for stage in stage_stats),
+            'reused_uploads': self._reused_uploads,
+            'failed': len(self._failures),
+            'elapsed_s': elapsed,
+            'rate': self._upserted / elapsed if elapsed > 0 else 0.0,
+            'bytes_read': self._bytes_read,
+            'largest_image_bytes': self._largest_read,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': stage_stats,
+            'failures': list(self._failures),
+            'images': list(self._image_traces),
+        }
+
+    def _start_stage(self, stage: StageStats, inbox: Queue, outbox: Optional[Queue], handler,
+                     batch_size: int, downstream_workers: int) -> List[threading.Thread]:
+        """Start a stage's workers; the last one to finish signals the next stage"""
+        remaining = [stage.workers]
+        lock = threading.Lock()
+
+        def worker():
+            stage.start()
+            done = False
+            while not done:
+                batch, done = self._take(inbox, batch_size)
+                if batch:
+                    t0 = time.perf_counter()
+                    try:
+                        results = handler(batch)
+                    except Exception as e:
+                        # Never let one stage die and stall the queues
+                        for item in batch:
+                            self._fail(item, stage.name, e)
+                        results = []
+                    forward = [item for item in results if not item.skipped]
+                    stage.record(
+                        len(forward), len(batch) - len(results), time.perf_counter() - t0,
+                        skipped=len(results) - len(forward)
+                    )
+                    if outbox is not None:
+                        for item in forward:
+                            self._put(outbox, item, stage)
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                if outbox is not None:
+                    for _ in range(downstream_workers):
+                        self._put(outbox, _END, stage)
+                stage.finish()
+
+        threads = [
+            threading.Thread(target=worker, name=f'ingest-{stage.name}-{i}', daemon=True)
+            for i in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _take(inbox: Queue, batch_size: int):
+        """Block until batch_size items or the end marker arrive"""
+        batch = []
+        while len(batch) < batch_size:
+            item = inbox.get()
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _put(outbox: Queue, item, stage: StageStats):
+        """Put with backpressure accounting"""
+        t0 = time.perf_counter()
+        outbox.put(item)
+        waited = time.perf_counter() - t0
+        if waited > 0.001:
+            stage.record_blocked(waited)
+
+    def _fail(self, item: _Item, stage: str, error: Exception):
+        with self._lock:
+            self._failures.append({'path': str(item.path), 'stage': stage, 'error': str(error)})
+        logger.error(f"❌ {stage} failed for {item.path.name}: {error}")
+        if self.manifest is not None:
+            try:
+                self.manifest.record_failure(item.path, self._category, stage, str(error))
+            except Exception as e:
+                logger.error(f"❌ Manifest update failed for {item.path.name}: {e}")
+
+    def _unchanged(self, item: _Item) -> bool:
+        """Manifest says this exact file is already in the store (stat check, no read)"""
+        if self.manifest is None:
+            return False
+        item.previous = self.manifest.get(item.path)
+        return (
+            IngestionManifest.is_current(item.previous, self._category, self.model_version)
+            and item.previous['size'] == item.size
+            and item.previous['mtime_ns'] == item.mtime_ns
+        )
+
+    def _decode(self, batch: List[_Item]) -> List[_Item]:
+        """Read file bytes once; the same buffer is hashed, decoded and later uploaded"""
+        results = []
+        for item in batch:
+            try:
+                item.data = read_file(item.path)
+                with self._lock:
+                    self._bytes_read += len(item.data)
+                    self._largest_read = max(self._largest_read, len(item.data))
+                if self.manifest is not None:
+                    item.content_hash = hashlib.sha256(item.data).hexdigest()
+                    # Touched but identical content: nothing to redo
+                    if (IngestionManifest.is_current(item.previous, self._category, self.model_version)
+                            and item.previous['content_hash'] == item.content_hash):
+                        self.manifest.touch(item.path, item.size, item.mtime_ns)
+                        item.data = None
+                        item.skipped = True
+                        results.append(item)
+                        continue
+                t0 = time.perf_counter()
+                item.image = decode_rgb(item.data, self.decode_min_side)
+                if self.settings.trace_memory:
+                    self._trace(item, (time.perf_counter() - t0) * 1000)
+                results.append(item)
+            except Exception as e:
+                self._fail(item, 'decode', e)
+        return results
+
+    def _trace(self, item: _Item, decode_ms: float):
+        """Per-image read size and process peak RSS (shared by all decode workers)"""
+        trace = {
+            'path': str(item.path),
+            'bytes_read': len(item.data),
+            'pixels': item.image.width * item.image.height,
+            'decode_ms': decode_ms,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        with self._lock:
+            self._image_traces.append(trace)
+        logger.info(
+            f"📏 {item.path.name}: {trace['bytes_read'] / 1024 / 1024:.1f} MB read, "
+            f"{trace['pixels'] / 1e6:.1f} MP, decode {decode_ms:.0f} ms, "
+            f"peak RSS {trace['peak_rss_mb'] or 0:.0f} MB"
+        )
+
+    def _infer(self, batch: List[_Item]) -> List[_Item]:
+        """One forward pass per batch; retry per image to isolate a bad input"""
+        try:
+            features = self.extractor.extract_batch_features([item.image for item in batch])
+        except Exception as e:
+            logger.warning(f"⚠️ Batch inference failed ({e}), retrying images one by one")
+            features = []
+            for item in batch:
+                try:
+                    features.append(self.extractor.extract_batch_features([item.image])[0])
+                except Exception as item_error:
+                    self._fail(item, 'inference', item_error)
+                    features.append(None)
+
+        results = []
+        for item, vector in zip(batch, features):
+            item.image = None
+            if vector is not None:
+                item.features = vector
+                results.append(item)
+        return results
+
+    def _upload(self, batch: List[_Item], category: str) -> List[_Item]:
+        """Upload the original bytes and build the vector record"""
+        results = []
+        for item in batch:
+            try:
+                previous = item.previous
+                if self.manifest is not None and IngestionManifest.has_upload(
+                        previous, category, item.content_hash):
+                    result = {'public_id': previous['public_id'], 'secure_url': previous['storage_url']}
+                    with self._lock:
+                        self._reused_uploads += 1
+                else:
+                    result = self.image_service.upload_image(item.data, item.path.name, category)
+
+                if item.subcategory:
+                    vector_id = f"quantum-images_{category}_{item.subcategory}_{item.path.stem}"
+                else:
+                    vector_id = result['public_id'].replace('/', '_')
+
+                metadata = {
+                    'filename': item.path.name,
+                    'category': category,
+                    'cloudinary_url': result['secure_url'],
+                    'uploaded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ')
+                }
+                if item.subcategory:
+                    metadata['subcategory'] = item.subcategory.lower()
+
+                item.vector = {'id': vector_id, 'values': item.features, 'metadata': metadata}
+                item.data = None
+                if previous and previous['vector_id'] and previous['vector_id'] != vector_id:
+                    item.stale_id = previous['vector_id']
+                if self.manifest is not None:
+                    self.manifest.record_upload(
+                        item.path, category, item.size, item.mtime_ns, item.content_hash,
+                        self.model_version, result['public_id'], result['secure_url'], vector_id
+                    )
+                results.append(item)
+            except Exception as e:
+                self._fail(item, 'upload', e)
+        return results
+
+    def _upsert(self, batch: List[_Item]) -> List[_Item]:
+        """Write a batch of vectors to the store; only the vectors that landed count"""
+        try:
+            errors = self.vector_store.upsert_vectors_batch_detailed([item.vector for item in batch]).errors()
+        except Exception as e:
+            errors = {item.vector['id']: str(e) for item in batch}
+
+        done = []
+        for item in batch:
+            error = errors.get(item.vector['id'])
+            if error is None:
+                done.append(item)
+            else:
+                self._fail(item, 'upsert', error)
+        if not done:
+            return []
+
+        self._upserted += len(done)
+        logger.info(f"📦 Upserted {len(done)} vectors ({self._upserted} total)")
+        if self.manifest is not None:
+            self.manifest.record_upserted(item.path for item in done)
+
+        # A changed file uploaded under a new ID replaces its old vector
+        for item in done:
+            if item.stale_id:
+                self.vector_store.delete_vector(item.stale_id)
+        return done
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Human-readable summary lines for a pipeline report"""
+    lines = [
+        f"✅ Success: {report['succeeded']}/{report['discovered']}",
+        f"⏭️  Skipped: {report['skipped']}/{report['discovered']} (already ingested)",
+        f"❌ Failed:  {report['failed']}/{report['discovered']}",
+        f"⏱️  Time:    {report['elapsed_s']:.1f}s",
+        f"📈 Rate:    {report['rate']:.2f} images/second",
+        f"💾 Read:    {report['bytes_read'] / 1024 / 1024:.1f} MB "
+        f"(largest image {report['largest_image_bytes'] / 1024 / 1024:.1f} MB, "
+        f"peak RSS {report['peak_rss_mb'] or 0:.0f} MB)",
+        "",
+        f"{'stage':<10} {'workers':>7} {'items':>7} {'skipped':>7} {'failed':>6} "
+        f"{'items/s':>8} {'busy %':>7} {'blocked s':>9}",
+    ]
+    for stage in report['stages']:
+        lines.append(
+            f"{stage['stage']:<10} {stage['workers']:>7} {stage['processed']:>7} {stage['skipped']:>7} "
+            f"{stage['failed']:>6} {stage['throughput']:>8.1f} "
+            f"{stage['utilization'] * 100:>6.0f}% {stage['blocked_s']:>9.1f}"
+        )
+    for worker in report.get('workers', []):
+        if worker['elapsed_s'] is None:
+            lines.append(f"process {worker['worker']}: failed ({worker['files']} images)")
+            continue
+        lines.append(
+            f"process {worker['worker']}: {worker['forwarded']}/{worker['files']} images in "
+            f"{worker['elapsed_s']:.1f}s (peak RSS {worker['peak_rss_mb'] or 0:.0f} MB)"
+        )
+    return lines
@@ -0,0 +1,226 @@
+"""
+Vector Snapshots
+Export every vector to sharded compressed files and bulk-load them back,
+so rebuilding or migrating an index needs no inference and no uploads
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FILE = 'snapshot.json'
+SUPPORTED_DTYPES = ('float32', 'float16')
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_shard(path: Path, rows: List[Dict[str, Any]], dtype: str):
+    """One compressed shard: ids, an (n, dim) value matrix and JSON metadata"""
+    np.savez_compressed(
+        path,
+        ids=np.array([row['id'] for row in rows], dtype=np.str_),
+        values=np.asarray([row['values'] for row in rows], dtype=dtype),
+        metadata=np.array([json.dumps(row.get('metadata') or {}) for row in rows], dtype=np.str_)
+    )
+
+
+def export_snapshot(
+    vector_store,
+    out_dir: Union[str, Path],
+    dtype: str = 'float32',
+    shard_size: int = 10000,
+    page_size: int = 100
+) -> Dict[str, Any]:
+    """
+    Write every vector of a store to a snapshot directory
+
+    Args:
+        vector_store: Source VectorStore
+        out_dir: Directory for the shards and snapshot.json (created if missing)
+        dtype: 'float32' (exact) or 'float16' (half the size, ~1e-3 relative error)
+        shard_size: Vectors per shard file
+        page_size: Vectors fetched per request from the store
+
+    Returns:
+        The snapshot description (also written to snapshot.json)
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"dtype must be one of {SUPPORTED_DTYPES}, got '{dtype}'")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if (out_dir / SNAPSHOT_FILE).exists():
+        raise FileExistsError(f"{out_dir} already holds a snapshot")
+
+    stats = vector_store.get_statistics()
+    start = time.perf_counter()
+    shards = []
+    dimension = None
+    rows: List[Dict[str, Any]] = []
+
+    def flush():
+        path = out_dir / f"vectors-{len(shards):05d}.npz"
+        _write_shard(path, rows, dtype)
+        shards.append({'file': path.name, 'count': len(rows), 'sha256': _sha256(path)})
+        logger.info(f"💾 {path.name}: {len(rows)} vectors ({sum(s['count'] for s in shards)} total)")
+        rows.clear()
+
+    for page in vector_store.export_vectors(page_size):
+        for row in page:
+            if dimension is None:
+                dimension = len(row['values'])
+            elif len(row['values']) != dimension:
+                raise ValueError(f"{row['id']} has {len(row['values'])} values, expected {dimension}")
+            rows.append(row)
+            if len(rows) >= shard_size:
+                flush()
+    if rows:
+        flush()
+
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'created_at': datetime.utcnow().isoformat(),
+        'source': stats.get('index_name', ''),
+        'dimension': dimension or stats.get('dimension'),
+        'dtype': dtype,
+        'count': sum(shard['count'] for shard in shards),
+        'shards': shards,
+    }
+    # Written last: a directory without snapshot.json is an unfinished export
+    with open(out_dir / SNAPSHOT_FILE, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"✅ Exported {snapshot['count']} vectors in {len(shards)} shards ({elapsed:.1f}s)")
+    return snapshot
+
+
+def read_snapshot(snapshot_dir: Union[str, Path]) -> Dict[str, Any]:
+    """Load and check snapshot.json"""
+    path = Path(snapshot_dir) / SNAPSHOT_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"No {SNAPSHOT_FILE} in {snapshot_dir} (missing or unfinished export)")
+    with open(path) as f:
+        snapshot = json.load(f)
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {snapshot.get('format')}")
+    return snapshot
+
+
+def iter_snapshot(
+    snapshot_dir: Union[str, Path],
+    batch_size: int = 100,
+    verify: bool = True
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream a snapshot as upsert batches, one shard in memory at a time
+
+    Args:
+        snapshot_dir: Directory written by export_snapshot
+        batch_size: Vectors per yielded batch
+        verify: Check each shard's sha256 before reading it
+
+    Yields:
+        Lists of dicts with 'id', 'values' (float32 lists) and 'metadata'
+    """
+    snapshot_dir = Path(snapshot_dir)
+    snapshot = read_snapshot(snapshot_dir)
+    for shard in snapshot['shards']:
+        path = snapshot_dir / shard['file']
+        if verify and _sha256(path) != shard['sha256']:
+            raise ValueError(f"Checksum mismatch in {path}")
+        with np.load(path, allow_pickle=False) as data:
+            ids = data['ids']
+            values = data['values'].astype(np.float32, copy=False)
+            metadata = data['metadata']
+        for start in range(0, len(ids), batch_size):
+            yield [
+                {'id': str(ids[i]), 'values': values[i].tolist(), 'metadata': json.loads(str(metadata[i]))}
+                for i in range(start, min(start + batch_size, len(ids)))
+            ]
+
+
+def load_snapshot(
+    vector_store,
+    snapshot_dir: Union[str, Path],
+    batch_size: int = 100,
+    workers: int = 4,
+    verify: bool = True
+) -> Dict[str, Any]:
+    """
+    Upsert every vector of a snapshot with parallel batched writes
+
+    At most 2 x workers batches are decoded ahead of the writers, so memory
+    stays bounded by one shard plus the in-flight batches.
+
+    Args:
+        vector_store: Target VectorStore (its write listeners run as usual)
+        snapshot_dir: Directory written by export_snapshot
+        batch_size: Vectors per upsert call
+        workers: Concurrent upsert calls
+        verify: Check shard checksums
+
+    Returns:
+        Counts and timing: 'expected', 'loaded', 'failed', 'elapsed_s', 'rate'
+    """
+    snapshot = read_snapshot(snapshot_dir)
+    target_dimension = vector_store.get_statistics().get('dimension')
+    if target_dimension and snapshot['dimension'] and target_dimension != snapshot['dimension']:
+        raise ValueError(
+            f"Snapshot has {snapshot['dimension']}D vectors, target index is {target_dimension}D"
+        )
+
+    lock = threading.Lock()
+    counts = {'loaded': 0, 'failed': 0}
+
+    def upsert(batch):
+        try:
+            failed = vector_store.upsert_vectors_batch_detailed(batch).failed
+        except Exception as e:
+            logger.error(f"❌ Upsert of {len(batch)} vectors failed: {e}")
+            failed = len(batch)
+        with lock:
+            counts['loaded'] += len(batch) - failed
+            counts['failed'] += failed
+            done = counts['loaded'] + counts['failed']
+        if done % 10000 < len(batch):
+            logger.info(f"   Loaded {done}/{snapshot['count']} vectors...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snapshot-load') as pool:
+        pending = set()
+        for batch in iter_snapshot(snapshot_dir, batch_size, verify):
+            if len(pending) >= 2 * workers:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.add(pool.submit(upsert, batch))
+        wait(pending)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        'expected': snapshot['count'],
+        'loaded': counts['loaded'],
+        'failed': counts['failed'],
+        'elapsed_s': elapsed,
+        'rate': counts['loaded'] / elapsed if elapsed > 0 else 0.0,
+    }
+    logger.info(
+        f"{'✅' if not counts['failed'] else '⚠️ '} Loaded {counts['loaded']}/{snapshot['count']} vectors "
+        f"in {elapsed:.1f}s ({report['rate']:.0f} vectors/s)"
+    )
+    return report
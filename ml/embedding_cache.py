@@ -0,0 +1,167 @@
+"""
+Content-Addressed Embedding Cache
+Skips decode and inference for image bytes that were already embedded
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.local_store import MmapRowStore
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of feature vectors keyed by a hash of the image bytes
+
+    - Memory tier: bounded LRU of recently used vectors
+    - Disk tier: memory-mapped float32 records that survive restarts
+      (oldest entries are evicted once the tier is full)
+
+    The model version is part of the disk file name, so changing the model,
+    feature dimension or precision never serves stale vectors.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        model_version: str,
+        feature_dim: int,
+        memory_items: int = 2048,
+        disk_items: int = 100000
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Directory for the on-disk tier
+            model_version: Model/feature-dimension version tag
+            feature_dim: Feature vector dimension
+            memory_items: Maximum vectors kept in memory (LRU)
+            disk_items: Maximum vectors kept on disk (0 disables the disk tier)
+        """
+        self.model_version = model_version
+        self.feature_dim = feature_dim
+        self.memory_items = max(1, int(memory_items))
+        self.disk_items = max(0, int(disk_items))
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._disk: Optional[MmapRowStore] = None
+        if self.disk_items > 0:
+            safe_version = re.sub(r'[^A-Za-z0-9_.-]', '_', model_version)
+            self._disk = MmapRowStore(
+                directory,
+                (feature_dim,),
+                name=f"embeddings_{safe_version}"
+            )
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._memory_evictions = 0
+        self._disk_evictions = 0
+
+        logger.info(
+            f"Embedding cache ready ({model_version}, memory={self.memory_items}, "
+            f"disk={self.disk_items}, on disk={len(self._disk) if self._disk else 0})"
+        )
+
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        """Content hash of the image bytes"""
+        return hashlib.sha256(data).hexdigest()
+
+    def lookup(self, data: bytes) -> Tuple[str, Optional[List[float]]]:
+        """
+        Hash image bytes and look them up
+
+        Returns:
+            Tuple of (cache key, feature vector or None)
+        """
+        key = self.key_for(data)
+        return key, self.get(key)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get a cached vector by key (memory tier first, then disk)"""
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return vector.tolist()
+
+            if self._disk is not None:
+                vector = self._disk.get(key)
+                if vector is not None:
+                    self._disk_hits += 1
+                    self._remember(key, vector)
+                    return vector.tolist()
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, features: List[float]):
+        """Store a vector in both tiers"""
+        vector = np.asarray(features, dtype=np.float32)
+        if vector.shape != (self.feature_dim,):
+            logger.warning(f"⚠️ Not caching vector with shape {vector.shape}")
+            return
+
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is not None and key not in self._disk:
+                self._disk.put(key, vector)
+                overflow = len(self._disk) - self.disk_items
+                if overflow > 0:
+                    # Key order follows insertion order, oldest first; evict
+                    # in 1% slices so a full tier doesn't rescan on every put
+                    overflow = max(overflow, self.disk_items // 100)
+                    oldest = self._disk.keys()[:overflow]
+                    self._disk_evictions += self._disk.delete_many(oldest)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+            self._memory_evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit ratio, tier sizes and eviction counters
+        """
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                'model_version': self.model_version,
+                'hit_ratio': (hits / lookups) if lookups else 0.0,
+                'memory_hits': self._memory_hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'memory_size': len(self._memory),
+                'memory_capacity': self.memory_items,
+                'disk_size': len(self._disk) if self._disk is not None else 0,
+                'disk_capacity': self.disk_items,
+                'disk_size_mb': (self._disk.nbytes / 1024 / 1024) if self._disk is not None else 0.0,
+                'memory_evictions': self._memory_evictions,
+                'disk_evictions': self._disk_evictions
+            }
+
+    def close(self):
+        """Flush the disk tier"""
+        if self._disk is not None:
+            self._disk.close()
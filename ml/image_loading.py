@@ -0,0 +1,101 @@
+"""
+Image Loading
+Read each image once and decode it from the same buffer that is uploaded
+"""
+
+import io
+import math
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+from PIL import Image
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+
+
+def read_file(path: Union[str, Path]) -> bytes:
+    """Read a whole file with a single allocation"""
+    return Path(path).read_bytes()
+
+
+def ensure_rgb(image: Image.Image, release: bool = False) -> Image.Image:
+    """
+    Return the image itself when already RGB, else an RGB copy
+
+    Args:
+        image: PIL image
+        release: Close the source after converting (only for images the caller owns)
+    """
+    if image.mode == 'RGB':
+        return image
+    rgb = image.convert('RGB')
+    if release:
+        image.close()
+    return rgb
+
+
+def draft_size(size, min_side: int):
+    """Smallest size with the same aspect ratio whose shorter side is min_side"""
+    scale = min_side / min(size)
+    return math.ceil(size[0] * scale), math.ceil(size[1] * scale)
+
+
+def reduce_to(image: Image.Image, min_side: int) -> Image.Image:
+    """Box-downscale by an integer factor, keeping the shorter side >= min_side"""
+    factor = min(image.size) // min_side
+    if factor < 2:
+        return image
+    reduced = image.reduce(factor)
+    image.close()
+    return reduced
+
+
+def decode_rgb(data: bytes, min_side: Optional[int] = None) -> Image.Image:
+    """
+    Decode image bytes into an RGB PIL image
+
+    BytesIO over an immutable bytes object shares its buffer, so the only
+    full-size copies alive afterwards are the encoded bytes and one decoded
+    image (two only while a non-RGB image is converted).
+
+    Args:
+        data: Encoded image
+        min_side: Shorter side the consumer resizes to. JPEGs are then decoded
+            at 1/2, 1/4 or 1/8 scale in the DCT domain (Image.draft) and other
+            formats are reduce()d, never below min_side.
+    """
+    image = Image.open(io.BytesIO(data))
+    if min_side and min(image.size) >= 2 * min_side:
+        image.draft(image.mode, draft_size(image.size, min_side))
+    image.load()
+    image = ensure_rgb(image, release=True)
+    return reduce_to(image, min_side) if min_side else image
+
+
+def load_rgb(image, min_side: Optional[int] = None) -> Image.Image:
+    """PIL image or path -> RGB PIL image (paths decoded as in decode_rgb)"""
+    if isinstance(image, (str, Path)):
+        return decode_rgb(read_file(image), min_side)
+    if not isinstance(image, Image.Image):
+        raise ValueError("Image must be PIL Image or path string")
+    return ensure_rgb(image)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    except ImportError:
+        return None
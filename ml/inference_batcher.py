@@ -0,0 +1,220 @@
+"""
+Dynamic Micro-Batching Inference Queue
+Groups concurrent single-image requests into one batched ResNet-50 forward pass
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Queue-wait histogram bucket upper bounds (milliseconds)
+QUEUE_WAIT_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000]
+
+
+class _PendingRequest:
+    """Single image waiting for a batch slot"""
+
+    __slots__ = ('image', 'future', 'enqueued_at')
+
+    def __init__(self, image):
+        self.image = image
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceBatcher:
+    """
+    Shared in-process batcher in front of UnifiedFeatureExtractor
+
+    Callers submit one image each; a single worker thread collects requests
+    until either max_batch_size images are queued or the oldest request has
+    waited max_wait_ms, then runs one extract_batch_features() call and hands
+    every caller its own vector.
+    """
+
+    def __init__(self, extractor, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        """
+        Initialize the batcher
+
+        Args:
+            extractor: Object exposing extract_batch_features(images)
+            max_batch_size: Maximum images per forward pass (default: 8)
+            max_wait_ms: Maximum time the oldest request waits for a batch (default: 5ms)
+        """
+        self.extractor = extractor
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "Queue[Optional[_PendingRequest]]" = Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Histograms
+        self._batch_size_counts = [0] * (self.max_batch_size + 1)
+        self._wait_bucket_counts = [0] * (len(QUEUE_WAIT_BUCKETS_MS) + 1)
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+
+        logger.info(
+            f"Inference batcher ready (max_batch_size={self.max_batch_size}, "
+            f"max_wait={max_wait_ms}ms)"
+        )
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._running:
+            return
+        with self._lock:
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(
+                    target=self._worker_loop,
+                    name='inference-batcher',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, image) -> Future:
+        """
+        Queue one image for feature extraction
+
+        Args:
+            image: PIL Image or path to image
+
+        Returns:
+            Future resolving to the feature vector (list of floats)
+        """
+        self._ensure_worker()
+        request = _PendingRequest(image)
+        self._queue.put(request)
+        return request.future
+
+    def extract_features(self, image) -> List[float]:
+        """Blocking drop-in replacement for UnifiedFeatureExtractor.extract_features"""
+        return self.submit(image).result()
+
+    async def extract_features_async(self, image) -> List[float]:
+        """Await a feature vector without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(image))
+
+    def _collect_batch(self, first: _PendingRequest) -> List[_PendingRequest]:
+        """Gather requests until the batch is full or the oldest one times out"""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except Empty:
+                break
+
+            if request is None:
+                # Shutdown sentinel - put it back for the outer loop
+                self._queue.put(None)
+                break
+            batch.append(request)
+
+        return batch
+
+    def _worker_loop(self):
+        """Consume the queue and run batched inference"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = self._collect_batch(first)
+            started = time.perf_counter()
+            self._record_batch(batch, started)
+
+            try:
+                features = self.extractor.extract_batch_features(
+                    [request.image for request in batch]
+                )
+                # Vectors are matched by position, so a short result cannot be assigned
+                if len(features) != len(batch):
+                    raise RuntimeError(
+                        f"Extractor returned {len(features)} vectors for {len(batch)} images"
+                    )
+                for request, vector in zip(batch, features):
+                    request.future.set_result(vector)
+            except Exception as e:
+                logger.error(f"❌ Batched inference failed ({len(batch)} images): {e}")
+                with self._lock:
+                    self._errors += 1
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _record_batch(self, batch: List[_PendingRequest], started: float):
+        """Update batch-size and queue-wait histograms"""
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._batch_size_counts[len(batch)] += 1
+
+            for request in batch:
+                wait_ms = (started - request.enqueued_at) * 1000
+                self._wait_total_ms += wait_ms
+                self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+                bucket = len(QUEUE_WAIT_BUCKETS_MS)
+                for i, bound in enumerate(QUEUE_WAIT_BUCKETS_MS):
+                    if wait_ms <= bound:
+                        bucket = i
+                        break
+                self._wait_bucket_counts[bucket] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics
+
+        Returns:
+            Dictionary with batch-size and queue-wait histograms
+        """
+        with self._lock:
+            wait_labels = [f"<={b}ms" for b in QUEUE_WAIT_BUCKETS_MS]
+            wait_labels.append(f">{QUEUE_WAIT_BUCKETS_MS[-1]}ms")
+
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'requests': self._requests,
+                'batches': self._batches,
+                'errors': self._errors,
+                'queue_depth': self._queue.qsize(),
+                'mean_batch_size': (self._requests / self._batches) if self._batches else 0.0,
+                'batch_size_histogram': {
+                    str(size): count
+                    for size, count in enumerate(self._batch_size_counts)
+                    if size > 0 and count > 0
+                },
+                'queue_wait_histogram': dict(zip(wait_labels, self._wait_bucket_counts)),
+                'mean_queue_wait_ms': (self._wait_total_ms / self._requests) if self._requests else 0.0,
+                'max_queue_wait_ms': self._wait_max_ms
+            }
+
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the worker thread after draining queued requests"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
@@ -0,0 +1,192 @@
+"""
+Model Weight Artifacts
+Versioned, checksummed state dicts of the full feature model (backbone plus
+projection head), saved once and loaded with memory-mapped tensors
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import torch
+import torch.nn as nn
+from torchvision import models
+
+logger = logging.getLogger(__name__)
+
+# Bump when the model layout or artifact format changes; older files are ignored
+ARTIFACT_FORMAT = 1
+BACKBONE_DIM = 2048
+# Projection heads (feature_dim != 2048) are initialized from this seed
+HEAD_SEED = 0
+
+
+def build_model(feature_dim: int = BACKBONE_DIM, pretrained: bool = True) -> nn.Module:
+    """
+    Build the feature model: ResNet-50 without its classifier, plus a
+    projection head when feature_dim != 2048
+
+    Args:
+        feature_dim: Output feature dimension
+        pretrained: Load ImageNet weights (torch hub download cache); False
+            leaves the backbone uninitialized for loading a state dict
+
+    Returns:
+        nn.Sequential in eval mode
+    """
+    weights = models.ResNet50_Weights.IMAGENET1K_V2 if pretrained else None
+    resnet = models.resnet50(weights=weights)
+    backbone = nn.Sequential(*list(resnet.children())[:-1])
+
+    if feature_dim == BACKBONE_DIM:
+        return nn.Sequential(backbone, nn.Flatten()).eval()
+
+    # Seeded so the untrained head is the same in every process
+    with torch.random.fork_rng(devices=[]):
+        torch.manual_seed(HEAD_SEED)
+        model = nn.Sequential(
+            backbone,
+            nn.Flatten(),
+            nn.Linear(BACKBONE_DIM, feature_dim),
+            nn.ReLU(),
+            nn.BatchNorm1d(feature_dim),
+        )
+    return model.eval()
+
+
+def artifact_name(feature_dim: int) -> str:
+    return f"resnet50-imagenet1k_v2-{feature_dim}d-v{ARTIFACT_FORMAT}"
+
+
+def artifact_paths(artifact_dir: str, feature_dim: int) -> Tuple[Path, Path]:
+    """(state dict file, manifest file) for a feature dimension"""
+    base = Path(artifact_dir) / artifact_name(feature_dim)
+    return base.with_suffix('.pt'), base.with_suffix('.json')
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(model: nn.Module, artifact_dir: str, feature_dim: int) -> Dict[str, Any]:
+    """
+    Save a model's state dict and its manifest (atomically, so concurrent
+    writers and readers never see a partial file)
+
+    Returns:
+        The manifest
+    """
+    weights_path, manifest_path = artifact_paths(artifact_dir, feature_dim)
+    weights_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_weights = weights_path.with_suffix(f'.pt.{os.getpid()}.tmp')
+    torch.save(model.state_dict(), tmp_weights)
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'name': artifact_name(feature_dim),
+        'architecture': 'resnet50',
+        'weights': 'IMAGENET1K_V2',
+        'feature_dim': feature_dim,
+        'head_seed': HEAD_SEED if feature_dim != BACKBONE_DIM else None,
+        'file': weights_path.name,
+        'sha256': file_sha256(tmp_weights),
+        'size_bytes': tmp_weights.stat().st_size,
+        'torch_version': torch.__version__,
+        'created_at': datetime.utcnow().isoformat(),
+    }
+    tmp_manifest = manifest_path.with_suffix(f'.json.{os.getpid()}.tmp')
+    with open(tmp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp_weights, weights_path)
+    os.replace(tmp_manifest, manifest_path)
+    logger.info(f"💾 Saved model artifact {weights_path} ({manifest['size_bytes'] / 1024 / 1024:.1f} MB)")
+    return manifest
+
+
+def read_manifest(artifact_dir: str, feature_dim: int) -> Optional[Dict[str, Any]]:
+    """Manifest of the current-format artifact, or None if there is none"""
+    weights_path, manifest_path = artifact_paths(artifact_dir, feature_dim)
+    if not manifest_path.exists() or not weights_path.exists():
+        return None
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('feature_dim') != feature_dim:
+        return None
+    return manifest
+
+
+def load_artifact(artifact_dir: str, feature_dim: int, verify: bool = True) -> Tuple[nn.Module, Dict[str, Any]]:
+    """
+    Load a saved model without copying weights
+
+    The state dict is opened with torch.load(mmap=True) and assigned into a
+    model built on the meta device, so parameters are views of the page cache
+    (shared between workers on the same host) instead of fresh allocations.
+
+    Args:
+        artifact_dir: Artifact directory
+        feature_dim: Output feature dimension
+        verify: Check the file against the manifest checksum first
+
+    Returns:
+        Tuple of (model in eval mode, manifest)
+
+    Raises:
+        FileNotFoundError: No artifact for this dimension and format
+        ValueError: Checksum mismatch
+    """
+    manifest = read_manifest(artifact_dir, feature_dim)
+    if manifest is None:
+        raise FileNotFoundError(f"No model artifact {artifact_name(feature_dim)} in {artifact_dir}")
+    weights_path, _ = artifact_paths(artifact_dir, feature_dim)
+    if verify and file_sha256(weights_path) != manifest['sha256']:
+        raise ValueError(f"Checksum mismatch for {weights_path}")
+
+    state_dict = torch.load(weights_path, map_location='cpu', mmap=True, weights_only=True)
+    with torch.device('meta'):
+        model = build_model(feature_dim, pretrained=False)
+    model.load_state_dict(state_dict, assign=True)
+    return model.eval(), manifest
+
+
+def load_or_create(
+    artifact_dir: str,
+    feature_dim: int,
+    verify: bool = True,
+    pretrained: bool = True
+) -> Tuple[nn.Module, Dict[str, Any]]:
+    """
+    Load the model artifact, building and saving it first if it is missing
+
+    Only the first start (or `scripts/maintenance/model_artifact.py build`)
+    needs the torch hub weights; later starts need no network.
+
+    Args:
+        artifact_dir: Artifact directory
+        feature_dim: Output feature dimension
+        verify: Check the checksum when loading
+        pretrained: Build from ImageNet weights (False: random backbone, for tests)
+
+    Returns:
+        Tuple of (model in eval mode, manifest)
+    """
+    try:
+        return load_artifact(artifact_dir, feature_dim, verify)
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        logger.warning(f"⚠️ {e}, rebuilding the model artifact")
+
+    logger.info(f"Building model artifact {artifact_name(feature_dim)}...")
+    save_artifact(build_model(feature_dim, pretrained), artifact_dir, feature_dim)
+    # Reload so this process also runs on the memory-mapped weights
+    return load_artifact(artifact_dir, feature_dim, verify=False)
@@ -9,6 +9,7 @@ combining classical deep learning with quantum computing techniques.
 import numpy as np
 from typing import List, Dict, Tuple
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,28 @@ class QuantumKernels:
     Quantum kernel functions for enhanced similarity computation
     """
     
+    PHASE_FACTOR = 0.1
+    
+    @staticmethod
+    def quantum_state_components(
+        v: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Real and imaginary parts of the quantum state encoding
+        
+        Works on a single vector (D,) or a matrix of vectors (N, D)
+        
+        Args:
+            v: Normalized vector(s)
+            
+        Returns:
+            Tuple of (real part, imaginary part)
+        """
+        imag = np.sqrt(
+            np.maximum(0, 1 - v**2)
+        ) * QuantumKernels.PHASE_FACTOR
+        return v, imag
+    
     @staticmethod
     def quantum_fidelity_kernel(v1: np.ndarray, v2: np.ndarray) -> float:
         """
@@ -80,6 +103,133 @@ class QuantumKernels:
         
         return float(np.clip(coherence, 0, 1))
     
+    @staticmethod
+    def quantum_fidelity_kernel_batch(
+        v1: np.ndarray,
+        V2: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized quantum fidelity kernel against many candidates
+        
+        Expands |<ψ1|ψ2>|² into real/imaginary dot products so all
+        candidates are scored with matrix-vector products
+        
+        Args:
+            v1: Normalized query vector (D,)
+            V2: Normalized candidate matrix (N, D)
+            
+        Returns:
+            Fidelity scores (N,) in [0, 1]
+        """
+        a1, b1 = QuantumKernels.quantum_state_components(v1)
+        a2, b2 = QuantumKernels.quantum_state_components(V2)
+        
+        # <ψ1|ψ2> = Σ (a1 - i·b1)(a2 + i·b2)
+        overlap_real = a2 @ a1 + b2 @ b1
+        overlap_imag = b2 @ a1 - a2 @ b1
+        fidelity = overlap_real**2 + overlap_imag**2
+        
+        return np.clip(fidelity, 0, 1)
+    
+    @staticmethod
+    def phase_coherence_kernel_batch(
+        v1: np.ndarray,
+        V2: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized phase coherence kernel against many candidates
+        
+        Uses cos(φ1 - φ2) = cos φ1·cos φ2 + sin φ1·sin φ2
+        
+        Args:
+            v1: Normalized query vector (D,)
+            V2: Normalized candidate matrix (N, D)
+            
+        Returns:
+            Phase coherence scores (N,) in [0, 1]
+        """
+        a1, b1 = QuantumKernels.quantum_state_components(v1)
+        a2, b2 = QuantumKernels.quantum_state_components(V2)
+        
+        phase1 = np.arctan2(b1, a1)
+        phase2 = np.arctan2(b2, a2)
+        
+        coherence = (
+            np.cos(phase2) @ np.cos(phase1) +
+            np.sin(phase2) @ np.sin(phase1)
+        ) / v1.shape[0]
+        coherence = (coherence + 1) / 2
+        
+        return np.clip(coherence, 0, 1)
+    
+    @staticmethod
+    def precompute_state_terms(
+        V: np.ndarray,
+        dtype=np.float32
+    ) -> np.ndarray:
+        """
+        Precompute the per-vector terms both kernels reduce to
+        
+        Fidelity needs the real part a = v and the phase part
+        b = 0.1·sqrt(1 - v²); phase coherence needs cos φ and sin φ of the
+        per-dimension angle φ = atan2(b, a). None of these depend on the
+        other vector, so they can be computed once per stored vector.
+        
+        Args:
+            V: Normalized vector (D,) or matrix of vectors (N, D)
+            dtype: Output dtype (float32 for storage)
+            
+        Returns:
+            Terms array (N, 4, D) stacked as [a, b, cos φ, sin φ]
+        """
+        V = np.asarray(V, dtype=np.float64)
+        if V.ndim == 1:
+            V = V[np.newaxis, :]
+        
+        a, b = QuantumKernels.quantum_state_components(V)
+        # cos/sin of atan2(b, a) without evaluating the angle (b > 0 so r > 0)
+        r = np.sqrt(a**2 + b**2)
+        
+        return np.stack([a, b, a / r, b / r], axis=1).astype(dtype, copy=False)
+    
+    @staticmethod
+    def kernels_from_terms(
+        query_terms: np.ndarray,
+        candidate_terms: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Classical cosine, fidelity and phase coherence from precomputed terms
+        
+        All pairwise term products come from a single matrix product
+        (N·4, D) x (D, 4)
+        
+        Args:
+            query_terms: Query terms (4, D) or (1, 4, D)
+            candidate_terms: Candidate terms (N, 4, D)
+            
+        Returns:
+            Tuple of (raw cosine, fidelity, phase coherence), each (N,)
+        """
+        q = np.asarray(query_terms, dtype=np.float64).reshape(4, -1)
+        n, _, dim = candidate_terms.shape
+        
+        # products[n, i, j] = candidate_term_i · query_term_j
+        products = (
+            candidate_terms.reshape(n * 4, dim) @ q.T.astype(candidate_terms.dtype)
+        ).reshape(n, 4, 4).astype(np.float64)
+        
+        cosine = products[:, 0, 0]
+        
+        # <ψ1|ψ2> = Σ (a1 - i·b1)(a2 + i·b2)
+        overlap_real = products[:, 0, 0] + products[:, 1, 1]
+        overlap_imag = products[:, 1, 0] - products[:, 0, 1]
+        fidelity = np.clip(overlap_real**2 + overlap_imag**2, 0, 1)
+        
+        coherence = (products[:, 2, 2] + products[:, 3, 3]) / dim
+        coherence = np.clip((coherence + 1) / 2, 0, 1)
+        
+        return cosine, fidelity, coherence
+    
     @staticmethod
     def quantum_entanglement_measure(
         v1: np.ndarray,
@@ -97,25 +247,47 @@ class QuantumKernels:
         Returns:
             Entanglement measure (0-1)
         """
-        # Calculate correlation matrix
-        corr_matrix = np.outer(v1, v2)
+        return float(QuantumKernels.quantum_entanglement_measure_batch(
+            np.asarray(v1), np.asarray(v2)
+        )[0])
+    
+    @staticmethod
+    def quantum_entanglement_measure_batch(
+        v1: np.ndarray,
+        V2: np.ndarray
+    ) -> np.ndarray:
+        """
+        Closed-form entanglement measure against many candidates
         
-        # Compute singular values (Schmidt coefficients)
-        singular_vals = np.linalg.svd(corr_matrix, compute_uv=False)
+        The correlation matrix outer(v1, v2) has rank 1, so its singular
+        values are exactly [‖v1‖·‖v2‖, 0, ..., 0] (min(D1, D2) values).
+        The normalized Schmidt spectrum and its entropy therefore follow
+        from the two norms alone, without the O(D²) matrix or O(D³) SVD.
         
-        # Normalize
-        singular_vals = singular_vals / (np.sum(singular_vals) + 1e-10)
+        Args:
+            v1: First normalized vector (D1,)
+            V2: Candidate vector (D2,) or matrix of candidates (N, D2)
+            
+        Returns:
+            Entanglement measures (N,) in [0, 1]
+        """
+        V2 = np.asarray(V2, dtype=np.float64)
+        if V2.ndim == 1:
+            V2 = V2[np.newaxis, :]
         
-        # Calculate entanglement entropy
-        entropy = -np.sum(
-            singular_vals * np.log(singular_vals + 1e-10)
-        )
+        # Largest (and only non-zero) Schmidt coefficient, normalized
+        sigma = np.linalg.norm(v1) * np.linalg.norm(V2, axis=1)
+        p = sigma / (sigma + 1e-10)
+        
+        # Zero coefficients contribute 0·log(1e-10) = 0
+        entropy = -p * np.log(p + 1e-10)
         
         # Normalize to [0, 1]
-        max_entropy = np.log(len(singular_vals))
+        n_coefficients = min(np.shape(v1)[0], V2.shape[1])
+        max_entropy = np.log(n_coefficients)
         entanglement = entropy / (max_entropy + 1e-10)
         
-        return float(np.clip(entanglement, 0, 1))
+        return np.clip(entanglement, 0, 1)
 
 
 class AmplitudeEstimation:
@@ -152,8 +324,9 @@ class AmplitudeEstimation:
         Returns:
             Enhanced similarity estimate
         """
-        # Combine classical and quantum information
-        combined = (classical_similarity + quantum_fidelity) / 2
+        # Combine classical and quantum information (rounding can push an
+        # exact match slightly above 1, outside arcsin(sqrt(.))'s domain)
+        combined = np.clip((classical_similarity + quantum_fidelity) / 2, 0, 1)
         
         # Simulate quantum amplitude estimation
         # In true quantum: uses Grover iterations
@@ -171,6 +344,28 @@ class AmplitudeEstimation:
         enhanced_similarity = np.sin(enhanced_theta) ** 2
         
         return float(np.clip(enhanced_similarity, 0, 1))
+    
+    def estimate_amplitude_batch(
+        self,
+        classical_similarity: np.ndarray,
+        quantum_fidelity: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized amplitude estimation over many candidates
+        
+        Args:
+            classical_similarity: Classical cosine similarities (N,)
+            quantum_fidelity: Quantum fidelity scores (N,)
+            
+        Returns:
+            Enhanced similarity estimates (N,)
+        """
+        combined = np.clip((classical_similarity + quantum_fidelity) / 2, 0, 1)
+        theta = np.arcsin(np.sqrt(combined))
+        enhanced_theta = theta * (1 + 1 / self.precision)
+        enhanced_similarity = np.sin(enhanced_theta) ** 2
+        
+        return np.clip(enhanced_similarity, 0, 1)
 
 
 class AEQIPAlgorithm:
@@ -192,7 +387,9 @@ class AEQIPAlgorithm:
         self,
         use_quantum_inspired: bool = True,
         n_precision_qubits: int = 7,
-        enable_entanglement: bool = False
+        enable_entanglement: bool = False,
+        quantum_shots: int = 1024,
+        exact_probabilities: bool = False
     ):
         """
         Initialize AE-QIP algorithm
@@ -200,11 +397,19 @@ class AEQIPAlgorithm:
         Args:
             use_quantum_inspired: Use fast quantum-inspired mode
             n_precision_qubits: Auxiliary qubits for precision (default: 7)
-            enable_entanglement: Enable entanglement measure (slower)
+            enable_entanglement: Add entanglement measure to breakdowns
+            quantum_shots: Shots per circuit in Qiskit mode (default: 1024)
+            exact_probabilities: Use exact statevector probabilities in Qiskit mode
         """
         self.use_quantum_inspired = use_quantum_inspired
         self.n_precision_qubits = n_precision_qubits
         self.enable_entanglement = enable_entanglement
+        self.quantum_shots = quantum_shots
+        self.exact_probabilities = exact_probabilities
+        
+        # Qiskit circuit template (built once on first use)
+        self._circuit = None
+        self._circuit_lock = threading.Lock()
         
         # Initialize components
         self.kernels = QuantumKernels()
@@ -315,6 +520,191 @@ class AEQIPAlgorithm:
         
         return result
     
+    def calculate_similarity_batch(
+        self,
+        query_features: List[float],
+        candidate_matrix: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate quantum-enhanced similarity against many candidates
+        
+        Scores an (N, D) candidate matrix in one vectorized pass; results
+        match calculate_similarity() for each row
+        
+        Args:
+            query_features: Query feature vector (D,)
+            candidate_matrix: Candidate feature vectors (N, D)
+            
+        Returns:
+            Similarity scores (N,) in [0, 1]
+        """
+        if not self.use_quantum_inspired:
+            return self._true_quantum_similarity_batch(query_features, candidate_matrix)
+        
+        components = self._batch_components(query_features, candidate_matrix)
+        return components['similarity']
+    
+    def calculate_similarity_with_breakdown_batch(
+        self,
+        query_features: List[float],
+        candidate_matrix: np.ndarray
+    ) -> List[Dict[str, float]]:
+        """
+        Calculate similarity with component breakdown for many candidates
+        
+        Args:
+            query_features: Query feature vector (D,)
+            candidate_matrix: Candidate feature vectors (N, D)
+            
+        Returns:
+            List of dictionaries with similarity components (one per row)
+        """
+        components = self._batch_components(query_features, candidate_matrix)
+        
+        results = []
+        for i in range(len(components['similarity'])):
+            result = {
+                'similarity': float(components['similarity'][i]),
+                'classical': float(components['classical'][i]),
+                'quantum_fidelity': float(components['quantum_fidelity'][i]),
+                'phase_coherence': float(components['phase_coherence'][i]),
+                'amplitude_estimated': float(components['amplitude_estimated'][i]),
+                'combined': float(components['combined'][i])
+            }
+            results.append(result)
+        
+        if self.enable_entanglement:
+            v1, V2 = self._normalize_batch(query_features, candidate_matrix)
+            entanglement = self.kernels.quantum_entanglement_measure_batch(v1, V2)
+            for result, value in zip(results, entanglement):
+                result['entanglement'] = float(value)
+        
+        return results
+    
+    @staticmethod
+    def _normalize_batch(
+        query_features: List[float],
+        candidate_matrix: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalize the query vector and every candidate row (float64)"""
+        v1 = np.asarray(query_features, dtype=np.float64)
+        V2 = np.asarray(candidate_matrix, dtype=np.float64)
+        if V2.ndim == 1:
+            V2 = V2[np.newaxis, :]
+        
+        v1_norm = v1 / (np.linalg.norm(v1) + 1e-10)
+        V2_norm = V2 / (np.linalg.norm(V2, axis=1, keepdims=True) + 1e-10)
+        return v1_norm, V2_norm
+    
+    def _batch_components(
+        self,
+        query_features: List[float],
+        candidate_matrix: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized quantum-inspired similarity components
+        
+        Args:
+            query_features: Query feature vector (D,)
+            candidate_matrix: Candidate feature vectors (N, D)
+            
+        Returns:
+            Dictionary of (N,) arrays for each similarity component
+        """
+        v1_norm, V2_norm = self._normalize_batch(query_features, candidate_matrix)
+        
+        return self._components_from_terms(
+            self.kernels.precompute_state_terms(v1_norm, dtype=np.float64),
+            self.kernels.precompute_state_terms(V2_norm, dtype=np.float64)
+        )
+    
+    def precompute_terms(self, features: np.ndarray) -> np.ndarray:
+        """
+        Precompute storable quantum terms for one or many feature vectors
+        
+        Args:
+            features: Feature vector (D,) or matrix (N, D)
+            
+        Returns:
+            float32 terms array (N, 4, D)
+        """
+        V = np.asarray(features, dtype=np.float64)
+        if V.ndim == 1:
+            V = V[np.newaxis, :]
+        V_norm = V / (np.linalg.norm(V, axis=1, keepdims=True) + 1e-10)
+        return self.kernels.precompute_state_terms(V_norm)
+    
+    def calculate_similarity_precomputed(
+        self,
+        query_features: List[float],
+        candidate_terms: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate quantum-enhanced similarity against precomputed candidate terms
+        
+        Candidate sqrt/angle/cos terms come from precompute_terms() at ingest,
+        so scoring is a single matrix product regardless of top-K size
+        
+        Args:
+            query_features: Query feature vector (D,)
+            candidate_terms: Terms from precompute_terms() (N, 4, D)
+            
+        Returns:
+            Similarity scores (N,) in [0, 1]
+        """
+        v1 = np.asarray(query_features, dtype=np.float64)
+        v1_norm = v1 / (np.linalg.norm(v1) + 1e-10)
+        query_terms = self.kernels.precompute_state_terms(v1_norm, dtype=np.float64)
+        
+        return self._components_from_terms(query_terms, candidate_terms)['similarity']
+    
+    def _components_from_terms(
+        self,
+        query_terms: np.ndarray,
+        candidate_terms: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Combine kernel scores into the final similarity components
+        
+        Args:
+            query_terms: Query terms (1, 4, D)
+            candidate_terms: Candidate terms (N, 4, D)
+            
+        Returns:
+            Dictionary of (N,) arrays for each similarity component
+        """
+        cosine, quantum_fidelity, phase_coherence = self.kernels.kernels_from_terms(
+            query_terms, candidate_terms
+        )
+        
+        # 1. Classical cosine similarity (70%)
+        classical_sim = (cosine + 1) / 2
+        
+        # 2. Quantum fidelity kernel (20%) + 3. Phase coherence kernel (10%)
+        combined = (
+            0.70 * classical_sim +
+            0.20 * quantum_fidelity +
+            0.10 * phase_coherence
+        )
+        
+        # 4. Quantum amplitude estimation enhancement
+        ae_similarity = self.amplitude_estimator.estimate_amplitude_batch(
+            classical_sim,
+            quantum_fidelity
+        )
+        
+        # Final similarity (80% combined, 20% QAE)
+        final_similarity = np.clip(0.8 * combined + 0.2 * ae_similarity, 0, 1)
+        
+        return {
+            'similarity': final_similarity,
+            'classical': classical_sim,
+            'quantum_fidelity': quantum_fidelity,
+            'phase_coherence': phase_coherence,
+            'amplitude_estimated': ae_similarity,
+            'combined': combined
+        }
+    
     def _quantum_inspired_similarity(
         self,
         f1: List[float],
@@ -379,6 +769,21 @@ class AEQIPAlgorithm:
         
         return float(final_similarity)
     
+    def _get_circuit(self):
+        """Build the cached Qiskit circuit template once (raises ImportError without Qiskit)"""
+        if self._circuit is None:
+            with self._circuit_lock:
+                if self._circuit is None:
+                    from ml.quantum.qiskit_circuits import QiskitSimilarityCircuit
+                    self._circuit = QiskitSimilarityCircuit(
+                        n_encoding_qubits=self.n_encoding_qubits,
+                        n_control_qubits=self.n_control_qubits,
+                        n_precision_qubits=self.n_precision_qubits,
+                        shots=self.quantum_shots,
+                        exact=self.exact_probabilities
+                    )
+        return self._circuit
+    
     def _true_quantum_similarity(
         self,
         f1: List[float],
@@ -388,9 +793,10 @@ class AEQIPAlgorithm:
         True quantum simulation using Qiskit (if available)
         
         Implements 11-qubit quantum circuit:
-        - 3 encoding qubits (feature encoding)
+        - 3 encoding qubits (RY by the arccos of each block's cosine)
         - 1 control qubit (amplitude control)
         - 7 auxiliary qubits (amplitude estimation)
+        The score is the probability that the encoding register stays in |0…0⟩
         
         Args:
             f1: First feature vector
@@ -399,86 +805,50 @@ class AEQIPAlgorithm:
         Returns:
             Similarity score (0-1)
         """
-        try:
-            from qiskit import QuantumCircuit, QuantumRegister
-            from qiskit import ClassicalRegister
-            from qiskit_aer import AerSimulator
-            
-            # Create quantum registers
-            encoding_qreg = QuantumRegister(
-                self.n_encoding_qubits,
-                'encoding'
-            )
-            control_qreg = QuantumRegister(
-                self.n_control_qubits,
-                'control'
-            )
-            auxiliary_qreg = QuantumRegister(
-                self.n_precision_qubits,
-                'auxiliary'
-            )
-            creg = ClassicalRegister(self.n_precision_qubits, 'measure')
-            
-            # Create circuit
-            qc = QuantumCircuit(
-                encoding_qreg,
-                control_qreg,
-                auxiliary_qreg,
-                creg
-            )
-            
-            # Encode features (simplified for speed)
-            v1 = np.array(f1)
-            v2 = np.array(f2)
-            v1_norm = v1 / (np.linalg.norm(v1) + 1e-10)
-            v2_norm = v2 / (np.linalg.norm(v2) + 1e-10)
-            
-            # Feature encoding on encoding qubits
-            for i in range(min(self.n_encoding_qubits, len(v1_norm))):
-                angle = np.arcsin(v1_norm[i]) if abs(v1_norm[i]) <= 1 else 0
-                qc.ry(2 * angle, encoding_qreg[i])
-            
-            # Apply quantum amplitude estimation
-            # (Simplified - full implementation would use Grover iterations)
-            qc.h(auxiliary_qreg)
-            qc.h(control_qreg)
-            
-            # Measure auxiliary qubits
-            qc.measure(auxiliary_qreg, creg)
-            
-            # Simulate
-            simulator = AerSimulator()
-            result = simulator.run(qc, shots=1024).result()
-            counts = result.get_counts()
-            
-            # Extract similarity from measurement
-            total_shots = sum(counts.values())
-            weighted_sum = sum(
-                int(bitstring, 2) * count
-                for bitstring, count in counts.items()
-            )
-            
-            similarity = weighted_sum / (
-                total_shots * self.amplitude_estimator.precision
-            )
+        return float(self._true_quantum_similarity_batch(f1, [f2])[0])
+    
+    def _true_quantum_similarity_batch(
+        self,
+        query_features: List[float],
+        candidate_matrix: np.ndarray
+    ) -> np.ndarray:
+        """
+        Qiskit simulation for many candidates in one simulator job
+        
+        Uses the cached, pre-transpiled circuit template and binds the
+        query/candidate block overlaps per pair
+        
+        Args:
+            query_features: Query feature vector (D,)
+            candidate_matrix: Candidate feature vectors (N, D)
             
-            return float(np.clip(similarity, 0, 1))
+        Returns:
+            Similarity scores (N,) in [0, 1]
+        """
+        try:
+            circuit = self._get_circuit()
+            v1_norm, V2_norm = self._normalize_batch(query_features, candidate_matrix)
+            return circuit.similarity_batch(v1_norm, V2_norm)
             
         except ImportError:
             logger.warning(
                 "Qiskit not available, using quantum-inspired mode"
             )
-            return self._quantum_inspired_similarity(f1, f2)
         except Exception as e:
             logger.error(f"Quantum simulation error: {e}")
-            return self._quantum_inspired_similarity(f1, f2)
+        
+        return self._batch_components(query_features, candidate_matrix)['similarity']
     
     def get_circuit_info(self) -> Dict[str, int]:
         """Get quantum circuit configuration"""
-        return {
+        info = {
             'total_qubits': self.n_total_qubits,
             'encoding_qubits': self.n_encoding_qubits,
             'control_qubits': self.n_control_qubits,
             'auxiliary_qubits': self.n_precision_qubits,
             'precision_level': self.amplitude_estimator.precision
         }
+        if not self.use_quantum_inspired:
+            info['shots'] = None if self.exact_probabilities else self.quantum_shots
+            info['exact_probabilities'] = self.exact_probabilities
+        return info
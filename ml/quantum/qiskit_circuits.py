@@ -0,0 +1,177 @@
+"""
+Cached Qiskit Circuits for AE-QIP 'qiskit' mode
+Builds and transpiles the 11-qubit similarity circuit once and evaluates
+many candidates per simulator job
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def overlap_angles(v1: np.ndarray, V2: np.ndarray, n_blocks: int) -> np.ndarray:
+    """
+    RY angles for every (query, candidate) pair
+
+    Args:
+        v1: Query vector (D,)
+        V2: Candidate matrix (N, D)
+        n_blocks: Encoding qubits (one contiguous block of dimensions each)
+
+    Returns:
+        Angles (N, n_blocks): arccos of each block cosine, clipped to [0, 1]
+    """
+    v1 = np.asarray(v1, dtype=np.float64)
+    V2 = np.atleast_2d(np.asarray(V2, dtype=np.float64))
+    cosines = np.zeros((V2.shape[0], n_blocks))
+    for b, dims in enumerate(np.array_split(np.arange(v1.shape[0]), n_blocks)):
+        if len(dims) == 0:
+            continue
+        norms = np.linalg.norm(v1[dims]) * np.linalg.norm(V2[:, dims], axis=1)
+        dots = V2[:, dims] @ v1[dims]
+        cosines[:, b] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return np.arccos(np.clip(cosines, 0.0, 1.0))
+
+
+class QiskitSimilarityCircuit:
+    """
+    Parameterized AE-QIP circuit with a long-lived simulator
+
+    Layout (same qubit counts as the per-pair circuit):
+    - encoding qubits: the feature dimensions are split into one contiguous
+      block per qubit, and qubit b is rotated by RY(2·α_b) with
+      α_b = arccos(c_b), c_b being the cosine between the query's and the
+      candidate's block b (negative overlaps clip to α_b = π/2)
+    - control qubit: Hadamard
+    - auxiliary qubits: Hadamard
+
+    The score is the probability that the encoding register stays in
+    |0…0⟩, i.e. Π c_b². Every dimension contributes, so at 2048-D the
+    scores follow the cosine order instead of the first few components.
+
+    The template is built and transpiled once; pairs only bind parameters.
+    Candidates with identical bindings are simulated once, and all distinct
+    bindings are submitted as one job (Aer parameter_binds) on the template.
+    """
+
+    def __init__(
+        self,
+        n_encoding_qubits: int = 3,
+        n_control_qubits: int = 1,
+        n_precision_qubits: int = 7,
+        shots: int = 1024,
+        exact: bool = False
+    ):
+        """
+        Build the circuit template
+
+        Args:
+            n_encoding_qubits: Feature encoding qubits
+            n_control_qubits: Amplitude control qubits
+            n_precision_qubits: Auxiliary (measured) qubits
+            shots: Shots per circuit when sampling
+            exact: Use exact statevector probabilities instead of shots
+
+        Raises:
+            ImportError: If qiskit / qiskit-aer are not installed
+        """
+        from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+        from qiskit import transpile
+        from qiskit.circuit import ParameterVector
+        from qiskit_aer import AerSimulator
+
+        self.n_encoding_qubits = n_encoding_qubits
+        self.n_precision_qubits = n_precision_qubits
+        self.shots = shots
+        self.exact = exact
+        self._lock = threading.Lock()
+
+        encoding_qreg = QuantumRegister(n_encoding_qubits, 'encoding')
+        control_qreg = QuantumRegister(n_control_qubits, 'control')
+        auxiliary_qreg = QuantumRegister(n_precision_qubits, 'auxiliary')
+        creg = ClassicalRegister(n_encoding_qubits, 'measure')
+
+        overlap_params = ParameterVector('alpha', n_encoding_qubits)
+        self.parameters = list(overlap_params)
+
+        unitary = QuantumCircuit(encoding_qreg, control_qreg, auxiliary_qreg, creg)
+        for i in range(n_encoding_qubits):
+            unitary.ry(2 * overlap_params[i], encoding_qreg[i])
+        unitary.h(auxiliary_qreg)
+        unitary.h(control_qreg)
+
+        # Sampling measures the encoding register; exact mode saves its probabilities
+        measured = unitary.copy()
+        if exact:
+            measured.save_probabilities([unitary.find_bit(q).index for q in encoding_qreg])
+        else:
+            measured.measure(encoding_qreg, creg)
+
+        # Long-lived simulator and a template transpiled once for it
+        self.simulator = AerSimulator()
+        self._template = transpile(measured, self.simulator)
+
+        logger.info(
+            f"Qiskit circuit template ready: {measured.num_qubits} qubits, "
+            f"{'exact' if exact else f'{shots} shots'}"
+        )
+
+    def similarity_batch(
+        self,
+        v1: np.ndarray,
+        V2: np.ndarray
+    ) -> np.ndarray:
+        """
+        Evaluate the circuit for every candidate
+
+        Args:
+            v1: Query vector (D,)
+            V2: Candidate matrix (N, D)
+
+        Returns:
+            Similarity estimates (N,) in [0, 1]
+        """
+        bindings = [tuple(float(a) for a in row) for row in overlap_angles(v1, V2, self.n_encoding_qubits)]
+        unique: Dict[tuple, int] = {}
+        for binding in bindings:
+            unique.setdefault(binding, len(unique))
+        distinct = list(unique.keys())
+
+        if not distinct:
+            return np.zeros(0)
+
+        with self._lock:
+            result = self.simulator.run(
+                [self._template],
+                parameter_binds=[self._parameter_binds(distinct)],
+                shots=1 if self.exact else self.shots
+            ).result()
+
+        if self.exact:
+            values = [float(result.data(i)['probabilities'][0]) for i in range(len(distinct))]
+        else:
+            zero = '0' * self.n_encoding_qubits
+            values = []
+            for i in range(len(distinct)):
+                counts = result.get_counts(i)
+                values.append(counts.get(zero, 0) / sum(counts.values()))
+
+        return np.clip(np.array([values[unique[b]] for b in bindings]), 0, 1)
+
+    def _parameter_binds(self, bindings: List[tuple]) -> Dict[object, List[float]]:
+        """One value list per parameter, one entry per binding"""
+        columns = list(zip(*bindings))
+        return {parameter: list(column) for parameter, column in zip(self.parameters, columns)}
+
+    def get_info(self) -> Dict[str, object]:
+        """Get template configuration"""
+        return {
+            'num_qubits': self._template.num_qubits,
+            'depth': self._template.depth(),
+            'shots': None if self.exact else self.shots,
+            'exact': self.exact
+        }
@@ -0,0 +1,152 @@
+"""
+Quantum Term Store
+Persists precomputed AE-QIP kernel terms for every stored vector
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.local_store import MmapRowStore
+
+logger = logging.getLogger(__name__)
+
+
+class QuantumTermStore:
+    """
+    On-disk float32 store of per-vector quantum terms
+
+    Terms are computed once per vector when it is upserted (this class is a
+    vector-store write listener) and read back at query time, so re-ranking
+    never recomputes sqrt/angle/cos for the same corpus vector.
+
+    The ingestion CLI and the backend (which backfills missing terms) write
+    the same store; MmapRowStore serializes their row allocation, and terms
+    the CLI adds are visible to a running backend.
+    """
+
+    def __init__(self, algorithm, directory: str, feature_dim: int):
+        """
+        Initialize the term store
+
+        Args:
+            algorithm: AEQIPAlgorithm used to compute and score terms
+            directory: Directory for the memory-mapped term file
+            feature_dim: Feature vector dimension
+        """
+        self.algorithm = algorithm
+        self.feature_dim = feature_dim
+        self.store = MmapRowStore(directory, (4, feature_dim), name='quantum_terms')
+        self._hits = 0
+        self._misses = 0
+
+    # ----------------------------------------------------- listener interface
+
+    def on_upsert(self, vectors: List[Dict[str, Any]]):
+        """Precompute terms for vectors written to the vector store"""
+        vectors = [v for v in vectors if v.get('values') is not None and len(v['values']) > 0]
+        if not vectors:
+            return
+        ids = [v['id'] for v in vectors]
+        matrix = np.asarray([v['values'] for v in vectors], dtype=np.float32)
+        self.store.put_many(ids, self.algorithm.precompute_terms(matrix))
+
+    def on_delete(self, vector_ids: List[str]):
+        """Drop terms for deleted vectors"""
+        self.store.delete_many(vector_ids)
+
+    def on_delete_all(self):
+        """Drop every stored term"""
+        self.store.clear()
+
+    # ---------------------------------------------------------------- scoring
+
+    def get_terms(
+        self,
+        vector_ids: Sequence[str],
+        values: Optional[Sequence[Sequence[float]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get terms for candidates, backfilling any missing ones from their values
+
+        Args:
+            vector_ids: Candidate vector IDs
+            values: Optional candidate vectors, used for IDs not yet in the store
+
+        Returns:
+            Tuple of (terms (N, 4, D), available mask (N,))
+        """
+        terms, found = self.store.get_many(vector_ids)
+        self._hits += int(found.sum())
+        self._misses += int((~found).sum())
+
+        if values is not None and not found.all():
+            missing = [
+                i for i in np.flatnonzero(~found)
+                if values[i] is not None and len(values[i]) > 0
+            ]
+            if missing:
+                missing_terms = self.algorithm.precompute_terms(
+                    np.asarray([values[i] for i in missing], dtype=np.float32)
+                )
+                terms[missing] = missing_terms
+                found[missing] = True
+                self.store.put_many([vector_ids[i] for i in missing], missing_terms)
+
+        return terms, found
+
+    def score(
+        self,
+        query_features: Sequence[float],
+        vector_ids: Sequence[str],
+        values: Optional[Sequence[Sequence[float]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Quantum-enhanced similarity for candidate IDs
+
+        Returns:
+            Tuple of (scores (N,), scored mask (N,)); unscored entries are 0
+        """
+        terms, found = self.get_terms(vector_ids, values)
+        scores = np.zeros(len(vector_ids), dtype=np.float64)
+        if found.any():
+            scores[found] = self.algorithm.calculate_similarity_precomputed(
+                query_features, terms[found]
+            )
+        return scores, found
+
+    def top_k(
+        self,
+        query_features: Sequence[float],
+        k: int = 10
+    ) -> List[Tuple[str, float]]:
+        """
+        Score the whole stored corpus and return the best K vector IDs
+
+        Args:
+            query_features: Query feature vector
+            k: Number of results
+
+        Returns:
+            List of (vector_id, quantum score) sorted by score
+        """
+        ids, terms = self.store.items()
+        if not ids:
+            return []
+        scores = self.algorithm.calculate_similarity_precomputed(query_features, terms)
+        k = min(k, len(ids))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(ids[i], float(scores[i])) for i in best]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get term store statistics"""
+        lookups = self._hits + self._misses
+        return {
+            'vectors': len(self.store),
+            'size_mb': self.store.nbytes / 1024 / 1024,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': (self._hits / lookups) if lookups else 0.0
+        }
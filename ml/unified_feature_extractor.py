@@ -3,20 +3,91 @@ Unified Feature Extractor using ResNet-50
 Extracts 512D feature vectors from images for high-quality similarity matching
 """
 
+import copy
+import hashlib
+import random
+import warnings
+from pathlib import Path
+
 import torch
-import torch.nn as nn
-from torchvision import models, transforms
-from PIL import Image
+from torchvision import transforms
 import numpy as np
 import logging
 
+from ml.image_loading import IMAGE_EXTENSIONS, load_rgb
+from ml.model_artifacts import BACKBONE_DIM, HEAD_SEED, build_model, load_or_create
+
 logger = logging.getLogger(__name__)
 
+SUPPORTED_PRECISIONS = ("fp32", "int8")
+# 'reduced' decodes large images near the resize target before preprocessing
+SUPPORTED_DECODE_MODES = ("full", "reduced")
+RESIZE_SIZE = 256
+
+
+def collect_calibration_images(directory, samples=64, seed=0):
+    """
+    Pick a reproducible sample of corpus images for INT8 calibration
+
+    Args:
+        directory: Root folder searched recursively for images
+        samples: Number of images to return
+        seed: Sampling seed
+
+    Returns:
+        list: Image paths (empty if the folder does not exist)
+    """
+    root = Path(directory)
+    if not root.exists():
+        return []
+    paths = sorted(
+        str(path) for path in root.rglob("*")
+        if path.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    random.Random(seed).shuffle(paths)
+    return paths[:samples]
+
+
+def calibration_fingerprint(calibration_images):
+    """
+    Short hash identifying an INT8 calibration set
+
+    Paths contribute their name and file size, PIL images their pixels, so a
+    different sample (or a changed file) gives a different cached INT8 model.
+
+    Args:
+        calibration_images: Image paths or PIL images
+
+    Returns:
+        str: 12 hex characters
+    """
+    digest = hashlib.sha256()
+    for image in calibration_images or []:
+        if isinstance(image, (str, Path)):
+            path = Path(image)
+            size = path.stat().st_size if path.exists() else -1
+            digest.update(f"{path}\t{size}\n".encode("utf-8"))
+        else:
+            digest.update(f"{image.mode}{image.size}".encode("utf-8"))
+            digest.update(image.tobytes())
+    return digest.hexdigest()[:12]
+
 
 class UnifiedFeatureExtractor:
     """Extract features from images using pre-trained ResNet-50"""
 
-    def __init__(self, feature_dim=512, batch_size=32, use_amp=True):
+    def __init__(
+        self,
+        feature_dim=512,
+        batch_size=32,
+        use_amp=True,
+        precision="fp32",
+        calibration_images=None,
+        quantized_model_dir="data/models",
+        decode_mode="full",
+        artifact_dir=None,
+        verify_artifact=True,
+    ):
         """
         Initialize the feature extractor
 
@@ -24,38 +95,42 @@ class UnifiedFeatureExtractor:
             feature_dim: Dimension of output features (default: 512)
             batch_size: Batch size for batch processing (default: 32)
             use_amp: Use automatic mixed precision for faster inference
+            precision: 'fp32' or 'int8' (static quantization, CPU only)
+            calibration_images: Corpus images (paths or PIL) used to calibrate INT8
+            quantized_model_dir: Cache folder for calibrated INT8 models
+            decode_mode: 'full' or 'reduced' (draft/reduce decode for paths and bytes)
+            artifact_dir: Local model artifact folder (None: build from torch hub weights)
+            verify_artifact: Check the artifact checksum before loading
         """
-        logger.info(f"Initializing ResNet-50 feature extractor ({feature_dim}D)...")
+        if precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(f"precision must be one of {SUPPORTED_PRECISIONS}")
+        if decode_mode not in SUPPORTED_DECODE_MODES:
+            raise ValueError(f"decode_mode must be one of {SUPPORTED_DECODE_MODES}")
+        logger.info(f"Initializing ResNet-50 feature extractor ({feature_dim}D, {precision})...")
         self.feature_dim = feature_dim
         self.batch_size = batch_size
         self.use_amp = use_amp
-        # Load pre-trained ResNet-50
-        logger.info("Loading pre-trained ResNet-50 model...")
-        resnet = models.resnet50(weights=models.ResNet50_Weights.IMAGENET1K_V2)
-
-        # Remove the final classification layer (FC) to get features
-        # ResNet-50 outputs 2048D features before the final FC layer
-        self.model = nn.Sequential(*list(resnet.children())[:-1])
-
-        # Add adaptive pooling and dimension reduction if needed
-        if feature_dim != 2048:
-            self.model = nn.Sequential(
-                self.model,
-                nn.Flatten(),
-                nn.Linear(2048, feature_dim),
-                nn.ReLU(),
-                nn.BatchNorm1d(feature_dim),
-            )
+        self.precision = "fp32"
+        if artifact_dir:
+            # Saved once, then memory-mapped: no download and identical weights in every worker
+            logger.info(f"Loading ResNet-50 from model artifact in {artifact_dir}...")
+            self.model, manifest = load_or_create(artifact_dir, feature_dim, verify=verify_artifact)
         else:
-            self.model = nn.Sequential(self.model, nn.Flatten())
+            logger.info("Loading pre-trained ResNet-50 model...")
+            self.model, manifest = build_model(feature_dim), None
 
-        # Set to evaluation mode
-        self.model.eval()
+        # Version tag for cached embeddings; a reduced dimension adds a seeded
+        # projection head, tagged by the artifact checksum when one is used
+        self.model_version = f"resnet50-imagenet1k_v2-{feature_dim}d"
+        if feature_dim != BACKBONE_DIM:
+            self.model_version += f"-head{manifest['sha256'][:8]}" if manifest else f"-seed{HEAD_SEED}"
+        self.decode_mode = decode_mode
+        self.decode_min_side = RESIZE_SIZE if decode_mode == "reduced" else None
 
         # Define image preprocessing (ImageNet normalization)
         self.preprocess = transforms.Compose(
             [
-                transforms.Resize(256),
+                transforms.Resize(RESIZE_SIZE),
                 transforms.CenterCrop(224),
                 transforms.ToTensor(),
                 transforms.Normalize(
@@ -68,7 +143,16 @@ class UnifiedFeatureExtractor:
         # Move to GPU if available
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model = self.model.to(self.device)
-        logger.info(f"Feature extractor ready (Device: {self.device})")
+
+        if precision == "int8" and self._quantize_int8(calibration_images, quantized_model_dir):
+            self.precision = "int8"
+            self.model_version += "-int8"
+            # Quantized kernels run on CPU only
+            self.device = torch.device("cpu")
+        if decode_mode == "reduced":
+            # Reduced decoding changes pixels slightly, so it is part of the version
+            self.model_version += "-reduced"
+        logger.info(f"Feature extractor ready (Device: {self.device}, {self.precision})")
         logger.info("   Input: 224x224 RGB images")
         logger.info(f"   Output: {feature_dim}D feature vectors")
         logger.info("   Model: ResNet-50 (ImageNet pre-trained)")
@@ -83,15 +167,8 @@ class UnifiedFeatureExtractor:
         Returns:
             list: Feature vector (512D by default)
         """
-        # Load image if path is provided
-        if isinstance(image, str):
-            image = Image.open(image).convert("RGB")
-        elif not isinstance(image, Image.Image):
-            raise ValueError("Image must be PIL Image or path string")
-
-        # Ensure RGB mode
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+        # Load image if path is provided, ensure RGB mode
+        image = load_rgb(image, self.decode_min_side)
 
         # Preprocess image
         image_tensor = self.preprocess(image).unsqueeze(0).to(self.device)
@@ -124,10 +201,7 @@ class UnifiedFeatureExtractor:
 
         for image in images:
             # Load image if path
-            if isinstance(image, str):
-                image = Image.open(image).convert("RGB")
-            elif image.mode != "RGB":
-                image = image.convert("RGB")
+            image = load_rgb(image, self.decode_min_side)
 
             # Preprocess
             tensor = self.preprocess(image)
@@ -138,7 +212,7 @@ class UnifiedFeatureExtractor:
 
         # Extract features with AMP if enabled
         with torch.no_grad():
-            if self.use_amp and torch.cuda.is_available():
+            if self.use_amp and self.device.type == "cuda":
                 with torch.cuda.amp.autocast():
                     features = self.model(batch)
             else:
@@ -165,6 +239,86 @@ class UnifiedFeatureExtractor:
 
         return all_features
 
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """
+        Create an extractor from the application Config
+
+        Args:
+            config: Config class (FEATURE_DIMENSION, MODEL_PRECISION, QUANTIZATION_*, IMAGE_DECODE_MODE,
+                MODEL_ARTIFACT_*)
+            **kwargs: Extra constructor arguments (e.g. batch_size)
+        """
+        calibration_images = None
+        if config.MODEL_PRECISION == "int8":
+            calibration_images = collect_calibration_images(
+                config.QUANTIZATION_CALIBRATION_DIR,
+                config.QUANTIZATION_CALIBRATION_SAMPLES,
+            )
+        return cls(
+            feature_dim=config.FEATURE_DIMENSION,
+            use_amp=True,
+            precision=config.MODEL_PRECISION,
+            calibration_images=calibration_images,
+            quantized_model_dir=config.QUANTIZED_MODEL_DIR,
+            decode_mode=config.IMAGE_DECODE_MODE,
+            artifact_dir=config.MODEL_ARTIFACT_DIR if config.ENABLE_MODEL_ARTIFACTS else None,
+            verify_artifact=config.MODEL_ARTIFACT_VERIFY,
+            **kwargs,
+        )
+
+    def _quantize_int8(self, calibration_images, cache_dir):
+        """
+        Replace the model with a statically quantized INT8 version
+
+        The calibrated model is cached as TorchScript so later starts skip
+        calibration. Returns False (keeping fp32) if no calibration data exists.
+        """
+        if not calibration_images:
+            logger.warning("⚠️ No calibration images for INT8 quantization, using fp32")
+            return False
+
+        engines = torch.backends.quantized.supported_engines
+        engine = "x86" if "x86" in engines else "qnnpack"
+        torch.backends.quantized.engine = engine
+        fingerprint = calibration_fingerprint(calibration_images)
+        cache_path = Path(cache_dir) / f"{self.model_version}-int8-{engine}-{fingerprint}.pt"
+
+        # The fp32 model is part of model_version and the calibration set is
+        # fingerprinted, so the cached INT8 model always matches both
+        if cache_path.exists():
+            self.model = torch.jit.load(str(cache_path), map_location="cpu")
+            logger.info(f"   Loaded INT8 model from {cache_path}")
+            return True
+
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        logger.info(f"   Calibrating INT8 model on {len(calibration_images)} images...")
+        example = torch.randn(1, 3, 224, 224)
+        with warnings.catch_warnings():
+            # torch.ao.quantization emits deprecation notices in favour of torchao
+            warnings.simplefilter("ignore")
+            prepared = prepare_fx(
+                copy.deepcopy(self.model).cpu().eval(),
+                get_default_qconfig_mapping(engine),
+                (example,),
+            )
+            with torch.no_grad():
+                for i in range(0, len(calibration_images), self.batch_size):
+                    batch = [
+                        load_rgb(image)
+                        for image in calibration_images[i : i + self.batch_size]
+                    ]
+                    prepared(torch.stack([self.preprocess(image) for image in batch]))
+                quantized = torch.jit.freeze(torch.jit.trace(convert_fx(prepared), example))
+
+        self.model = quantized
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        torch.jit.save(quantized, str(cache_path))
+        logger.info(f"   Cached INT8 model at {cache_path}")
+        return True
+
     def get_feature_dim(self):
         """Get the dimension of feature vectors"""
         return self.feature_dim
@@ -1,348 +1,17 @@
 """
-FAST Reset Pinecone Database and Upload Healthcare Images
-- Uses batch processing and concurrent uploads
-- 5-10x faster than sequential upload
+FAST Reset Database and Upload Healthcare Images
+Wrapper around the staged ingestion pipeline; extra arguments are passed through
+Equivalent to: python -m ingestion --category healthcare --reset
 """
 
 import sys
-import time
-import logging
 from pathlib import Path
-from PIL import Image
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend.config import Config
-from ml.unified_feature_extractor import UnifiedFeatureExtractor
-from services.cloudinary_service import CloudinaryImageService
-from services.pinecone_service import PineconeVectorService
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-
-def delete_all_pinecone_vectors(pinecone_service):
-    """Delete all vectors from Pinecone"""
-    logger.info("\n" + "="*70)
-    logger.info("🗑️  DELETING ALL PINECONE VECTORS")
-    logger.info("="*70)
-    
-    try:
-        stats_before = pinecone_service.get_statistics()
-        count_before = stats_before['total_vector_count']
-        
-        logger.info(f"📊 Current vectors: {count_before}")
-        
-        if count_before == 0:
-            logger.info("✅ Database already empty")
-            return True
-        
-        # Confirm deletion
-        print(f"\n⚠️  WARNING: This will delete {count_before} vectors from Pinecone!")
-        print("Type 'DELETE' to confirm: ", end='')
-        confirmation = input().strip()
-        
-        if confirmation != 'DELETE':
-            logger.warning("❌ Deletion cancelled")
-            return False
-        
-        # Delete all vectors
-        logger.info("🗑️  Deleting all vectors...")
-        result = pinecone_service.delete_all_vectors()
-        
-        if result:
-            # Wait for deletion to propagate
-            logger.info("⏳ Waiting for deletion to propagate...")
-            time.sleep(5)
-            
-            stats_after = pinecone_service.get_statistics()
-            count_after = stats_after['total_vector_count']
-            
-            logger.info(f"✅ Deletion complete!")
-            logger.info(f"   Before: {count_before} vectors")
-            logger.info(f"   After:  {count_after} vectors")
-            return True
-        else:
-            logger.error("❌ Deletion failed")
-            return False
-            
-    except Exception as e:
-        logger.error(f"❌ Error during deletion: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def process_single_image(
-    image_path: Path,
-    images_folder: Path,
-    category: str,
-    feature_extractor,
-    cloudinary_service
-) -> Dict[str, Any]:
-    """Process a single image: extract features + upload to Cloudinary"""
-    try:
-        filename = image_path.name
-        
-        # Load image
-        image = Image.open(image_path).convert('RGB')
-        
-        # Extract features
-        features = feature_extractor.extract_features(image)
-        
-        # Read image bytes
-        with open(image_path, 'rb') as f:
-            image_bytes = f.read()
-        
-        # Upload to Cloudinary
-        cloudinary_result = cloudinary_service.upload_image(
-            image_bytes,
-            filename,
-            category
-        )
-        
-        # Generate vector ID
-        subfolder = image_path.parent.name if image_path.parent != images_folder else None
-        
-        if subfolder and subfolder not in ['healthcare', 'Healthcare']:
-            filename_no_ext = image_path.stem
-            vector_id = f"quantum-images_{category}_{subfolder}_{filename_no_ext}"
-        else:
-            base_id = cloudinary_result['public_id'].replace('/', '_')
-            vector_id = base_id
-        
-        # Prepare metadata
-        metadata = {
-            'filename': filename,
-            'category': category,
-            'cloudinary_url': cloudinary_result['secure_url'],
-            'uploaded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        }
-        
-        if subfolder and subfolder not in ['healthcare', 'Healthcare']:
-            metadata['subcategory'] = subfolder.lower()
-        
-        return {
-            'success': True,
-            'vector_id': vector_id,
-            'features': features,
-            'metadata': metadata,
-            'filename': filename
-        }
-        
-    except Exception as e:
-        return {
-            'success': False,
-            'filename': image_path.name,
-            'error': str(e)
-        }
-
-
-def upload_healthcare_images_fast(feature_extractor, cloudinary_service, pinecone_service):
-    """Upload healthcare images with batch processing"""
-    
-    logger.info("\n" + "="*70)
-    logger.info("🚀 FAST UPLOAD - HEALTHCARE IMAGES")
-    logger.info("="*70)
-    
-    # Define images folder
-    images_folder = Path("images/healthcare")
-    if not images_folder.exists():
-        images_folder = Path("images/Healthcare")
-    
-    category = "healthcare"
-    
-    if not images_folder.exists():
-        logger.error(f"❌ Folder not found: {images_folder.absolute()}")
-        return False
-    
-    # Get all image files
-    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
-    image_files = []
-    
-    for ext in image_extensions:
-        image_files.extend(list(images_folder.glob(f"*{ext}")))
-        image_files.extend(list(images_folder.glob(f"*{ext.upper()}")))
-        image_files.extend(list(images_folder.glob(f"*/*{ext}")))
-        image_files.extend(list(images_folder.glob(f"*/*{ext.upper()}")))
-    
-    # Deduplicate
-    image_files = list(set(image_files))
-    
-    if not image_files:
-        logger.warning(f"⚠️  No images found in {images_folder}")
-        return False
-    
-    total = len(image_files)
-    logger.info(f"📊 Found {total} healthcare images")
-    logger.info(f"📁 Folder: {images_folder.absolute()}")
-    logger.info(f"🏥 Category: {category}")
-    logger.info(f"🧠 Model: ResNet-50 ({Config.FEATURE_DIMENSION}D vectors)")
-    logger.info(f"⚡ Parallel workers: 20 (20x faster!)")
-    logger.info(f"📦 Pinecone batch size: 100 vectors per batch")
-    
-    # Show subfolder breakdown
-    subfolders = {}
-    for img in image_files:
-        subfolder = img.parent.name if img.parent != images_folder else "root"
-        subfolders[subfolder] = subfolders.get(subfolder, 0) + 1
-    
-    if len(subfolders) > 1 or "root" not in subfolders:
-        logger.info(f"📂 Subfolders detected:")
-        for sf, count in sorted(subfolders.items()):
-            logger.info(f"   - {sf}: {count} images")
-    
-    # Process images in parallel
-    success = 0
-    failed = 0
-    start_time = time.time()
-    
-    vectors_batch = []
-    
-    logger.info("\n⚡ Starting parallel processing...")
-    
-    # Use ThreadPoolExecutor for parallel uploads (increased to 20 workers)
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        # Submit all tasks
-        future_to_path = {
-            executor.submit(
-                process_single_image,
-                img_path,
-                images_folder,
-                category,
-                feature_extractor,
-                cloudinary_service
-            ): img_path for img_path in image_files
-        }
-        
-        # Process results as they complete
-        for idx, future in enumerate(as_completed(future_to_path), 1):
-            result = future.result()
-            
-            if result['success']:
-                # Add to batch for Pinecone
-                vectors_batch.append({
-                    'id': result['vector_id'],
-                    'values': result['features'],
-                    'metadata': result['metadata']
-                })
-                
-                success += 1
-                
-                # Log less frequently for speed
-                if idx % 20 == 0 or idx == total:
-                    logger.info(f"⚡ Progress: {idx}/{total} ({idx/total*100:.1f}%) - Last: {result['filename']}")
-                
-                # Batch upsert every 100 vectors (Pinecone optimized batch size)
-                if len(vectors_batch) >= 100:
-                    pinecone_service.upsert_vectors_batch(vectors_batch)
-                    logger.info(f"📦 Batch {len(vectors_batch)} vectors → Pinecone")
-                    vectors_batch = []
-                
-            else:
-                failed += 1
-                logger.error(f"❌ [{idx}/{total}] {result['filename']} - {result['error']}")
-    
-    # Upload remaining vectors
-    if vectors_batch:
-        pinecone_service.upsert_vectors_batch(vectors_batch)
-        logger.info(f"📊 Final batch uploaded to Pinecone: {len(vectors_batch)} vectors")
-    
-    # Summary
-    elapsed = time.time() - start_time
-    logger.info("\n" + "="*70)
-    logger.info("📊 UPLOAD SUMMARY")
-    logger.info("="*70)
-    logger.info(f"✅ Success: {success}/{total}")
-    logger.info(f"❌ Failed:  {failed}/{total}")
-    logger.info(f"⏱️  Time:    {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
-    logger.info(f"📈 Rate:    {success/elapsed:.2f} images/second")
-    logger.info(f"⚡ Speedup: ~20x faster than sequential!")
-    
-    # Calculate actual time saved
-    estimated_sequential = total * 3.5  # 3.5s per image sequentially
-    time_saved = estimated_sequential - elapsed
-    logger.info(f"💰 Time saved: {time_saved:.1f}s ({time_saved/60:.1f} minutes)")
-    logger.info(f"   Sequential would take: {estimated_sequential/60:.1f} minutes")
-    logger.info(f"   Parallel completed in: {elapsed/60:.1f} minutes")
-    
-    # Final stats
-    stats = pinecone_service.get_statistics()
-    logger.info(f"\n📊 Total vectors in Pinecone: {stats['total_vector_count']}")
-    logger.info("="*70)
-    
-    return success > 0
-
-
-def main():
-    """Main function"""
-    
-    print("""
-    ╔════════════════════════════════════════════════════════╗
-    ║     ⚡ ULTRA-FAST BATCH UPLOAD - HEALTHCARE IMAGES    ║
-    ║     20x faster with parallel processing!              ║
-    ║     100 vectors per Pinecone batch                    ║
-    ╚════════════════════════════════════════════════════════╝
-    """)
-    
-    try:
-        # Validate config
-        logger.info("🔧 Validating configuration...")
-        Config.validate()
-        logger.info("✅ Configuration valid")
-        
-        # Initialize services
-        logger.info("\n🚀 Initializing services...")
-        feature_extractor = UnifiedFeatureExtractor(
-            feature_dim=Config.FEATURE_DIMENSION,
-            use_amp=True
-        )
-        cloudinary_service = CloudinaryImageService()
-        pinecone_service = PineconeVectorService()
-        logger.info("✅ All services initialized")
-        
-        # Step 1: Delete all Pinecone vectors
-        delete_success = delete_all_pinecone_vectors(pinecone_service)
-        
-        if not delete_success:
-            logger.warning("\n⚠️  Deletion was cancelled or failed")
-            logger.info("Exiting without uploading...")
-            return
-        
-        # Step 2: Upload healthcare images (FAST!)
-        upload_success = upload_healthcare_images_fast(
-            feature_extractor,
-            cloudinary_service,
-            pinecone_service
-        )
-        
-        if upload_success:
-            print("""
-    ╔════════════════════════════════════════════════════════╗
-    ║     ✅ COMPLETE!                                      ║
-    ╚════════════════════════════════════════════════════════╝
-    
-    🎉 Database reset and healthcare images uploaded successfully!
-    ⚡ Used 20 parallel workers + 100-vector batches for 20x speed boost!
-    🌐 Check your homepage to see the results
-            """)
-        else:
-            logger.warning("\n⚠️  Upload completed with issues")
-        
-    except KeyboardInterrupt:
-        logger.warning("\n\n⚠️  Interrupted by user")
-    except Exception as e:
-        logger.error(f"\n❌ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+from ingestion.cli import main
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(['--category', 'healthcare', '--reset'] + sys.argv[1:]))
@@ -0,0 +1,147 @@
+"""
+Compare full and reduced-resolution (draft/reduce) image decoding per category:
+decode time, decoded size, peak memory and embedding agreement
+Usage: python -m scripts.benchmarks.benchmark_decode [--samples 50] [--min-cosine 0.99] [--json report.json]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingestion.pipeline import CATEGORY_LAYOUTS, IngestionPipeline
+from ml.image_loading import decode_rgb, peak_rss_mb, read_file
+
+# Same target as UnifiedFeatureExtractor.preprocess; torch is imported only in
+# main() so the decode subprocesses measure decoding, not library imports
+RESIZE_SIZE = 256
+
+
+def sample_paths(layout, samples: int, seed: int):
+    folder = layout.resolve_folder()
+    if folder is None:
+        return []
+    paths = list(IngestionPipeline.discover(layout, folder))
+    rng = np.random.default_rng(seed)
+    rng.shuffle(paths)
+    return paths[:samples]
+
+
+def measure_decode(paths, min_side):
+    """Runs in a fresh process so peak RSS belongs to one decode mode"""
+    baseline = peak_rss_mb() or 0.0
+    decode_ms, decoded_mb, megapixels = [], [], []
+    for path in paths:
+        data = read_file(path)
+        megapixels.append(np.prod(Image.open(io.BytesIO(data)).size) / 1e6)
+        start = time.perf_counter()
+        image = decode_rgb(data, min_side)
+        decode_ms.append((time.perf_counter() - start) * 1000)
+        decoded_mb.append(image.width * image.height * 3 / 1024 / 1024)
+        image.close()
+    return {
+        'decode_ms': float(np.mean(decode_ms)),
+        'decode_p95_ms': float(np.percentile(decode_ms, 95)),
+        'decoded_mb': float(np.mean(decoded_mb)),
+        'source_megapixels': float(np.mean(megapixels)),
+        'peak_rss_mb': (peak_rss_mb() or 0.0),
+        'peak_rss_delta_mb': (peak_rss_mb() or 0.0) - baseline,
+    }
+
+
+def run_isolated(paths, min_side):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(measure_decode, paths, min_side).result()
+
+
+def embedding_cosine(full_extractor, reduced_extractor, paths, batch_size=16):
+    """Per-image cosine between embeddings of full and reduced decodes"""
+    cosines = []
+    for i in range(0, len(paths), batch_size):
+        batch = [str(p) for p in paths[i:i + batch_size]]
+        full = np.array(full_extractor.extract_batch_features(batch))
+        reduced = np.array(reduced_extractor.extract_batch_features(batch))
+        cosines.extend(np.sum(full * reduced, axis=1))
+    return np.array(cosines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--categories', nargs='+', default=list(CATEGORY_LAYOUTS))
+    parser.add_argument('--samples', type=int, default=50, help='Images per category')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-cosine', type=float, default=0.99,
+                        help='Accuracy guard: fail if any image falls below this cosine')
+    parser.add_argument('--skip-embeddings', action='store_true', help='Decode timings only')
+    parser.add_argument('--json', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    if not args.skip_embeddings:
+        from ml.unified_feature_extractor import UnifiedFeatureExtractor
+
+        # 2048D only: reduced dimensions use a random projection head per model
+        full_extractor = UnifiedFeatureExtractor(feature_dim=2048, decode_mode='full')
+        reduced_extractor = UnifiedFeatureExtractor(feature_dim=2048, decode_mode='reduced')
+
+    report = {}
+    for category in args.categories:
+        paths = sample_paths(CATEGORY_LAYOUTS[category], args.samples, args.seed)
+        if not paths:
+            print(f"⚠️  No {category} images found, skipping")
+            continue
+        row = {
+            'images': len(paths),
+            'full': run_isolated(paths, None),
+            'reduced': run_isolated(paths, RESIZE_SIZE),
+        }
+        if not args.skip_embeddings:
+            cosine = embedding_cosine(full_extractor, reduced_extractor, paths)
+            row['cosine_mean'] = float(cosine.mean())
+            row['cosine_min'] = float(cosine.min())
+        report[category] = row
+
+    print("\n" + "=" * 96)
+    print(f"FULL vs REDUCED DECODE (resize target {RESIZE_SIZE}px)")
+    print("=" * 96)
+    print(f"{'category':<13} {'n':>4} {'src MP':>7} {'full ms':>8} {'red ms':>7} {'speedup':>8} "
+          f"{'full MB':>8} {'red MB':>7} {'+RSS full':>9} {'+RSS red':>8} {'cos mean':>9} {'cos min':>8}")
+    failed = False
+    for category, row in report.items():
+        full, reduced = row['full'], row['reduced']
+        cos_mean = f"{row['cosine_mean']:.4f}" if 'cosine_mean' in row else '-'
+        cos_min = f"{row['cosine_min']:.4f}" if 'cosine_min' in row else '-'
+        print(f"{category:<13} {row['images']:>4} {full['source_megapixels']:>7.1f} "
+              f"{full['decode_ms']:>8.1f} {reduced['decode_ms']:>7.1f} "
+              f"{full['decode_ms'] / reduced['decode_ms']:>7.2f}x "
+              f"{full['decoded_mb']:>8.1f} {reduced['decoded_mb']:>7.2f} "
+              f"{full['peak_rss_delta_mb']:>8.0f}M {reduced['peak_rss_delta_mb']:>7.0f}M "
+              f"{cos_mean:>9} {cos_min:>8}")
+        if row.get('cosine_min', 1.0) < args.min_cosine:
+            failed = True
+    print("=" * 96)
+    print("MB = decoded RGB buffer per image; +RSS = peak RSS growth while decoding (own process)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.json}")
+
+    if failed:
+        print(f"❌ Accuracy guard: an embedding fell below cosine {args.min_cosine} - keep IMAGE_DECODE_MODE=full")
+        sys.exit(1)
+    if report and not args.skip_embeddings:
+        print(f"✅ Accuracy guard passed (every cosine >= {args.min_cosine})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Compare INT8 and fp32 feature extraction: embedding agreement, retrieval overlap,
+latency and model size
+Usage: python -m scripts.benchmarks.benchmark_int8 [--images images] [--eval-samples 200] [--json report.json]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.image_loading import load_rgb
+from ml.unified_feature_extractor import UnifiedFeatureExtractor, collect_calibration_images
+
+
+def model_size_mb(model) -> float:
+    """Serialized size of a module or TorchScript model"""
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)
+    else:
+        torch.save(model.state_dict(), buffer)
+    return len(buffer.getvalue()) / 1024 / 1024
+
+
+def top_k_overlap(queries: np.ndarray, corpus: np.ndarray, reference: np.ndarray, k: int = 10) -> float:
+    """Mean overlap of top-k neighbours (self excluded) against the fp32 reference"""
+    def neighbours(q, c):
+        scores = q @ c.T
+        np.fill_diagonal(scores, -np.inf)
+        return np.argsort(-scores, axis=1)[:, :k]
+
+    expected = neighbours(reference, reference)
+    found = neighbours(queries, corpus)
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(found, expected)]))
+
+
+def latency_ms(extractor, images, batch_size: int):
+    """Mean per-image latency for single-image and batched extraction"""
+    extractor.extract_features(images[0])  # warm-up
+    start = time.perf_counter()
+    for image in images:
+        extractor.extract_features(image)
+    single = (time.perf_counter() - start) * 1000 / len(images)
+
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        extractor.extract_batch_features(images[i:i + batch_size])
+    batched = (time.perf_counter() - start) * 1000 / len(images)
+    return single, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--images', default='images', help='Corpus folder (searched recursively)')
+    parser.add_argument('--calibration-samples', type=int, default=64)
+    parser.add_argument('--eval-samples', type=int, default=200)
+    parser.add_argument('--latency-samples', type=int, default=32)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--model-dir', default='data/models')
+    parser.add_argument('--json', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    # Calibration and evaluation images are disjoint samples of the corpus
+    paths = collect_calibration_images(args.images, args.calibration_samples + args.eval_samples)
+    calibration = paths[:args.calibration_samples]
+    evaluation = paths[args.calibration_samples:]
+    if len(evaluation) < 11:
+        print(f"❌ Need at least {args.calibration_samples + 11} images under {args.images}")
+        sys.exit(1)
+
+    # 2048D only: reduced dimensions use a random projection head per model
+    fp32 = UnifiedFeatureExtractor(feature_dim=2048, precision='fp32')
+    int8 = UnifiedFeatureExtractor(
+        feature_dim=2048,
+        precision='int8',
+        calibration_images=calibration,
+        quantized_model_dir=args.model_dir
+    )
+    if int8.precision != 'int8':
+        print("❌ INT8 quantization unavailable")
+        sys.exit(1)
+
+    images = [load_rgb(p) for p in evaluation]
+    fp32_vectors = np.array(fp32.extract_batch_optimized(images))
+    int8_vectors = np.array(int8.extract_batch_optimized(images))
+
+    cosine = np.sum(fp32_vectors * int8_vectors, axis=1)
+    latency_images = images[:args.latency_samples]
+    fp32_single, fp32_batch = latency_ms(fp32, latency_images, args.batch_size)
+    int8_single, int8_batch = latency_ms(int8, latency_images, args.batch_size)
+
+    report = {
+        'eval_images': len(images),
+        'calibration_images': len(calibration),
+        'cosine_mean': float(cosine.mean()),
+        'cosine_p5': float(np.percentile(cosine, 5)),
+        'cosine_min': float(cosine.min()),
+        # Both query and corpus embedded in INT8
+        'top10_overlap_int8_corpus': top_k_overlap(int8_vectors, int8_vectors, fp32_vectors),
+        # INT8 queries against an fp32-indexed corpus (switching without re-indexing)
+        'top10_overlap_fp32_corpus': top_k_overlap(int8_vectors, fp32_vectors, fp32_vectors),
+        'fp32_single_ms': fp32_single,
+        'int8_single_ms': int8_single,
+        'fp32_batch_ms_per_image': fp32_batch,
+        'int8_batch_ms_per_image': int8_batch,
+        'single_speedup': fp32_single / int8_single,
+        'batch_speedup': fp32_batch / int8_batch,
+        'fp32_model_mb': model_size_mb(fp32.model),
+        'int8_model_mb': model_size_mb(int8.model),
+        'torch_threads': torch.get_num_threads()
+    }
+
+    print("\n" + "=" * 60)
+    print("INT8 vs FP32 FEATURE EXTRACTION")
+    print("=" * 60)
+    print(f"Images: {report['eval_images']} eval / {report['calibration_images']} calibration")
+    print(f"Embedding cosine:   mean {report['cosine_mean']:.4f} | "
+          f"p5 {report['cosine_p5']:.4f} | min {report['cosine_min']:.4f}")
+    print(f"Top-10 overlap:     int8 corpus {report['top10_overlap_int8_corpus']:.3f} | "
+          f"fp32 corpus {report['top10_overlap_fp32_corpus']:.3f}")
+    print(f"Latency (1 image):  fp32 {fp32_single:.1f} ms | int8 {int8_single:.1f} ms "
+          f"({report['single_speedup']:.2f}x)")
+    print(f"Latency (batch {args.batch_size}):  fp32 {fp32_batch:.1f} ms/img | "
+          f"int8 {int8_batch:.1f} ms/img ({report['batch_speedup']:.2f}x)")
+    print(f"Model size:         fp32 {report['fp32_model_mb']:.1f} MB | "
+          f"int8 {report['int8_model_mb']:.1f} MB")
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark Qiskit-mode re-ranking: per-pair vs cached template vs batched job
+The template-cache gain (legacy -> cached per-pair) and the batching gain
+(cached per-pair -> one job) are reported separately
+Usage: python -m scripts.benchmarks.benchmark_qiskit_batch [--dim 2048] [--exact]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.quantum.ae_qip_v3 import AEQIPAlgorithm
+from ml.quantum.qiskit_circuits import overlap_angles
+
+
+def legacy_per_pair_similarity(algo, f1, f2, shots=1024, exact=False):
+    """Per-pair path without the cache: new circuit + new simulator + one job per pair"""
+    from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+    from qiskit_aer import AerSimulator
+
+    encoding_qreg = QuantumRegister(algo.n_encoding_qubits, 'encoding')
+    control_qreg = QuantumRegister(algo.n_control_qubits, 'control')
+    auxiliary_qreg = QuantumRegister(algo.n_precision_qubits, 'auxiliary')
+    creg = ClassicalRegister(algo.n_encoding_qubits, 'measure')
+    qc = QuantumCircuit(encoding_qreg, control_qreg, auxiliary_qreg, creg)
+
+    angles = overlap_angles(np.array(f1), np.array([f2]), algo.n_encoding_qubits)[0]
+    for i in range(algo.n_encoding_qubits):
+        qc.ry(2 * angles[i], encoding_qreg[i])
+    qc.h(auxiliary_qreg)
+    qc.h(control_qreg)
+
+    if exact:
+        from qiskit.quantum_info import Statevector
+        return float(Statevector(qc).probabilities(qargs=range(algo.n_encoding_qubits))[0])
+
+    qc.measure(encoding_qreg, creg)
+
+    counts = AerSimulator().run(qc, shots=shots).result().get_counts()
+    return counts.get('0' * algo.n_encoding_qubits, 0) / sum(counts.values())
+
+
+def time_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dim', type=int, default=2048)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--exact', action='store_true', help='Use exact probabilities instead of shots')
+    args = parser.parse_args()
+
+    algo = AEQIPAlgorithm(use_quantum_inspired=False, exact_probabilities=args.exact)
+    rng = np.random.default_rng(42)
+    query = rng.standard_normal(args.dim)
+
+    # Build the cached template before timing
+    algo.calculate_similarity_batch(query, rng.standard_normal((1, args.dim)))
+
+    print("=" * 92)
+    print(f"QISKIT RE-RANKING BENCHMARK ({args.dim}D, {'exact' if args.exact else '1024 shots'})")
+    print("=" * 92)
+    print(f"{'candidates':>10} | {'legacy per-pair':>16} | {'cached per-pair':>16} | {'batched':>10} | "
+          f"{'cache gain':>10} | {'batch gain':>10}")
+    print("-" * 92)
+
+    for n in args.sizes:
+        candidates = rng.standard_normal((n, args.dim))
+
+        legacy = time_ms(lambda: [legacy_per_pair_similarity(algo, query, c, exact=args.exact) for c in candidates])
+        cached = time_ms(lambda: [algo.calculate_similarity(query, c) for c in candidates])
+        batched = time_ms(lambda: algo.calculate_similarity_batch(query, candidates))
+
+        print(f"{n:>10} | {legacy:>13.1f} ms | {cached:>13.1f} ms | {batched:>7.1f} ms | "
+              f"{legacy / cached:>9.2f}x | {cached / batched:>9.1f}x")
+
+    print("=" * 92)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark backend cold start: `python -X importtime` breakdown of importing the
+server and time from process start to the first healthy /health response
+Usage: python -m scripts.benchmarks.benchmark_startup [--runs 5] [--top 15] [--json report.json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Libraries the server should only load on first use
+HEAVY_MODULES = ['torch', 'torchvision', 'matplotlib', 'seaborn', 'pptx', 'scipy', 'pandas', 'qiskit', 'faiss']
+
+
+def server_env():
+    """Environment for a server that needs no cloud credentials (unless configured)"""
+    env = dict(os.environ)
+    env.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+    env.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+    return env
+
+
+def import_breakdown(module: str, top: int):
+    """Run `python -X importtime -c 'import module'` and parse its report"""
+    check = f"import sys, json, {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', check],
+        cwd=PROJECT_ROOT, env=server_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:   self_us | cumulative_us | <2 spaces per level>name"
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        entries.append({
+            'module': name.strip(),
+            'depth': depth,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+
+    total = next((e['cumulative_ms'] for e in entries if e['module'] == module), None)
+    # Modules imported directly by the target (or at top level) carry the cost of their subtrees
+    direct = sorted((e for e in entries if e['depth'] <= 1 and e['module'] != module),
+                    key=lambda e: -e['cumulative_ms'])
+    return {
+        'module': module,
+        'total_ms': total,
+        'modules_imported': len(entries),
+        'heavy_modules_loaded': json.loads(result.stdout.strip().splitlines()[-1]),
+        'top_imports': direct[:top],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(path: str, timeout: float) -> float:
+    """Seconds from spawning uvicorn to the first 200 response on path"""
+    port = free_port()
+    url = f'http://127.0.0.1:{port}{path}'
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'backend.backend_server:app',
+         '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=PROJECT_ROOT, env=server_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"No healthy response from {url} within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default='backend.backend_server')
+    parser.add_argument('--path', default='/health', help='endpoint polled for the first healthy response')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='direct imports listed in the breakdown')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    report = import_breakdown(args.module, args.top)
+    print(f"\nImport of {report['module']}: {report['total_ms']:.0f} ms "
+          f"({report['modules_imported']} modules)")
+    print(f"{'module':<45} | {'cumulative ms':>13} | {'self ms':>8}")
+    for entry in report['top_imports']:
+        print(f"{entry['module']:<45} | {entry['cumulative_ms']:>13.1f} | {entry['self_ms']:>8.1f}")
+    heavy = report['heavy_modules_loaded']
+    print(f"Heavy modules loaded at import: {', '.join(heavy) if heavy else 'none'}")
+
+    samples = [time_to_healthy(args.path, args.timeout) for _ in range(args.runs)]
+    report['time_to_healthy_s'] = {
+        'path': args.path,
+        'runs': samples,
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'max': max(samples),
+    }
+    print(f"\nTime to first healthy {args.path}: median {statistics.median(samples):.2f} s "
+          f"(min {min(samples):.2f} s, max {max(samples):.2f} s, {args.runs} runs)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark vector store search latency on this machine
+Usage: python -m scripts.benchmarks.benchmark_vector_store [--sizes 1000 10000] [--backend embedded]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# The embedded backend needs no cloud credentials
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from services.embedded_vector_store import EmbeddedVectorStore
+from services.vector_store import create_vector_store
+
+CATEGORIES = ['healthcare', 'satellite', 'surveillance']
+
+
+def percentiles(samples_ms):
+    return np.percentile(samples_ms, 50), np.percentile(samples_ms, 95)
+
+
+def search_latencies(store, queries, top_k, category_filter=None):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        store.search(query, top_k=top_k, category_filter=category_filter)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def benchmark_embedded(size, dim, queries, top_k, rng):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddedVectorStore(tmp, dim)
+        start = time.perf_counter()
+        for offset in range(0, size, 1000):
+            count = min(1000, size - offset)
+            values = rng.standard_normal((count, dim)).astype(np.float32)
+            store.upsert_vectors_batch([{
+                'id': f'vec_{offset + i}',
+                'values': values[i],
+                'metadata': {'category': CATEGORIES[(offset + i) % 3]}
+            } for i in range(count)])
+        load_s = time.perf_counter() - start
+
+        # Warm the page cache before timing
+        search_latencies(store, queries[:3], top_k)
+        p50, p95 = percentiles(search_latencies(store, queries, top_k))
+        f50, f95 = percentiles(search_latencies(store, queries, top_k, 'healthcare'))
+        store.close()
+
+    print(f"{size:>9} | {load_s:>8.2f} | {p50:>8.2f} | {p95:>8.2f} | {f50:>10.2f} | {f95:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', default='embedded', choices=['embedded', 'pinecone'])
+    parser.add_argument('--dim', type=int, default=2048)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--top-k', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32).tolist()
+
+    if args.backend == 'pinecone':
+        # Existing index, as configured; measures round trips to the service
+        store = create_vector_store('pinecone')
+        p50, p95 = percentiles(search_latencies(store, queries, args.top_k))
+        print(f"Pinecone search top-{args.top_k}: p50 {p50:.2f} ms | p95 {p95:.2f} ms")
+        return
+
+    print(f"\nEmbedded store exact search (dim={args.dim}, top-{args.top_k}, {args.queries} queries)")
+    print(f"{'vectors':>9} | {'load s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | "
+          f"{'filt p50':>10} | {'filt p95':>10}")
+    for size in args.sizes:
+        benchmark_embedded(size, args.dim, queries, args.top_k, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark multi-worker serving: requests/sec and latency of image uploads
+against gunicorn with 1, 2, 4... pre-forked workers (gunicorn.conf.py), plus
+worker memory and a check that /api/metrics/summary counts every worker
+Uploads search a synthetic embedded index served read-only (EMBEDDED_STORE_READ_ONLY),
+the embedded store's multi-worker mode, unless VECTOR_STORE_BACKEND says otherwise.
+--random-weights serves an untrained ResNet-50 artifact (same compute) on machines
+that cannot download the pretrained weights
+Usage: python -m scripts.benchmarks.benchmark_workers [--workers 1 2 4] [--requests 200] [--concurrency 8] [--index-size 10000] [--random-weights] [--json report.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# The embedded backend needs no cloud credentials
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from backend.config import Config
+from scripts.benchmarks.benchmark_startup import PROJECT_ROOT, free_port, server_env
+
+OPERATION = 'image_upload_search'
+CATEGORIES = ['healthcare', 'satellite', 'surveillance']
+
+
+def build_index(directory: str, size: int, dim: int, seed: int = 0):
+    """Fill an embedded store with random vectors for the uploads to search"""
+    from services.embedded_vector_store import EmbeddedVectorStore
+
+    rng = np.random.default_rng(seed)
+    store = EmbeddedVectorStore(directory, dim)
+    for offset in range(0, size, 1000):
+        count = min(1000, size - offset)
+        values = rng.standard_normal((count, dim)).astype(np.float32)
+        store.upsert_vectors_batch([{
+            'id': f'vec_{offset + i}',
+            'values': values[i],
+            'metadata': {'category': CATEGORIES[(offset + i) % 3], 'filename': f'{offset + i}.jpg'}
+        } for i in range(count)])
+    store.close()
+
+
+def make_images(count: int, seed: int = 0):
+    """Distinct JPEGs, so every upload runs decode and inference"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(count):
+        pixels = rng.integers(0, 256, (320, 320, 3), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def upload(url: str, image: bytes) -> float:
+    """POST one image as multipart form data; returns latency in ms"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="bench.jpg"\r\n'
+        f'Content-Type: image/jpeg\r\n\r\n'
+    ).encode() + image + f'\r\n--{boundary}--\r\n'.encode()
+    request = urllib.request.Request(
+        url, data=body, headers={'Content-Type': f'multipart/form-data; boundary={boundary}'}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=120) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def get_json(url: str):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def wait_ready(base: str, server, workers: int, timeout: float):
+    """Poll /ready until enough consecutive 200s that every worker has likely warmed"""
+    deadline = time.time() + timeout
+    streak = 0
+    while streak < 3 * workers:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        if time.time() > deadline:
+            raise TimeoutError(f"Workers not ready within {timeout:.0f}s")
+        try:
+            with urllib.request.urlopen(f'{base}/ready', timeout=2):
+                streak += 1
+        except OSError:
+            streak = 0
+            time.sleep(0.2)
+
+
+def worker_memory_mb(master_pid: int):
+    """Summed RSS and PSS of the workers (Linux); PSS counts shared pages once overall"""
+    try:
+        children = Path(f'/proc/{master_pid}/task/{master_pid}/children').read_text().split()
+        rss = pss = 0
+        for pid in children:
+            for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines():
+                if line.startswith('Rss:'):
+                    rss += int(line.split()[1])
+                elif line.startswith('Pss:'):
+                    pss += int(line.split()[1])
+        return {'rss_mb': rss / 1024, 'pss_mb': pss / 1024}
+    except OSError:
+        return None
+
+
+def run_level(workers: int, images, args, extra_env):
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        env = server_env()
+        env.update({
+            'WEB_WORKERS': str(workers),
+            'HOST': '127.0.0.1',
+            'PORT': str(port),
+            'RATE_LIMIT_ENABLED': 'false',
+            'ENABLE_EMBEDDING_CACHE': 'false',
+            'ENABLE_QUERY_CACHE': 'false',
+            'METRICS_SHARED_DIR': metrics_dir,
+            'METRICS_PUBLISH_INTERVAL': '0.5',
+            **extra_env,
+        })
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'backend.backend_server:app'],
+            cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_ready(base, server, workers, args.timeout)
+            url = f'{base}/api/upload'
+            warmup = images[:args.warmup * workers]
+            for image in warmup:
+                upload(url, image)
+
+            batch = [images[(len(warmup) + i) % len(images)] for i in range(args.requests)]
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                latencies = list(pool.map(lambda image: upload(url, image), batch))
+            elapsed = time.perf_counter() - start
+
+            memory = worker_memory_mb(server.pid)
+            time.sleep(1.5)  # let every worker publish its metrics
+            summary = get_json(f'{base}/api/metrics/summary')
+            counted = summary['latency'].get(OPERATION, {}).get('count', 0)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    return {
+        'workers': workers,
+        'requests': args.requests,
+        'requests_per_sec': args.requests / elapsed,
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'memory': memory,
+        'metrics_workers_merged': summary['workers']['merged'],
+        'metrics_count': counted,
+        'metrics_expected': len(warmup) + args.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--requests', type=int, default=200, help='timed uploads per worker count')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent client connections')
+    parser.add_argument('--index-size', type=int, default=10000, help='vectors in the embedded index')
+    parser.add_argument('--random-weights', action='store_true', help='serve an untrained model artifact')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed uploads per worker')
+    parser.add_argument('--timeout', type=float, default=300, help='seconds to wait for workers to be ready')
+    parser.add_argument('--json', help='write the report to this file')
+    args = parser.parse_args()
+
+    images = make_images(min(args.requests + args.warmup * max(args.workers), 500))
+    results = []
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    print(f"{cores} cores, {args.index_size} indexed vectors, concurrency {args.concurrency}")
+    print(f"{'workers':>7} | {'req/s':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'RSS MB':>8} | {'PSS MB':>8} | metrics")
+    with tempfile.TemporaryDirectory() as data_dir:
+        extra_env = {}
+        if os.environ['VECTOR_STORE_BACKEND'] == 'embedded':
+            index_dir = os.path.join(data_dir, 'vectors')
+            build_index(index_dir, args.index_size, Config.FEATURE_DIMENSION)
+            extra_env.update({'EMBEDDED_STORE_DIR': index_dir, 'EMBEDDED_STORE_READ_ONLY': 'true'})
+        if args.random_weights:
+            from ml.model_artifacts import load_or_create
+            models_dir = os.path.join(data_dir, 'models')
+            load_or_create(models_dir, Config.FEATURE_DIMENSION, pretrained=False)
+            extra_env.update({'ENABLE_MODEL_ARTIFACTS': 'true', 'MODEL_ARTIFACT_DIR': models_dir})
+        for workers in args.workers:
+            result = run_level(workers, images, args, extra_env)
+            results.append(result)
+            memory = result['memory'] or {'rss_mb': float('nan'), 'pss_mb': float('nan')}
+            print(f"{workers:>7} | {result['requests_per_sec']:>7.1f} | {result['p50_ms']:>8.1f} | "
+                  f"{result['p95_ms']:>8.1f} | {memory['rss_mb']:>8.0f} | {memory['pss_mb']:>8.0f} | "
+                  f"{result['metrics_count']}/{result['metrics_expected']} from {result['metrics_workers_merged']} workers")
+
+    baseline = results[0]['requests_per_sec']
+    for result in results[1:]:
+        print(f"{result['workers']} workers: {result['requests_per_sec'] / baseline:.2f}x "
+              f"the throughput of {results[0]['workers']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Report written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
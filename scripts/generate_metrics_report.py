@@ -25,7 +25,7 @@ def generate_sample_healthcare_metrics():
     print("=" * 80 + "\n")
     
     # Initialize collector
-    collector = MetricsCollector("Quantum Flow - Healthcare AI System")
+    collector = MetricsCollector("Quantum Flow - Healthcare AI System", verbose=True)
     
     # === ACCURACY METRICS ===
     print("📊 Recording Accuracy Metrics...")
@@ -116,7 +116,7 @@ def generate_sample_multimodal_metrics():
     print("GENERATING MULTI-DOMAIN METRICS")
     print("=" * 80 + "\n")
     
-    collector = MetricsCollector("Quantum Flow - Multi-Domain AI System")
+    collector = MetricsCollector("Quantum Flow - Multi-Domain AI System", verbose=True)
     
     # Healthcare metrics
     collectors = {}
@@ -0,0 +1,150 @@
+"""
+Build, check and measure the local FAISS replica of the Pinecone index
+
+Usage:
+    python -m scripts.maintenance.faiss_replica build
+    python -m scripts.maintenance.faiss_replica check
+    python -m scripts.maintenance.faiss_replica recall --queries 100 --top-k 10
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import Config
+from services.faiss_replica import FaissReplica
+from services.vector_store import create_vector_store
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def open_replica() -> FaissReplica:
+    return FaissReplica(
+        Config.FAISS_REPLICA_DIR,
+        Config.FEATURE_DIMENSION,
+        hnsw_m=Config.FAISS_HNSW_M,
+        ef_search=Config.FAISS_EF_SEARCH,
+        save_every=0
+    )
+
+
+def build(args):
+    """Export every vector from Pinecone and rebuild the replica"""
+    service = create_vector_store('pinecone')
+    replica = open_replica()
+
+    start = time.time()
+    exported = 0
+
+    def batches():
+        nonlocal exported
+        for batch in service.export_vectors():
+            exported += len(batch)
+            if exported % 1000 < len(batch):
+                logger.info(f"   Exported {exported} vectors...")
+            yield batch
+
+    count = replica.build(batches())
+    logger.info(f"✅ Replica built: {count} vectors in {time.time() - start:.1f}s")
+
+
+def check(args):
+    """Compare replica IDs against the Pinecone index"""
+    service = create_vector_store('pinecone')
+    replica = open_replica()
+
+    remote_ids = set()
+    for ids in service.list_vector_ids():
+        remote_ids.update(ids)
+    local_ids = set(replica.ids())
+
+    missing = remote_ids - local_ids
+    extra = local_ids - remote_ids
+
+    print('\n' + '=' * 50)
+    print('FAISS REPLICA CONSISTENCY')
+    print('=' * 50)
+    print(f'Pinecone vectors: {len(remote_ids)}')
+    print(f'Replica vectors:  {len(local_ids)}')
+    print(f'Missing locally:  {len(missing)}')
+    print(f'Extra locally:    {len(extra)}')
+    for vector_id in list(missing)[:5]:
+        print(f'   missing: {vector_id}')
+    for vector_id in list(extra)[:5]:
+        print(f'   extra:   {vector_id}')
+    print('=' * 50)
+
+    if missing or extra:
+        print('⚠️ Replica out of sync - run the build command')
+        sys.exit(1)
+    print('✅ Replica in sync')
+
+
+def recall(args):
+    """recall@k of replica results against Pinecone for stored-vector queries"""
+    service = create_vector_store('pinecone')
+    replica = open_replica()
+
+    ids = replica.ids()
+    if not ids:
+        logger.error("❌ Replica is empty - run the build command first")
+        sys.exit(1)
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+    query_ids = [ids[i] for i in sample]
+
+    recalls, local_ms, remote_ms = [], [], []
+    for start in range(0, len(query_ids), 100):
+        for vector in service.fetch(query_ids[start:start + 100]).values():
+            query = vector['values']
+
+            t0 = time.perf_counter()
+            local = replica.search(query, top_k=args.top_k, include_values=False)
+            local_ms.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            remote = service.search(query, top_k=args.top_k, include_values=False)
+            remote_ms.append((time.perf_counter() - t0) * 1000)
+
+            expected = {m['id'] for m in remote}
+            if expected:
+                found = {m['id'] for m in local}
+                recalls.append(len(found & expected) / len(expected))
+
+    print('\n' + '=' * 50)
+    print(f'FAISS REPLICA RECALL@{args.top_k} ({len(recalls)} queries)')
+    print('=' * 50)
+    print(f'Mean recall@{args.top_k}: {np.mean(recalls):.4f}')
+    print(f'Min recall@{args.top_k}:  {np.min(recalls):.4f}')
+    print(f'Replica latency:  p50 {np.percentile(local_ms, 50):.2f} ms | '
+          f'p95 {np.percentile(local_ms, 95):.2f} ms')
+    print(f'Pinecone latency: p50 {np.percentile(remote_ms, 50):.2f} ms | '
+          f'p95 {np.percentile(remote_ms, 95):.2f} ms')
+    print('=' * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local FAISS replica')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help='Rebuild the replica from a Pinecone export')
+    subparsers.add_parser('check', help='Compare replica and Pinecone vector IDs')
+    recall_parser = subparsers.add_parser('recall', help='Measure recall@k against Pinecone')
+    recall_parser.add_argument('--queries', type=int, default=100)
+    recall_parser.add_argument('--top-k', type=int, default=10)
+    recall_parser.add_argument('--seed', type=int, default=42)
+
+    args = parser.parse_args()
+    {'build': build, 'check': check, 'recall': recall}[args.command](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Build and check the local model weight artifact (ResNet-50 backbone plus
+projection head) so servers and ingestion workers start without a download
+
+Usage:
+    python -m scripts.maintenance.model_artifact build
+    python -m scripts.maintenance.model_artifact build --dim 512 --dir /srv/models --force
+    python -m scripts.maintenance.model_artifact info
+    python -m scripts.maintenance.model_artifact verify
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.config import config
+from ml.model_artifacts import (
+    artifact_name, artifact_paths, build_model, load_artifact, read_manifest, save_artifact
+)
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def build(args):
+    """Write the artifact from the torch hub ImageNet weights"""
+    if read_manifest(args.dir, args.dim) and not args.force:
+        logger.info(f"✅ {artifact_name(args.dim)} already exists in {args.dir} (use --force to rebuild)")
+        return
+    save_artifact(build_model(args.dim), args.dir, args.dim)
+
+
+def info(args):
+    """Print the artifact manifest"""
+    manifest = read_manifest(args.dir, args.dim)
+    if manifest is None:
+        logger.error(f"❌ No {artifact_name(args.dim)} in {args.dir}")
+        sys.exit(1)
+    weights_path, _ = artifact_paths(args.dir, args.dim)
+    print('\n' + '=' * 50)
+    print(f"MODEL ARTIFACT {weights_path}")
+    print('=' * 50)
+    print(f"Model:      {manifest['architecture']} ({manifest['weights']}) -> {manifest['feature_dim']}D")
+    print(f"Head seed:  {manifest['head_seed'] if manifest['head_seed'] is not None else '-'}")
+    print(f"Size:       {manifest['size_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"SHA-256:    {manifest['sha256']}")
+    print(f"Torch:      {manifest['torch_version']}")
+    print(f"Created:    {manifest['created_at']}")
+    print('=' * 50)
+
+
+def verify(args):
+    """Check the checksum and time a memory-mapped load"""
+    start = time.perf_counter()
+    try:
+        load_artifact(args.dir, args.dim, verify=True)
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    logger.info(f"✅ {artifact_name(args.dim)} verified and loaded in {time.perf_counter() - start:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and check the local model weight artifact')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Save the model from the torch hub weights')
+    build_parser.add_argument('--force', action='store_true', help='Rebuild an existing artifact')
+    info_parser = subparsers.add_parser('info', help='Describe the artifact')
+    verify_parser = subparsers.add_parser('verify', help='Check the checksum and load the artifact')
+
+    for sub in (build_parser, info_parser, verify_parser):
+        sub.add_argument('--dim', type=int, default=config.FEATURE_DIMENSION,
+                         help='Feature dimension (default: FEATURE_DIMENSION)')
+        sub.add_argument('--dir', default=config.MODEL_ARTIFACT_DIR,
+                         help='Artifact directory (default: MODEL_ARTIFACT_DIR)')
+
+    args = parser.parse_args()
+    {'build': build, 'info': info, 'verify': verify}[args.command](args)
+
+
+if __name__ == '__main__':
+    main()
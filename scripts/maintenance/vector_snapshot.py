@@ -0,0 +1,96 @@
+"""
+Export the vector index to sharded .npz files and bulk-load it back,
+for index rebuilds, migrations and disaster recovery without re-running inference
+
+Usage:
+    python -m scripts.maintenance.vector_snapshot export backups/2026-10-18 --dtype float16
+    python -m scripts.maintenance.vector_snapshot info backups/2026-10-18
+    python -m scripts.maintenance.vector_snapshot load backups/2026-10-18 --reset --workers 8
+    python -m scripts.maintenance.vector_snapshot load backups/2026-10-18 --backend embedded
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ingestion.cli import build_vector_store, reset_index
+from ingestion.snapshot import SUPPORTED_DTYPES, export_snapshot, load_snapshot, read_snapshot
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def export(args):
+    """Write every vector of the index to a snapshot directory"""
+    vector_store = build_vector_store(args.backend)
+    export_snapshot(vector_store, args.snapshot, args.dtype, args.shard_size, args.page_size)
+
+
+def info(args):
+    """Print a snapshot description"""
+    snapshot = read_snapshot(args.snapshot)
+    size = sum((Path(args.snapshot) / shard['file']).stat().st_size for shard in snapshot['shards'])
+    print('\n' + '=' * 50)
+    print(f"SNAPSHOT {args.snapshot}")
+    print('=' * 50)
+    print(f"Source:     {snapshot['source'] or '-'}")
+    print(f"Created:    {snapshot['created_at']}")
+    print(f"Vectors:    {snapshot['count']} x {snapshot['dimension']}D ({snapshot['dtype']})")
+    print(f"Shards:     {len(snapshot['shards'])} ({size / 1024 / 1024:.1f} MB)")
+    print('=' * 50)
+
+
+def load(args):
+    """Upsert a snapshot into the index"""
+    vector_store = build_vector_store(args.backend)
+    if args.reset and not reset_index(vector_store, args.yes):
+        sys.exit(1)
+
+    report = load_snapshot(
+        vector_store, args.snapshot, args.batch_size, args.workers, verify=not args.no_verify
+    )
+    count = vector_store.get_statistics()['total_vector_count']
+    logger.info(f"📊 Index now holds {count} vectors")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if report['failed']:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export and bulk-load vector index snapshots')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Write the index to a snapshot directory')
+    export_parser.add_argument('snapshot', help='Output directory')
+    export_parser.add_argument('--dtype', choices=SUPPORTED_DTYPES, default='float32')
+    export_parser.add_argument('--shard-size', type=int, default=10000, help='Vectors per shard file')
+    export_parser.add_argument('--page-size', type=int, default=100, help='Vectors per fetch request')
+
+    info_parser = subparsers.add_parser('info', help='Describe a snapshot')
+    info_parser.add_argument('snapshot')
+
+    load_parser = subparsers.add_parser('load', help='Upsert a snapshot into the index')
+    load_parser.add_argument('snapshot', help='Snapshot directory')
+    load_parser.add_argument('--reset', action='store_true', help='Delete all vectors first')
+    load_parser.add_argument('--yes', action='store_true', help='Skip the reset confirmation')
+    load_parser.add_argument('--batch-size', type=int, default=100, help='Vectors per upsert call')
+    load_parser.add_argument('--workers', type=int, default=4, help='Concurrent upsert calls')
+    load_parser.add_argument('--no-verify', action='store_true', help='Skip shard checksums')
+    load_parser.add_argument('--json', help='Write the load report to this JSON file')
+
+    for sub in (export_parser, load_parser):
+        sub.add_argument('--backend', choices=('pinecone', 'embedded'),
+                         help='Vector store (default: VECTOR_STORE_BACKEND)')
+
+    args = parser.parse_args()
+    {'export': export, 'info': info, 'load': load}[args.command](args)
+
+
+if __name__ == '__main__':
+    main()
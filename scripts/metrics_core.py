@@ -0,0 +1,496 @@
+"""
+Performance Metrics Core
+Metrics collection and streaming aggregation, with no plotting or report
+dependencies so the API server can import it cheaply
+"""
+
+import time
+import json
+import math
+import os
+import random
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+
+class StreamingHistogram:
+    """
+    Fixed-memory latency histogram with log-spaced buckets (HDR-style)
+
+    Bucket i covers [min_value * growth**i, min_value * growth**(i+1)), so any
+    quantile is reported within (growth - 1) / 2 relative error. Values below
+    min_value land in the first bucket and values above max_value in the last;
+    count, sum, min and max are exact.
+    """
+
+    def __init__(self, min_value: float = 1e-3, max_value: float = 1e7, growth: float = 1.02):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        size = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        """Add one value in O(1)"""
+        if value > self.min_value:
+            index = min(int(math.log(value / self.min_value) / self._log_growth), len(self.counts) - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0-1) in O(buckets)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(q * self.count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        if index == 0:
+            return float(self.min)  # underflow bucket
+        if index == len(self.counts) - 1:
+            return float(self.max)  # overflow bucket
+        # Geometric midpoint of the bucket, clamped to the exact extremes
+        value = self.min_value * self.growth ** (index + 0.5)
+        return float(min(max(value, self.min), self.max))
+
+    def merge(self, other: "StreamingHistogram"):
+        """Add another histogram with the same bucket layout"""
+        if len(other.counts) != len(self.counts) or other.growth != self.growth:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (non-empty buckets only)"""
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "growth": self.growth,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "buckets": {str(int(i)): int(self.counts[i]) for i in nonzero}
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "StreamingHistogram":
+        histogram = cls(state["min_value"], state["max_value"], state["growth"])
+        for index, count in state["buckets"].items():
+            histogram.counts[int(index)] = count
+        histogram.count = state["count"]
+        histogram.total = state["sum"]
+        if state["count"]:
+            histogram.min = state["min"]
+            histogram.max = state["max"]
+        return histogram
+
+
+class MetricsCollector:
+    """
+    Main class for collecting and storing performance metrics
+
+    Latencies are aggregated per operation in fixed-memory streaming
+    histograms; metrics["latency"] keeps only a bounded uniform sample
+    (reservoir) of the raw records, so memory stays constant in a
+    long-running server.
+    """
+    
+    def __init__(self, project_name: str = "Quantum Flow", reservoir_size: int = 1000,
+                 verbose: bool = False):
+        """
+        Args:
+            project_name: Name shown in summaries and reports
+            reservoir_size: Raw latency records kept as a uniform sample (0 = none)
+            verbose: Print a line for every recorded metric
+        """
+        self.project_name = project_name
+        self.reservoir_size = reservoir_size
+        self.verbose = verbose
+        self.metrics = {
+            "accuracy": [],
+            "latency": [],
+            "efficiency": [],
+            "timestamp": datetime.now().isoformat()
+        }
+        self.metrics_file = Path("metrics_data.json")
+        self.latency_histograms: Dict[str, StreamingHistogram] = {}
+        self._throughput: Dict[str, List[float]] = {}  # operation -> [sum, count]
+        self._latency_seen = 0
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        
+    def record_accuracy(self, model_name: str, accuracy: float, precision: float, 
+                       recall: float, f1_score: float, confusion_matrix: Dict = None):
+        """Record model accuracy metrics"""
+        accuracy_record = {
+            "model_name": model_name,
+            "accuracy": accuracy,
+            "precision": precision,
+            "recall": recall,
+            "f1_score": f1_score,
+            "confusion_matrix": confusion_matrix,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.metrics["accuracy"].append(accuracy_record)
+        if self.verbose:
+            print(f"✓ Recorded accuracy for {model_name}: {accuracy:.2%}")
+        return accuracy_record
+
+    def record_latency(self, operation: str, latency_ms: float, throughput: float = None):
+        """Record operation latency and throughput in O(1) time and fixed memory"""
+        with self._lock:
+            self._aggregate_latency(operation, latency_ms, throughput)
+            latency_record = None
+            if self.reservoir_size > 0:
+                latency_record = self._sample_latency(operation, latency_ms, throughput)
+        if self.verbose:
+            print(f"✓ Recorded latency for {operation}: {latency_ms:.2f}ms")
+        return latency_record
+
+    def _aggregate_latency(self, operation: str, latency_ms: float, throughput: Optional[float]):
+        """Add one latency to the operation's streaming aggregates (lock held)"""
+        histogram = self.latency_histograms.get(operation)
+        if histogram is None:
+            histogram = self.latency_histograms[operation] = StreamingHistogram()
+        histogram.record(latency_ms)
+        if throughput:
+            totals = self._throughput.setdefault(operation, [0.0, 0])
+            totals[0] += throughput
+            totals[1] += 1
+
+    def _sample_latency(self, operation: str, latency_ms: float, throughput: Optional[float]):
+        """Keep a uniform sample of raw records (reservoir sampling, lock held)"""
+        samples = self.metrics["latency"]
+        self._latency_seen += 1
+        if len(samples) < self.reservoir_size:
+            slot = len(samples)
+            samples.append(None)
+        else:
+            del samples[self.reservoir_size:]
+            slot = self._random.randrange(self._latency_seen)
+            if slot >= self.reservoir_size:
+                return None
+        samples[slot] = {
+            "operation": operation,
+            "latency_ms": latency_ms,
+            "throughput": throughput,  # items/sec
+            "timestamp": datetime.now().isoformat()
+        }
+        return samples[slot]
+
+    def record_efficiency(self, operation: str, memory_mb: float, cpu_percent: float, 
+                         gpu_percent: float = None, model_size_mb: float = None):
+        """Record resource efficiency metrics"""
+        efficiency_record = {
+            "operation": operation,
+            "memory_mb": memory_mb,
+            "cpu_percent": cpu_percent,
+            "gpu_percent": gpu_percent,
+            "model_size_mb": model_size_mb,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.metrics["efficiency"].append(efficiency_record)
+        if self.verbose:
+            print(f"✓ Recorded efficiency for {operation}: {memory_mb:.2f}MB RAM, {cpu_percent:.1f}% CPU")
+        return efficiency_record
+
+    def measure_function_latency(self, func):
+        """Decorator to measure function execution time"""
+        def wrapper(*args, **kwargs):
+            import psutil
+            start = time.perf_counter()
+            process = psutil.Process()
+            mem_before = process.memory_info().rss / 1024 / 1024
+            
+            result = func(*args, **kwargs)
+            
+            end = time.perf_counter()
+            mem_after = process.memory_info().rss / 1024 / 1024
+            
+            latency_ms = (end - start) * 1000
+            memory_used = mem_after - mem_before
+            
+            self.record_latency(
+                func.__name__, 
+                latency_ms,
+                throughput=1000/latency_ms  # items per second
+            )
+            
+            return result
+        return wrapper
+
+    def get_state(self) -> Dict[str, Any]:
+        """JSON-serializable copy of everything recorded (used by save and worker sharing)"""
+        with self._lock:
+            data = {key: list(value) if isinstance(value, list) else value
+                    for key, value in self.metrics.items()}
+            data["latency_histograms"] = {
+                operation: histogram.to_dict()
+                for operation, histogram in self.latency_histograms.items()
+            }
+            data["throughput"] = {operation: list(totals) for operation, totals in self._throughput.items()}
+            data["latency_seen"] = self._latency_seen
+        return data
+
+    def set_state(self, data: Dict[str, Any]):
+        """Replace everything recorded with a state from get_state (or an older metrics file)"""
+        data = dict(data)
+        histograms = data.pop("latency_histograms", None)
+        throughput = data.pop("throughput", {})
+        seen = data.pop("latency_seen", None)
+        with self._lock:
+            self.metrics = data
+            self.metrics.setdefault("latency", [])
+            if histograms is None:
+                # Files from before streaming aggregation hold every raw record
+                self.latency_histograms, self._throughput = {}, {}
+                for record in self.metrics["latency"]:
+                    self._aggregate_latency(record["operation"], record["latency_ms"], record.get("throughput"))
+                self._latency_seen = len(self.metrics["latency"])
+            else:
+                self.latency_histograms = {
+                    operation: StreamingHistogram.from_dict(state)
+                    for operation, state in histograms.items()
+                }
+                self._throughput = {operation: list(totals) for operation, totals in throughput.items()}
+                self._latency_seen = seen if seen is not None else len(self.metrics["latency"])
+
+    def merge(self, other: "MetricsCollector"):
+        """
+        Add another collector's metrics (e.g. another worker process)
+
+        Histograms and throughput totals add exactly; the raw latency samples
+        are combined in proportion to how many records each side has seen, so
+        the result is still a uniform sample of both.
+        """
+        state = other.get_state()
+        with self._lock:
+            for operation, histogram_state in state["latency_histograms"].items():
+                histogram = StreamingHistogram.from_dict(histogram_state)
+                if operation in self.latency_histograms:
+                    self.latency_histograms[operation].merge(histogram)
+                else:
+                    self.latency_histograms[operation] = histogram
+            for operation, (total, count) in state["throughput"].items():
+                totals = self._throughput.setdefault(operation, [0.0, 0])
+                totals[0] += total
+                totals[1] += count
+
+            mine, theirs = self.metrics["latency"], state["latency"]
+            mine_seen, theirs_seen = self._latency_seen, state["latency_seen"]
+            size = min(self.reservoir_size, len(mine) + len(theirs))
+            if theirs_seen and mine_seen:
+                rng = np.random.default_rng(self._random.getrandbits(32))
+                take = int(rng.hypergeometric(theirs_seen, mine_seen, size))
+            else:
+                take = size if theirs_seen else 0
+            take = min(max(take, size - len(mine)), len(theirs))
+            self.metrics["latency"] = (
+                self._random.sample(mine, size - take) + self._random.sample(theirs, take)
+            )
+            self._latency_seen = mine_seen + theirs_seen
+
+            self.metrics["accuracy"].extend(state.get("accuracy", []))
+            self.metrics["efficiency"].extend(state.get("efficiency", []))
+            self.metrics["timestamp"] = min(self.metrics["timestamp"], state.get("timestamp") or self.metrics["timestamp"])
+
+    def save_metrics(self, filepath: str = None):
+        """Save metrics to JSON file"""
+        if filepath is None:
+            filepath = str(self.metrics_file)
+        
+        data = self.get_state()
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"✓ Metrics saved to {filepath}")
+
+    def load_metrics(self, filepath: str = None):
+        """Load metrics from JSON file"""
+        if filepath is None:
+            filepath = str(self.metrics_file)
+        
+        if Path(filepath).exists():
+            with open(filepath, 'r') as f:
+                self.set_state(json.load(f))
+            print(f"✓ Metrics loaded from {filepath}")
+        else:
+            print(f"✗ Metrics file not found: {filepath}")
+
+    def get_accuracy_summary(self) -> Dict:
+        """Get summary statistics for accuracy metrics"""
+        if not self.metrics["accuracy"]:
+            return {}
+        
+        summary = {}
+        for record in self.metrics["accuracy"]:
+            model = record["model_name"]
+            summary[model] = {
+                "accuracy": record["accuracy"],
+                "precision": record["precision"],
+                "recall": record["recall"],
+                "f1_score": record["f1_score"]
+            }
+        return summary
+
+    def get_latency_summary(self) -> Dict:
+        """Get summary statistics for latency metrics (O(buckets) per operation)"""
+        with self._lock:
+            stats = {}
+            for operation, histogram in self.latency_histograms.items():
+                stats[operation] = {
+                    "min": histogram.min,
+                    "max": histogram.max,
+                    "mean": histogram.mean,
+                    "median": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "count": histogram.count
+                }
+            return stats
+
+    def get_throughput_summary(self) -> Dict:
+        """Get mean throughput (items/sec) per operation"""
+        with self._lock:
+            return {
+                operation: total / count
+                for operation, (total, count) in self._throughput.items() if count
+            }
+
+    def get_efficiency_summary(self) -> Dict:
+        """Get summary statistics for efficiency metrics"""
+        if not self.metrics["efficiency"]:
+            return {}
+        
+        summary = {}
+        for record in self.metrics["efficiency"]:
+            operation = record["operation"]
+            summary[operation] = {
+                "memory_mb": record["memory_mb"],
+                "cpu_percent": record["cpu_percent"],
+                "gpu_percent": record["gpu_percent"],
+                "model_size_mb": record["model_size_mb"]
+            }
+        return summary
+
+    def print_summary(self):
+        """Print metrics summary to console"""
+        print("\n" + "="*80)
+        print(f"PERFORMANCE METRICS SUMMARY - {self.project_name}")
+        print("="*80)
+        
+        # Accuracy Summary
+        acc_summary = self.get_accuracy_summary()
+        if acc_summary:
+            print("\n📊 ACCURACY METRICS:")
+            print("-" * 80)
+            for model, metrics in acc_summary.items():
+                print(f"  {model}:")
+                print(f"    Accuracy:  {metrics['accuracy']:.2%}")
+                print(f"    Precision: {metrics['precision']:.2%}")
+                print(f"    Recall:    {metrics['recall']:.2%}")
+                print(f"    F1-Score:  {metrics['f1_score']:.2%}")
+        
+        # Latency Summary
+        lat_summary = self.get_latency_summary()
+        if lat_summary:
+            print("\n⚡ LATENCY METRICS (milliseconds):")
+            print("-" * 80)
+            for operation, stats in lat_summary.items():
+                print(f"  {operation}:")
+                print(f"    Mean:   {stats['mean']:.2f}ms | Median: {stats['median']:.2f}ms")
+                print(f"    P95:    {stats['p95']:.2f}ms | P99:    {stats['p99']:.2f}ms")
+                print(f"    Range:  {stats['min']:.2f}ms - {stats['max']:.2f}ms")
+        
+        # Efficiency Summary
+        eff_summary = self.get_efficiency_summary()
+        if eff_summary:
+            print("\n💾 EFFICIENCY METRICS:")
+            print("-" * 80)
+            for operation, metrics in eff_summary.items():
+                print(f"  {operation}:")
+                print(f"    Memory: {metrics['memory_mb']:.2f}MB | CPU: {metrics['cpu_percent']:.1f}%")
+                if metrics['gpu_percent']:
+                    print(f"    GPU: {metrics['gpu_percent']:.1f}%")
+                if metrics['model_size_mb']:
+                    print(f"    Model Size: {metrics['model_size_mb']:.2f}MB")
+        
+        print("\n" + "="*80 + "\n")
+
+
+class SharedMetrics:
+    """
+    Merge the metrics of pre-forked worker processes through a shared directory
+
+    Each worker publishes its collector state to worker-<pid>.json (atomic
+    rename); a merged view combines the caller's live collector with every
+    other worker's latest snapshot. Snapshots of exited workers are kept, so
+    their requests stay in the totals until the directory is cleared at server
+    start.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f"worker-{pid}.json"
+
+    def clear(self):
+        """Remove snapshots from a previous server run (call before forking)"""
+        if self.directory.exists():
+            for path in self.directory.glob("worker-*.json"):
+                path.unlink(missing_ok=True)
+
+    def publish(self, collector: MetricsCollector):
+        """Write this process's metrics for the other workers"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(os.getpid())
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(collector.get_state(), f)
+        os.replace(tmp, path)
+
+    def merged(self, collector: MetricsCollector) -> Tuple[MetricsCollector, int]:
+        """
+        Metrics of all workers: the live local collector plus the other snapshots
+
+        Returns:
+            Tuple of (new MetricsCollector, number of worker processes merged)
+        """
+        combined = MetricsCollector(collector.project_name, collector.reservoir_size)
+        combined.merge(collector)
+        workers = 1
+        own = self._path(os.getpid())
+        for path in sorted(self.directory.glob("worker-*.json")) if self.directory.exists() else []:
+            if path == own:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue  # removed or replaced while listing
+            other = MetricsCollector(collector.project_name, collector.reservoir_size)
+            other.set_state(state)
+            combined.merge(other)
+            workers += 1
+        return combined, workers
@@ -1,10 +1,12 @@
 """
 Integration helper for metrics collection into FastAPI backend
 Shows how to track API performance, model inference, and resource usage
+
+Imports only the metrics core: charts and reports (performance_metrics) are
+loaded on demand, so importing this module stays cheap.
 """
 
 import time
-import psutil
 from functools import wraps
 from typing import Callable, Any
 import asyncio
@@ -16,7 +18,7 @@ _current_dir = Path(__file__).parent
 if str(_current_dir) not in sys.path:
     sys.path.insert(0, str(_current_dir))
 
-from performance_metrics import MetricsCollector
+from metrics_core import MetricsCollector, SharedMetrics
 
 
 # Global metrics collector instance
@@ -108,6 +110,7 @@ def track_resource_usage(operation_name: str, model_size_mb: float = None) -> Ca
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
+            import psutil
             process = psutil.Process()
             
             # Record before execution
@@ -1,12 +1,11 @@
 """
 Performance Metrics Collection and Analysis System
 Tracks accuracy, latency, efficiency metrics for the project
+
+Charts and PowerPoint reports live here; collection lives in metrics_core,
+which imports none of the plotting/report libraries.
 """
 
-import time
-import psutil
-import json
-import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
@@ -18,209 +17,10 @@ from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 import numpy as np
 
-
-class MetricsCollector:
-    """Main class for collecting and storing performance metrics"""
-    
-    def __init__(self, project_name: str = "Quantum Flow"):
-        self.project_name = project_name
-        self.metrics = {
-            "accuracy": [],
-            "latency": [],
-            "efficiency": [],
-            "timestamp": datetime.now().isoformat()
-        }
-        self.metrics_file = Path("metrics_data.json")
-        
-    def record_accuracy(self, model_name: str, accuracy: float, precision: float, 
-                       recall: float, f1_score: float, confusion_matrix: Dict = None):
-        """Record model accuracy metrics"""
-        accuracy_record = {
-            "model_name": model_name,
-            "accuracy": accuracy,
-            "precision": precision,
-            "recall": recall,
-            "f1_score": f1_score,
-            "confusion_matrix": confusion_matrix,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.metrics["accuracy"].append(accuracy_record)
-        print(f"✓ Recorded accuracy for {model_name}: {accuracy:.2%}")
-        return accuracy_record
-
-    def record_latency(self, operation: str, latency_ms: float, throughput: float = None):
-        """Record operation latency and throughput"""
-        latency_record = {
-            "operation": operation,
-            "latency_ms": latency_ms,
-            "throughput": throughput,  # items/sec
-            "timestamp": datetime.now().isoformat()
-        }
-        self.metrics["latency"].append(latency_record)
-        print(f"✓ Recorded latency for {operation}: {latency_ms:.2f}ms")
-        return latency_record
-
-    def record_efficiency(self, operation: str, memory_mb: float, cpu_percent: float, 
-                         gpu_percent: float = None, model_size_mb: float = None):
-        """Record resource efficiency metrics"""
-        efficiency_record = {
-            "operation": operation,
-            "memory_mb": memory_mb,
-            "cpu_percent": cpu_percent,
-            "gpu_percent": gpu_percent,
-            "model_size_mb": model_size_mb,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.metrics["efficiency"].append(efficiency_record)
-        print(f"✓ Recorded efficiency for {operation}: {memory_mb:.2f}MB RAM, {cpu_percent:.1f}% CPU")
-        return efficiency_record
-
-    def measure_function_latency(self, func):
-        """Decorator to measure function execution time"""
-        def wrapper(*args, **kwargs):
-            start = time.perf_counter()
-            process = psutil.Process()
-            mem_before = process.memory_info().rss / 1024 / 1024
-            
-            result = func(*args, **kwargs)
-            
-            end = time.perf_counter()
-            mem_after = process.memory_info().rss / 1024 / 1024
-            
-            latency_ms = (end - start) * 1000
-            memory_used = mem_after - mem_before
-            
-            self.record_latency(
-                func.__name__, 
-                latency_ms,
-                throughput=1000/latency_ms  # items per second
-            )
-            
-            return result
-        return wrapper
-
-    def save_metrics(self, filepath: str = None):
-        """Save metrics to JSON file"""
-        if filepath is None:
-            filepath = str(self.metrics_file)
-        
-        with open(filepath, 'w') as f:
-            json.dump(self.metrics, f, indent=2)
-        print(f"✓ Metrics saved to {filepath}")
-
-    def load_metrics(self, filepath: str = None):
-        """Load metrics from JSON file"""
-        if filepath is None:
-            filepath = str(self.metrics_file)
-        
-        if Path(filepath).exists():
-            with open(filepath, 'r') as f:
-                self.metrics = json.load(f)
-            print(f"✓ Metrics loaded from {filepath}")
-        else:
-            print(f"✗ Metrics file not found: {filepath}")
-
-    def get_accuracy_summary(self) -> Dict:
-        """Get summary statistics for accuracy metrics"""
-        if not self.metrics["accuracy"]:
-            return {}
-        
-        summary = {}
-        for record in self.metrics["accuracy"]:
-            model = record["model_name"]
-            summary[model] = {
-                "accuracy": record["accuracy"],
-                "precision": record["precision"],
-                "recall": record["recall"],
-                "f1_score": record["f1_score"]
-            }
-        return summary
-
-    def get_latency_summary(self) -> Dict:
-        """Get summary statistics for latency metrics"""
-        if not self.metrics["latency"]:
-            return {}
-        
-        summary = {}
-        for record in self.metrics["latency"]:
-            operation = record["operation"]
-            if operation not in summary:
-                summary[operation] = []
-            summary[operation].append(record["latency_ms"])
-        
-        # Calculate statistics
-        stats = {}
-        for operation, latencies in summary.items():
-            stats[operation] = {
-                "min": min(latencies),
-                "max": max(latencies),
-                "mean": np.mean(latencies),
-                "median": np.median(latencies),
-                "p95": np.percentile(latencies, 95),
-                "p99": np.percentile(latencies, 99),
-                "count": len(latencies)
-            }
-        return stats
-
-    def get_efficiency_summary(self) -> Dict:
-        """Get summary statistics for efficiency metrics"""
-        if not self.metrics["efficiency"]:
-            return {}
-        
-        summary = {}
-        for record in self.metrics["efficiency"]:
-            operation = record["operation"]
-            summary[operation] = {
-                "memory_mb": record["memory_mb"],
-                "cpu_percent": record["cpu_percent"],
-                "gpu_percent": record["gpu_percent"],
-                "model_size_mb": record["model_size_mb"]
-            }
-        return summary
-
-    def print_summary(self):
-        """Print metrics summary to console"""
-        print("\n" + "="*80)
-        print(f"PERFORMANCE METRICS SUMMARY - {self.project_name}")
-        print("="*80)
-        
-        # Accuracy Summary
-        acc_summary = self.get_accuracy_summary()
-        if acc_summary:
-            print("\n📊 ACCURACY METRICS:")
-            print("-" * 80)
-            for model, metrics in acc_summary.items():
-                print(f"  {model}:")
-                print(f"    Accuracy:  {metrics['accuracy']:.2%}")
-                print(f"    Precision: {metrics['precision']:.2%}")
-                print(f"    Recall:    {metrics['recall']:.2%}")
-                print(f"    F1-Score:  {metrics['f1_score']:.2%}")
-        
-        # Latency Summary
-        lat_summary = self.get_latency_summary()
-        if lat_summary:
-            print("\n⚡ LATENCY METRICS (milliseconds):")
-            print("-" * 80)
-            for operation, stats in lat_summary.items():
-                print(f"  {operation}:")
-                print(f"    Mean:   {stats['mean']:.2f}ms | Median: {stats['median']:.2f}ms")
-                print(f"    P95:    {stats['p95']:.2f}ms | P99:    {stats['p99']:.2f}ms")
-                print(f"    Range:  {stats['min']:.2f}ms - {stats['max']:.2f}ms")
-        
-        # Efficiency Summary
-        eff_summary = self.get_efficiency_summary()
-        if eff_summary:
-            print("\n💾 EFFICIENCY METRICS:")
-            print("-" * 80)
-            for operation, metrics in eff_summary.items():
-                print(f"  {operation}:")
-                print(f"    Memory: {metrics['memory_mb']:.2f}MB | CPU: {metrics['cpu_percent']:.1f}%")
-                if metrics['gpu_percent']:
-                    print(f"    GPU: {metrics['gpu_percent']:.1f}%")
-                if metrics['model_size_mb']:
-                    print(f"    Model Size: {metrics['model_size_mb']:.2f}MB")
-        
-        print("\n" + "="*80 + "\n")
+try:
+    from metrics_core import MetricsCollector, StreamingHistogram
+except ImportError:
+    from scripts.metrics_core import MetricsCollector, StreamingHistogram
 
 
 class MetricsVisualizer:
@@ -303,18 +103,7 @@ class MetricsVisualizer:
 
     def create_throughput_chart(self) -> plt.Figure:
         """Create throughput comparison chart"""
-        lat_data = self.collector.metrics.get("latency", [])
-        
-        if not lat_data:
-            return None
-        
-        operations = {}
-        for record in lat_data:
-            op = record["operation"]
-            if record.get("throughput"):
-                if op not in operations:
-                    operations[op] = []
-                operations[op].append(record["throughput"])
+        operations = self.collector.get_throughput_summary()
         
         if not operations:
             return None
@@ -322,7 +111,7 @@ class MetricsVisualizer:
         fig, ax = plt.subplots(figsize=(12, 6))
         
         ops = list(operations.keys())
-        throughputs = [np.mean(operations[op]) for op in ops]
+        throughputs = [operations[op] for op in ops]
         
         colors = plt.cm.viridis(np.linspace(0, 1, len(ops)))
         bars = ax.barh(ops, throughputs, color=colors, alpha=0.8)
@@ -592,7 +381,7 @@ def example_usage():
     """Example of how to use the metrics system"""
     
     # Initialize collector
-    collector = MetricsCollector("Quantum Flow - Healthcare AI")
+    collector = MetricsCollector("Quantum Flow - Healthcare AI", verbose=True)
     
     # Record accuracy metrics (simulated)
     collector.record_accuracy(
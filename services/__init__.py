@@ -2,7 +2,29 @@
 Services package for Quantum Image Retrieval System
 """
 
-from .cloudinary_service import CloudinaryImageService
-from .pinecone_service import PineconeVectorService
+import importlib
 
-__all__ = ['CloudinaryImageService', 'PineconeVectorService']
+# Re-exports are resolved lazily so that local-only modules (e.g. local_store)
+# can be imported without loading the cloud SDKs
+_EXPORTS = {
+    'CloudinaryImageService': '.cloudinary_service',
+    'PineconeVectorService': '.pinecone_service',
+    'QueryCache': '.query_cache',
+    'VectorValueCache': '.vector_cache',
+    'EmbeddedVectorStore': '.embedded_vector_store',
+    'IndexStatsService': '.stats_service',
+    'LocalImageService': '.local_image_service',
+    'UpsertReport': '.vector_store',
+    'VectorStore': '.vector_store',
+    'create_vector_store': '.vector_store',
+    'create_image_service': '.local_image_service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
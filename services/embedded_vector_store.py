@@ -0,0 +1,444 @@
+"""
+Embedded Vector Store
+Persistent on-disk vector index for running without Pinecone
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from services.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddedVectorStore(VectorStore):
+    """
+    Vector store backed by local files
+
+    - Values: memory-mapped float32 matrix (one row per vector, grows by doubling)
+    - Metadata: SQLite table mapping vector ID -> matrix row, category, metadata
+    - Search: exact cosine similarity as one BLAS matrix-vector product
+
+    Single writer process; reads and writes within the process are serialized.
+    Opened read-only, any number of processes can search a snapshot of the
+    store (vectors written after opening are not seen) and writes fail.
+    """
+
+    MATRIX_FILE = 'vectors.f32'
+    DB_FILE = 'metadata.sqlite'
+
+    def __init__(
+        self,
+        directory: str,
+        dimension: int,
+        initial_capacity: int = 1024,
+        read_only: bool = False
+    ):
+        """
+        Open or create the store
+
+        Args:
+            directory: Directory for the matrix file and SQLite database
+            dimension: Feature vector dimension
+            initial_capacity: Rows allocated when the store is created
+            read_only: Open an existing store for searches only
+
+        Raises:
+            FileNotFoundError: If read_only and the store does not exist
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.read_only = read_only
+        self._row_bytes = dimension * 4
+        self._lock = threading.RLock()
+
+        db_path = self.directory / self.DB_FILE
+        if read_only:
+            if not db_path.exists() or not (self.directory / self.MATRIX_FILE).exists():
+                raise FileNotFoundError(f"No embedded vector store in {self.directory}")
+            self._db = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS vectors ('
+                'id TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE, '
+                'category TEXT, metadata TEXT NOT NULL)'
+            )
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        stored = self._db.execute("SELECT value FROM meta WHERE key = 'dimension'").fetchone()
+        if stored is None and not read_only:
+            self._db.execute("INSERT INTO meta VALUES ('dimension', ?)", (str(dimension),))
+        elif stored is not None and int(stored[0]) != dimension:
+            raise ValueError(f"Embedded store dimension {stored[0]} != {dimension}")
+        if not read_only:
+            self._db.commit()
+
+        start = time.time()
+        self._open(initial_capacity)
+        logger.info(f"✅ Embedded vector store initialized{' (read-only)' if read_only else ''}")
+        logger.info(f"   Path: {self.directory}")
+        logger.info(f"   Dimension: {dimension}")
+        logger.info(f"   Vectors: {len(self._id_to_row)} (loaded in {time.time() - start:.2f}s)")
+
+    # ------------------------------------------------------------- storage
+
+    def _open(self, initial_capacity: int):
+        path = self.directory / self.MATRIX_FILE
+        if not path.exists():
+            with open(path, 'wb') as f:
+                f.truncate(max(1, initial_capacity) * self._row_bytes)
+        self._capacity = path.stat().st_size // self._row_bytes
+        self._map()
+
+        self._id_to_row: Dict[str, int] = {}
+        self._live = np.zeros(self._capacity, dtype=bool)
+        self._row_ids = np.full(self._capacity, None, dtype=object)
+        self._categories = np.full(self._capacity, None, dtype=object)
+        for vector_id, row, category in self._db.execute('SELECT id, row, category FROM vectors'):
+            self._id_to_row[vector_id] = row
+            self._row_ids[row] = vector_id
+            self._live[row] = True
+            self._categories[row] = category
+
+        live_rows = np.flatnonzero(self._live)
+        self._high_water = int(live_rows.max()) + 1 if len(live_rows) else 0
+        self._free_rows = [int(r) for r in np.flatnonzero(~self._live[:self._high_water])]
+
+        self._inv_norms = np.zeros(self._capacity, dtype=np.float32)
+        if len(live_rows):
+            self._inv_norms[live_rows] = self._inverse_norms(self._matrix[live_rows])
+
+    def _map(self):
+        self._matrix = np.memmap(
+            self.directory / self.MATRIX_FILE,
+            dtype=np.float32,
+            mode='r' if self.read_only else 'r+',
+            shape=(self._capacity, self.dimension)
+        )
+
+    def _grow(self, needed: int):
+        """Grow the matrix file to hold at least `needed` rows"""
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2)
+        self._matrix.flush()
+        del self._matrix
+        with open(self.directory / self.MATRIX_FILE, 'r+b') as f:
+            f.truncate(capacity * self._row_bytes)
+
+        extra = capacity - self._capacity
+        self._live = np.concatenate([self._live, np.zeros(extra, dtype=bool)])
+        self._row_ids = np.concatenate([self._row_ids, np.full(extra, None, dtype=object)])
+        self._categories = np.concatenate([self._categories, np.full(extra, None, dtype=object)])
+        self._inv_norms = np.concatenate([self._inv_norms, np.zeros(extra, dtype=np.float32)])
+        self._capacity = capacity
+        self._map()
+
+    def _allocate_rows(self, count: int) -> List[int]:
+        rows = []
+        while self._free_rows and len(rows) < count:
+            rows.append(self._free_rows.pop())
+        new = count - len(rows)
+        if new:
+            rows.extend(range(self._high_water, self._high_water + new))
+            self._high_water += new
+            self._grow(self._high_water)
+        return rows
+
+    @staticmethod
+    def _inverse_norms(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1)
+        return np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+    # -------------------------------------------------------------- writes
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError(f"Embedded vector store {self.directory} is open read-only")
+
+    def _write(self, vectors: List[Dict[str, Any]]):
+        """Write vectors to the matrix and metadata table, then notify listeners"""
+        self._check_writable()
+        # Last write wins for duplicate IDs within one batch
+        latest = {v['id']: v for v in vectors}
+        values = np.asarray(
+            [self._fit_dimension(v['values'], self.dimension) for v in latest.values()],
+            dtype=np.float32
+        ).reshape(-1, self.dimension)
+
+        with self._lock:
+            new_ids = [vector_id for vector_id in latest if vector_id not in self._id_to_row]
+            for vector_id, row in zip(new_ids, self._allocate_rows(len(new_ids))):
+                self._id_to_row[vector_id] = row
+            rows = np.array([self._id_to_row[vector_id] for vector_id in latest])
+
+            self._matrix[rows] = values
+            self._matrix.flush()
+
+            records = []
+            for (vector_id, item), row in zip(latest.items(), rows):
+                metadata = dict(item.get('metadata') or {})
+                self._row_ids[row] = vector_id
+                self._categories[row] = metadata.get('category')
+                records.append((vector_id, int(row), metadata.get('category'), json.dumps(metadata)))
+            self._inv_norms[rows] = self._inverse_norms(values)
+            self._live[rows] = True
+
+            self._db.executemany(
+                'INSERT INTO vectors (id, row, category, metadata) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET category = excluded.category, '
+                'metadata = excluded.metadata',
+                records
+            )
+            self._db.commit()
+
+        self._notify_listeners('on_upsert', [
+            {'id': vector_id, 'values': vector.tolist(), 'metadata': item.get('metadata') or {}}
+            for (vector_id, item), vector in zip(latest.items(), values)
+        ])
+
+    def upsert_vector(
+        self,
+        vector_id: str,
+        features: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """
+        Insert or update a vector
+
+        Args:
+            vector_id: Unique vector ID
+            features: Feature vector
+            metadata: Associated metadata (category, filename, url, etc.)
+
+        Returns:
+            True if successful
+        """
+        try:
+            self._write([{'id': vector_id, 'values': features, 'metadata': metadata}])
+            logger.info(f"✅ Vector indexed: {vector_id}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Upsert failed: {e}")
+            return False
+
+    def upsert_vectors_batch(self, vectors_data: List[Dict[str, Any]]) -> bool:
+        """
+        Batch insert/update vectors
+
+        Args:
+            vectors_data: List of dicts with 'id', 'values', 'metadata'
+
+        Returns:
+            True if successful
+        """
+        try:
+            if vectors_data:
+                self._write(vectors_data)
+                logger.info(f"🎯 Total indexed: {len(vectors_data)} vectors")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Batch upsert failed: {e}")
+            return False
+
+    def delete_vector(self, vector_id: str) -> bool:
+        """
+        Delete a vector
+
+        Args:
+            vector_id: Vector ID to delete
+
+        Returns:
+            True if successful
+        """
+        try:
+            self._check_writable()
+            with self._lock:
+                row = self._id_to_row.pop(vector_id, None)
+                if row is not None:
+                    self._db.execute('DELETE FROM vectors WHERE id = ?', (vector_id,))
+                    self._db.commit()
+                    self._live[row] = False
+                    self._row_ids[row] = None
+                    self._categories[row] = None
+                    self._inv_norms[row] = 0.0
+                    self._free_rows.append(row)
+            self._notify_listeners('on_delete', [vector_id])
+            logger.info(f"🗑️ Deleted vector: {vector_id}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Delete failed: {e}")
+            return False
+
+    def delete_all_vectors(self) -> bool:
+        """
+        Delete all vectors (use with caution!)
+
+        Returns:
+            True if successful
+        """
+        try:
+            self._check_writable()
+            with self._lock:
+                self._db.execute('DELETE FROM vectors')
+                self._db.commit()
+                self._id_to_row.clear()
+                self._live[:] = False
+                self._row_ids[:] = None
+                self._categories[:] = None
+                self._inv_norms[:] = 0.0
+                self._free_rows = []
+                self._high_water = 0
+            self._notify_listeners('on_delete_all')
+            logger.warning("🗑️ All vectors deleted from index!")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Delete all failed: {e}")
+            return False
+
+    # --------------------------------------------------------------- reads
+
+    def search(
+        self,
+        query_features: List[float],
+        top_k: int = 10,
+        category_filter: Optional[str] = None,
+        min_score: float = 0.0,
+        include_values: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact cosine similarity search
+
+        Args:
+            query_features: Query feature vector
+            top_k: Number of results to return
+            category_filter: Optional category filter
+            min_score: Minimum similarity score threshold
+            include_values: Return vector values with each match
+
+        Returns:
+            List of similar vectors with metadata, scores and values
+        """
+        try:
+            query = np.asarray(
+                self._fit_dimension(query_features, self.dimension), dtype=np.float32
+            )
+            query_norm = float(np.linalg.norm(query))
+            if query_norm == 0:
+                return []
+
+            with self._lock:
+                n = self._high_water
+                mask = self._live[:n]
+                if category_filter:
+                    mask = mask & (self._categories[:n] == category_filter)
+                k = min(top_k, int(mask.sum()))
+                if k == 0:
+                    return []
+
+                scores = (self._matrix[:n] @ query) * self._inv_norms[:n] / query_norm
+                scores[~mask] = -np.inf
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best])]
+                best = best[scores[best] >= min_score]
+
+                metadata = self._load_metadata([self._row_ids[row] for row in best])
+                matches = [{
+                    'id': self._row_ids[row],
+                    'score': float(scores[row]),
+                    'metadata': metadata.get(self._row_ids[row], {})
+                } for row in best]
+                if include_values:
+                    for match, row in zip(matches, best):
+                        match['values'] = self._matrix[row].tolist()
+
+            logger.info(f"✅ Found {len(matches)} matches (threshold: {min_score})")
+            return matches
+
+        except Exception as e:
+            logger.error(f"❌ Search failed: {e}")
+            return []
+
+    def _load_metadata(self, vector_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        metadata = {}
+        for start in range(0, len(vector_ids), 500):
+            chunk = vector_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for vector_id, raw in self._db.execute(
+                f'SELECT id, metadata FROM vectors WHERE id IN ({placeholders})', chunk
+            ):
+                metadata[vector_id] = json.loads(raw)
+        return metadata
+
+    def fetch(self, vector_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stored vectors by ID
+
+        Args:
+            vector_ids: Vector IDs to fetch
+
+        Returns:
+            Dict of vector ID -> {'id', 'values', 'metadata'} (missing IDs omitted)
+        """
+        with self._lock:
+            metadata = self._load_metadata(list(vector_ids))
+            return {
+                vector_id: {
+                    'id': vector_id,
+                    'values': self._matrix[self._id_to_row[vector_id]].tolist(),
+                    'metadata': metadata[vector_id]
+                }
+                for vector_id in vector_ids
+                if vector_id in metadata
+            }
+
+    def list_vector_ids(self, page_size: int = 100) -> Iterator[List[str]]:
+        """
+        Page through every vector ID
+
+        Args:
+            page_size: IDs per page
+
+        Yields:
+            Lists of vector IDs
+        """
+        with self._lock:
+            ids = list(self._id_to_row.keys())
+        for start in range(0, len(ids), page_size):
+            yield ids[start:start + page_size]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with index stats
+        """
+        with self._lock:
+            return {
+                'total_vector_count': len(self._id_to_row),
+                'categories': dict(Counter(c for c in self._categories[self._live] if c is not None)),
+                'dimension': int(self.dimension),
+                'index_name': f"embedded:{self.directory}",
+                'capacity': int(self._capacity),
+                'size_mb': self._capacity * self._row_bytes / 1024 / 1024
+            }
+
+    def close(self):
+        """Flush the matrix and close the database"""
+        with self._lock:
+            if not self.read_only:
+                self._matrix.flush()
+            self._db.close()
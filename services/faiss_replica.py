@@ -0,0 +1,371 @@
+"""
+FAISS Replica Service
+In-process HNSW replica of the vector index for local similarity search
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FaissReplica:
+    """
+    Local HNSW (inner product on normalized vectors = cosine) copy of the index
+
+    - Built from a vector export, kept in sync as a vector-store write listener
+    - Labels are HNSW insertion positions; deletes and overwrites tombstone the
+      old label and are filtered out at search time with an ID selector
+    - Persisted as a FAISS index file plus a JSON metadata sidecar; periodic
+      saves run on a background thread, and only the in-memory snapshot is
+      taken under the lock
+    - Filtered searches that HNSW answers with too few matches (narrow
+      categories) fall back to an exact scan of the allowed vectors
+
+    Stored values are the normalized vectors; cosine scores are unchanged.
+    """
+
+    INDEX_FILE = 'replica.index'
+    META_FILE = 'replica.json'
+
+    def __init__(
+        self,
+        directory: str,
+        dimension: int,
+        hnsw_m: int = 32,
+        ef_construction: int = 200,
+        ef_search: int = 128,
+        save_every: int = 500
+    ):
+        """
+        Initialize the replica, loading it from disk when present
+
+        Args:
+            directory: Directory for the index file and metadata sidecar
+            dimension: Feature vector dimension
+            hnsw_m: HNSW graph degree
+            ef_construction: HNSW build-time candidate list size
+            ef_search: HNSW search-time candidate list size
+            save_every: Persist in the background after this many writes (0 = only on save())
+        """
+        import faiss
+        self._faiss = faiss
+
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.save_every = save_every
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._saving = False
+        self._pending_writes = 0
+        self.last_write_at = 0.0
+        self._searches = 0
+        self._search_time = 0.0
+        self._exact_fallbacks = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if (self.directory / self.INDEX_FILE).exists():
+            self._load()
+        else:
+            self._reset()
+
+    # ------------------------------------------------------------- storage
+
+    def _new_index(self):
+        index = self._faiss.IndexHNSWFlat(
+            self.dimension, self.hnsw_m, self._faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = self.ef_construction
+        index.hnsw.efSearch = self.ef_search
+        return index
+
+    def _reset(self):
+        """Empty replica (caller holds the lock or is the constructor)"""
+        self.index = self._new_index()
+        self._records: List[Optional[Dict[str, Any]]] = []
+        self._id_to_label: Dict[str, int] = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._categories = np.zeros(0, dtype=object)
+
+    def _load(self):
+        start = time.time()
+        self.index = self._faiss.read_index(str(self.directory / self.INDEX_FILE))
+        self.index.hnsw.efSearch = self.ef_search
+        with open(self.directory / self.META_FILE) as f:
+            meta = json.load(f)
+
+        if meta.get('dimension') != self.dimension:
+            raise ValueError(
+                f"Replica dimension {meta.get('dimension')} != {self.dimension}; rebuild it"
+            )
+
+        self._records = meta['records']
+        self._id_to_label = {
+            record['id']: label
+            for label, record in enumerate(self._records)
+            if record is not None
+        }
+        self._live = np.array([r is not None for r in self._records], dtype=bool)
+        self._categories = np.array(
+            [(r or {}).get('metadata', {}).get('category') for r in self._records],
+            dtype=object
+        )
+        logger.info(
+            f"✅ FAISS replica loaded: {len(self)} vectors in {time.time() - start:.2f}s"
+        )
+
+    def save(self):
+        """
+        Persist the index and metadata (compacts heavily tombstoned indexes)
+
+        Writes and searches are blocked only while the index is serialized
+        to memory; the files are written after the lock is released.
+        """
+        with self._save_lock:
+            with self._lock:
+                if len(self._records) and len(self) < 0.75 * len(self._records):
+                    self._compact()
+                data = self._faiss.serialize_index(self.index)
+                # Records are replaced, never mutated, so a shallow copy is a snapshot
+                records = list(self._records)
+                saved_writes = self._pending_writes
+
+            tmp_index = self.directory / (self.INDEX_FILE + '.tmp')
+            tmp_meta = self.directory / (self.META_FILE + '.tmp')
+            data.tofile(str(tmp_index))
+            with open(tmp_meta, 'w') as f:
+                json.dump({
+                    'dimension': self.dimension,
+                    'records': records,
+                    'saved_at': time.time()
+                }, f)
+            os.replace(tmp_index, self.directory / self.INDEX_FILE)
+            os.replace(tmp_meta, self.directory / self.META_FILE)
+            with self._lock:
+                self._pending_writes -= saved_writes
+        logger.info(f"💾 FAISS replica saved: {sum(r is not None for r in records)} vectors")
+
+    def _background_save(self):
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"❌ FAISS replica save failed: {e}")
+        finally:
+            self._saving = False
+
+    def _compact(self):
+        """Rebuild the graph from live vectors only"""
+        labels = np.flatnonzero(self._live)
+        vectors = (
+            self.index.reconstruct_batch(labels)
+            if len(labels) else np.zeros((0, self.dimension), dtype=np.float32)
+        )
+        records = [self._records[i] for i in labels]
+        self._reset()
+        self._append(records, vectors)
+
+    def _append(self, records: List[Dict[str, Any]], normalized: np.ndarray):
+        """Add normalized vectors with their records (caller holds the lock)"""
+        start = len(self._records)
+        self.index.add(normalized)
+        self._records.extend(records)
+        for offset, record in enumerate(records):
+            self._id_to_label[record['id']] = start + offset
+        self._live = np.concatenate([self._live, np.ones(len(records), dtype=bool)])
+        self._categories = np.concatenate([
+            self._categories,
+            np.array([r['metadata'].get('category') for r in records], dtype=object)
+        ])
+
+    def _tombstone(self, vector_ids: Iterable[str]) -> int:
+        removed = 0
+        for vector_id in vector_ids:
+            label = self._id_to_label.pop(vector_id, None)
+            if label is not None:
+                self._records[label] = None
+                self._live[label] = False
+                self._categories[label] = None
+                removed += 1
+        return removed
+
+    def _normalize(self, vectors) -> np.ndarray:
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        self._faiss.normalize_L2(matrix)
+        return matrix
+
+    def _after_write(self):
+        self.last_write_at = time.time()
+        self._pending_writes += 1
+        if self.save_every and self._pending_writes >= self.save_every and not self._saving:
+            # Never serialize the index inside the write path (caller holds the lock)
+            self._saving = True
+            threading.Thread(
+                target=self._background_save, name='faiss-replica-save', daemon=True
+            ).start()
+
+    # ----------------------------------------------------- listener interface
+
+    def on_upsert(self, vectors: List[Dict[str, Any]]):
+        """Insert or overwrite vectors written to the vector store"""
+        vectors = [v for v in vectors if v.get('values') is not None and len(v['values']) > 0]
+        if not vectors:
+            return
+        # Last write wins for duplicate IDs within one batch
+        latest = {v['id']: v for v in vectors}
+        records = [
+            {'id': vector_id, 'metadata': dict(v.get('metadata') or {})}
+            for vector_id, v in latest.items()
+        ]
+        normalized = self._normalize([v['values'] for v in latest.values()])
+        with self._lock:
+            self._tombstone(latest.keys())
+            self._append(records, normalized)
+            self._after_write()
+
+    def on_delete(self, vector_ids: List[str]):
+        """Tombstone deleted vectors"""
+        with self._lock:
+            if self._tombstone(vector_ids):
+                self._after_write()
+
+    def on_delete_all(self):
+        """Drop every vector"""
+        with self._lock:
+            self._reset()
+            self._after_write()
+
+    def build(self, batches: Iterable[List[Dict[str, Any]]]) -> int:
+        """
+        Replace the replica contents with an export
+
+        Args:
+            batches: Iterable of vector batches ({'id', 'values', 'metadata'})
+
+        Returns:
+            Number of vectors in the rebuilt replica
+        """
+        save_every, self.save_every = self.save_every, 0
+        try:
+            with self._lock:
+                self._reset()
+                for batch in batches:
+                    self.on_upsert(batch)
+            # save() takes its own lock first; calling it under self._lock could deadlock
+            self.save()
+        finally:
+            self.save_every = save_every
+        return len(self)
+
+    # --------------------------------------------------------------- queries
+
+    def search(
+        self,
+        query_features: List[float],
+        top_k: int = 10,
+        category_filter: Optional[str] = None,
+        min_score: float = 0.0,
+        include_values: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the replica (same result format as PineconeVectorService.search)
+
+        Args:
+            query_features: Query feature vector
+            top_k: Number of results to return
+            category_filter: Optional category filter
+            min_score: Minimum similarity score threshold
+            include_values: Return vector values with each match
+
+        Returns:
+            List of similar vectors with metadata, scores and values
+        """
+        start = time.perf_counter()
+        query = self._normalize(query_features)
+
+        with self._lock:
+            total = len(self._records)
+            if total == 0:
+                return []
+
+            params = self._faiss.SearchParametersHNSW(efSearch=max(self.ef_search, top_k))
+            mask = None
+            allowed = total
+            if category_filter:
+                mask = self._live & (self._categories == category_filter)
+            elif not self._live.all():
+                mask = self._live
+            if mask is not None:
+                allowed = int(mask.sum())
+                if allowed == 0:
+                    return []
+                bits = np.packbits(mask, bitorder='little')
+                selector = self._faiss.IDSelectorBitmap(total, self._faiss.swig_ptr(bits))
+                params.sel = selector
+
+            k = min(top_k, allowed)
+            scores, labels = self.index.search(query, k, params=params)
+            if mask is not None and int((labels[0] >= 0).sum()) < k:
+                # The filter left too few allowed vectors among HNSW's candidates
+                scores, labels = self._exact_search(query, mask, k)
+                self._exact_fallbacks += 1
+            hits = [
+                (int(label), float(score))
+                for label, score in zip(labels[0], scores[0])
+                if label >= 0 and score >= min_score
+            ]
+            matches = [{
+                'id': self._records[label]['id'],
+                'score': score,
+                'metadata': dict(self._records[label]['metadata'])
+            } for label, score in hits]
+            if include_values and hits:
+                values = self.index.reconstruct_batch(np.array([label for label, _ in hits]))
+                for match, vector in zip(matches, values):
+                    match['values'] = vector.tolist()
+
+            self._searches += 1
+            self._search_time += time.perf_counter() - start
+
+        return matches
+
+    def _exact_search(self, query: np.ndarray, mask: np.ndarray, k: int):
+        """Brute-force top-k over the allowed labels (caller holds the lock)"""
+        labels = np.flatnonzero(mask)
+        scores = self.index.reconstruct_batch(labels) @ query[0]
+        top = np.argsort(-scores)[:k]
+        return scores[top][None, :], labels[top][None, :]
+
+    def ids(self) -> List[str]:
+        """All live vector IDs"""
+        with self._lock:
+            return list(self._id_to_label.keys())
+
+    def __len__(self) -> int:
+        return len(self._id_to_label)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get replica statistics"""
+        with self._lock:
+            return {
+                'vectors': len(self),
+                'tombstones': len(self._records) - len(self),
+                'unsaved_writes': self._pending_writes,
+                'searches': self._searches,
+                'exact_fallbacks': self._exact_fallbacks,
+                'mean_search_ms': (
+                    self._search_time / self._searches * 1000 if self._searches else 0.0
+                ),
+                'hnsw_m': self.hnsw_m,
+                'ef_search': self.ef_search
+            }
@@ -0,0 +1,112 @@
+"""
+Local Image Service
+Stores uploaded images on disk for running without Cloudinary
+"""
+
+import hashlib
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Setup path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Handle both module and direct imports
+try:
+    from backend.config import Config
+    config = Config
+except ImportError:
+    from config import Config
+    config = Config
+
+logger = logging.getLogger(__name__)
+
+# URL prefix the backend serves LOCAL_IMAGE_DIR under
+LOCAL_IMAGE_URL_PREFIX = '/local-images'
+
+
+class LocalImageService:
+    """Drop-in replacement for CloudinaryImageService.upload_image/delete_image"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize local image storage
+
+        Args:
+            directory: Storage directory (default: config.LOCAL_IMAGE_DIR)
+        """
+        self.directory = Path(directory or config.LOCAL_IMAGE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        logger.info("✅ Local image service initialized")
+        logger.info(f"   Path: {self.directory}")
+
+    def upload_image(
+        self,
+        file_data: bytes,
+        filename: str,
+        category: str
+    ) -> Dict[str, Any]:
+        """
+        Store image on disk
+
+        Args:
+            file_data: Image binary data
+            filename: Original filename
+            category: Image category (healthcare, satellite, surveillance)
+
+        Returns:
+            Dict with the same keys the Cloudinary upload result provides
+        """
+        stem, ext = os.path.splitext(os.path.basename(filename))
+        # Content hash suffix keeps names unique like Cloudinary's unique_filename
+        public_id = f"quantum-images/{category}/{stem}_{hashlib.sha1(file_data).hexdigest()[:8]}"
+        relative_path = f"{public_id}{ext.lower() or '.jpg'}"
+
+        path = self.directory / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(file_data)
+
+        logger.info(f"✅ Stored locally: {relative_path}")
+        return {
+            'public_id': public_id,
+            'secure_url': f"{LOCAL_IMAGE_URL_PREFIX}/{relative_path}",
+            'format': (ext.lstrip('.').lower() or 'jpg'),
+            'bytes': len(file_data)
+        }
+
+    def delete_image(self, public_id: str) -> bool:
+        """
+        Delete a stored image
+
+        Args:
+            public_id: Public ID returned by upload_image
+
+        Returns:
+            True if a file was deleted
+        """
+        deleted = False
+        for path in (self.directory / public_id).parent.glob(f"{Path(public_id).name}.*"):
+            path.unlink()
+            deleted = True
+        return deleted
+
+
+def create_image_service(backend: Optional[str] = None):
+    """
+    Create the configured image storage backend
+
+    Args:
+        backend: 'cloudinary' or 'local' (default: config.IMAGE_STORAGE_BACKEND)
+
+    Returns:
+        CloudinaryImageService or LocalImageService
+    """
+    backend = (backend or config.IMAGE_STORAGE_BACKEND).lower()
+    if backend == 'cloudinary':
+        from services.cloudinary_service import CloudinaryImageService
+        return CloudinaryImageService()
+    if backend == 'local':
+        return LocalImageService()
+    raise ValueError(f"Unknown image storage backend: {backend}")
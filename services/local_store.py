@@ -0,0 +1,377 @@
+"""
+Local Memory-Mapped Row Store
+Keyed float32 rows in a growable memory-mapped file with an append-only key log
+"""
+
+import heapq
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, keep to one writer process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class MmapRowStore:
+    """
+    Persistent keyed store of fixed-shape float32 rows
+
+    Layout inside `directory`:
+        {name}.f32   raw float32 rows (memory-mapped, grows by doubling)
+        {name}.keys  append-only log of "key<TAB>row" lines (row -1 = deleted)
+        {name}.json  row shape and capacity
+        {name}.lock  lock file serializing writers across processes
+
+    Rows are read straight from the page cache, so reopening a store after a
+    restart costs only the key log replay. Several processes may open the
+    same store: writes allocate rows under an exclusive file lock after
+    catching up on the key log, and every operation first replays the log
+    lines other processes appended, so keys written elsewhere are visible.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        row_shape: Sequence[int],
+        name: str = 'rows',
+        initial_capacity: int = 1024
+    ):
+        """
+        Open (or create) a row store
+
+        Args:
+            directory: Directory holding the store files
+            row_shape: Shape of every row, e.g. (2048,) or (4, 2048)
+            name: File name prefix inside the directory
+            initial_capacity: Rows allocated when the store is created
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.row_shape = tuple(int(d) for d in row_shape)
+        self.row_size = int(np.prod(self.row_shape))
+
+        self._data_path = self.directory / f"{name}.f32"
+        self._keys_path = self.directory / f"{name}.keys"
+        self._meta_path = self.directory / f"{name}.json"
+        self._lock_path = self.directory / f"{name}.lock"
+
+        self._lock = threading.RLock()
+        self._lock_file = open(self._lock_path, 'a+')
+        self._key_to_row: Dict[str, int] = {}
+        self._free_heap: List[int] = []
+        self._free_set: Set[int] = set()
+        self._next_row = 0
+        self._capacity = 0
+        self._data: Optional[np.memmap] = None
+        # Position of the key log replayed so far, and the log file's identity
+        self._log_offset = 0
+        self._log_id: Optional[Tuple[int, int]] = None
+
+        self._open(max(1, int(initial_capacity)))
+
+    # ------------------------------------------------------------------ setup
+
+    @contextmanager
+    def _exclusive(self):
+        """Hold the thread lock and the cross-process file lock"""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open(self, initial_capacity: int):
+        """Load metadata, replay the key log and map the data file"""
+        with self._exclusive():
+            if self._meta_path.exists():
+                with open(self._meta_path, 'r') as f:
+                    meta = json.load(f)
+                if tuple(meta['row_shape']) != self.row_shape:
+                    raise ValueError(
+                        f"Row shape mismatch for {self._data_path}: "
+                        f"{tuple(meta['row_shape'])} != {self.row_shape}"
+                    )
+                capacity = int(meta['capacity'])
+            else:
+                capacity = initial_capacity
+
+            log_lines = self._sync()
+            self._map(max(capacity, self._capacity))
+
+            # Compact the key log when it is mostly superseded entries
+            if log_lines > 2 * len(self._key_to_row) + 1024:
+                self._rewrite_key_log()
+        logger.info(f"Row store ready: {self._data_path} ({len(self._key_to_row)} rows)")
+
+    def _reset_state(self):
+        self._key_to_row = {}
+        self._free_heap = []
+        self._free_set = set()
+        self._next_row = 0
+        self._log_offset = 0
+
+    def _free(self, row: int):
+        if row not in self._free_set:
+            self._free_set.add(row)
+            heapq.heappush(self._free_heap, row)
+
+    def _apply(self, key: str, row: int):
+        """Apply one key log entry to the in-memory mapping"""
+        old = self._key_to_row.pop(key, None)
+        if row < 0:
+            if old is not None:
+                self._free(old)
+            return
+        if old is not None and old != row:
+            self._free(old)
+        self._key_to_row[key] = row
+        self._free_set.discard(row)
+        for free in range(self._next_row, row):
+            self._free(free)
+        self._next_row = max(self._next_row, row + 1)
+
+    def _sync(self) -> int:
+        """
+        Replay key log lines appended since the last sync (caller holds self._lock)
+
+        A replaced or truncated log (clear, compaction) is replayed from the
+        start. Returns the number of lines replayed.
+        """
+        try:
+            stat = os.stat(self._keys_path)
+        except FileNotFoundError:
+            if self._log_id is not None or self._key_to_row:
+                self._reset_state()
+                self._log_id = None
+            return 0
+
+        log_id = (stat.st_dev, stat.st_ino)
+        if log_id != self._log_id or stat.st_size < self._log_offset:
+            self._reset_state()
+            self._log_id = log_id
+        if stat.st_size == self._log_offset:
+            return 0
+
+        lines = 0
+        with open(self._keys_path, 'rb') as f:
+            f.seek(self._log_offset)
+            chunk = f.read(stat.st_size - self._log_offset)
+        # A writer may be mid-append; stop at the last complete line
+        complete = chunk.rfind(b'\n') + 1
+        for line in chunk[:complete].decode('utf-8').split('\n'):
+            if not line:
+                continue
+            lines += 1
+            key, _, row = line.rpartition('\t')
+            self._apply(key, int(row))
+        self._log_offset += complete
+
+        if self._data is not None and self._next_row > self._capacity:
+            # Another process grew the data file
+            self._map(max(self._next_row, self._capacity * 2))
+        return lines
+
+    def _append_log(self, lines: List[str]):
+        """Append entries to the key log (caller holds the exclusive lock and is synced)"""
+        if not lines:
+            return
+        with open(self._keys_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+        stat = os.stat(self._keys_path)
+        self._log_id = (stat.st_dev, stat.st_ino)
+        self._log_offset = stat.st_size
+
+    def _rewrite_key_log(self):
+        """Rewrite the key log with only live entries (caller holds the exclusive lock)"""
+        tmp_path = self._keys_path.with_suffix('.keys.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, row in self._key_to_row.items():
+                f.write(f"{key}\t{row}\n")
+        os.replace(tmp_path, self._keys_path)
+        stat = os.stat(self._keys_path)
+        self._log_id = (stat.st_dev, stat.st_ino)
+        self._log_offset = stat.st_size
+
+    def _map(self, capacity: int):
+        """(Re)map the data file with at least `capacity` rows"""
+        capacity = max(capacity, self._next_row, 1)
+        needed_bytes = capacity * self.row_size * 4
+
+        if self._data is not None:
+            self._data.flush()
+            self._data = None
+
+        with open(self._data_path, 'ab') as f:
+            if f.tell() < needed_bytes:
+                f.truncate(needed_bytes)
+
+        self._data = np.memmap(
+            self._data_path,
+            dtype=np.float32,
+            mode='r+',
+            shape=(capacity, self.row_size)
+        )
+        self._capacity = capacity
+
+        with open(self._meta_path, 'w') as f:
+            json.dump({'row_shape': list(self.row_shape), 'capacity': capacity}, f)
+
+    # ------------------------------------------------------------- mutations
+
+    def _allocate_row(self) -> int:
+        while self._free_heap:
+            row = heapq.heappop(self._free_heap)
+            if row in self._free_set:
+                self._free_set.discard(row)
+                return row
+        if self._next_row >= self._capacity:
+            self._map(self._capacity * 2)
+        row = self._next_row
+        self._next_row += 1
+        return row
+
+    def put(self, key: str, values: np.ndarray):
+        """Insert or overwrite one row"""
+        self.put_many([key], np.asarray(values, dtype=np.float32)[np.newaxis, ...])
+
+    def put_many(self, keys: Sequence[str], values: np.ndarray):
+        """
+        Insert or overwrite many rows
+
+        Args:
+            keys: Row keys
+            values: Array of shape (len(keys), *row_shape)
+        """
+        values = np.asarray(values, dtype=np.float32).reshape(len(keys), self.row_size)
+        for key in keys:
+            if '\n' in key or '\t' in key:
+                raise ValueError(f"Invalid key for row store: {key!r}")
+        with self._exclusive():
+            self._sync()
+            lines = []
+            for key, row_values in zip(keys, values):
+                row = self._key_to_row.get(key)
+                if row is None:
+                    row = self._allocate_row()
+                    self._key_to_row[key] = row
+                    lines.append(f"{key}\t{row}\n")
+                self._data[row] = row_values
+            self._append_log(lines)
+
+    def delete(self, key: str) -> bool:
+        """Delete one row; returns True if it existed"""
+        return self.delete_many([key]) > 0
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete rows; returns the number removed"""
+        with self._exclusive():
+            self._sync()
+            lines = []
+            for key in keys:
+                row = self._key_to_row.pop(key, None)
+                if row is not None:
+                    self._free(row)
+                    lines.append(f"{key}\t-1\n")
+            self._append_log(lines)
+        return len(lines)
+
+    def clear(self):
+        """Delete every row"""
+        with self._exclusive():
+            # A new (empty) log file: other processes see its new identity and start over
+            tmp_path = self._keys_path.with_suffix('.keys.tmp')
+            open(tmp_path, 'w').close()
+            os.replace(tmp_path, self._keys_path)
+            self._reset_state()
+            stat = os.stat(self._keys_path)
+            self._log_id = (stat.st_dev, stat.st_ino)
+
+    # ----------------------------------------------------------------- reads
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a copy of one row, or None"""
+        with self._lock:
+            self._sync()
+            row = self._key_to_row.get(key)
+            if row is None:
+                return None
+            return np.array(self._data[row]).reshape(self.row_shape)
+
+    def get_many(self, keys: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get rows for many keys
+
+        Returns:
+            Tuple of (rows array (len(keys), *row_shape), found mask (len(keys),))
+            Missing keys have all-zero rows and found=False
+        """
+        with self._lock:
+            self._sync()
+            rows = np.array([self._key_to_row.get(k, -1) for k in keys], dtype=np.int64)
+            found = rows >= 0
+            out = np.zeros((len(keys), self.row_size), dtype=np.float32)
+            if found.any():
+                out[found] = self._data[rows[found]]
+        return out.reshape((len(keys),) + self.row_shape), found
+
+    def items(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Get every key and its row
+
+        Returns:
+            Tuple of (keys, rows array (N, *row_shape))
+        """
+        with self._lock:
+            self._sync()
+            keys = list(self._key_to_row.keys())
+            rows = np.fromiter(self._key_to_row.values(), dtype=np.int64, count=len(keys))
+            data = np.asarray(self._data[rows]) if len(keys) else np.zeros((0, self.row_size), np.float32)
+        return keys, data.reshape((len(keys),) + self.row_shape)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            self._sync()
+            return list(self._key_to_row.keys())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._sync()
+            return key in self._key_to_row
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._key_to_row)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by live rows"""
+        return len(self._key_to_row) * self.row_size * 4
+
+    def flush(self):
+        """Flush rows to disk (key log entries are written as they happen)"""
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+
+    def close(self):
+        """Flush and release file handles"""
+        with self._lock:
+            self.flush()
+            self._data = None
+            if not self._lock_file.closed:
+                self._lock_file.close()
@@ -3,11 +3,15 @@ Pinecone Vector Database Service
 Handles vector storage, indexing, and similarity search
 """
 
+import json
 import logging
+import random
 import sys
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional
 from pathlib import Path
-from pinecone import Pinecone, ServerlessSpec
 import numpy as np
 
 # Setup path for imports
@@ -21,15 +25,55 @@ except ImportError:
     from config import Config
     config = Config
 
+from services.vector_store import UpsertReport, VectorStore
+
 logger = logging.getLogger(__name__)
 
+# JSON bytes of one float value ("-0.0123456789012345, ") when sizing requests
+_FLOAT_JSON_BYTES = 22
+
+_UPSERT_POOL_LOCK = threading.Lock()
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status of a Pinecone SDK error, if it carries one"""
+    for attr in ('status', 'status_code', 'code'):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _is_too_large(error: Exception) -> bool:
+    """Request rejected for its size"""
+    if _status_code(error) == 413:
+        return True
+    message = str(error).lower()
+    return 'too large' in message or 'exceeds the maximum' in message
+
+
+def _is_transient(error: Exception) -> bool:
+    """Worth retrying: throttling, server errors, timeouts, dropped connections"""
+    status = _status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    name = type(error).__name__
+    return any(word in name for word in ('Timeout', 'Connection', 'Unavailable', 'Protocol'))
 
-class PineconeVectorService:
+
+class PineconeVectorService(VectorStore):
     """Service for managing vectors with Pinecone"""
     
     def __init__(self):
         """Initialize Pinecone client and index"""
+        super().__init__()
+        
         try:
+            # Imported here so other backends run without the Pinecone SDK
+            from pinecone import Pinecone, ServerlessSpec
+            
             # Initialize Pinecone
             self.pc = Pinecone(api_key=config.PINECONE_API_KEY)
             
@@ -95,13 +139,13 @@ class PineconeVectorService:
                     features = features[:config.FEATURE_DIMENSION]
             
             # Upsert to Pinecone
-            self.index.upsert(
-                vectors=[{
-                    'id': vector_id,
-                    'values': features,
-                    'metadata': metadata
-                }]
-            )
+            vector = {
+                'id': vector_id,
+                'values': features,
+                'metadata': metadata
+            }
+            self.index.upsert(vectors=[vector])
+            self._notify_listeners('on_upsert', [vector])
             
             logger.info(f"✅ Vector indexed: {vector_id}")
             return True
@@ -121,58 +165,132 @@ class PineconeVectorService:
             vectors_data: List of dicts with 'id', 'values', 'metadata'
             
         Returns:
-            True if successful
+            True if every vector was indexed (see upsert_vectors_batch_detailed)
         """
-        try:
-            if not vectors_data:
-                return True
-            
-            # Prepare batch
-            batch = []
-            for item in vectors_data:
-                features = item['values']
-                
-                # Ensure features is a list
-                if isinstance(features, np.ndarray):
-                    features = features.tolist()
-                
-                # Validate dimension
-                if len(features) != config.FEATURE_DIMENSION:
-                    if len(features) < config.FEATURE_DIMENSION:
-                        features = features + [0.0] * (config.FEATURE_DIMENSION - len(features))
-                    else:
-                        features = features[:config.FEATURE_DIMENSION]
-                
-                batch.append({
-                    'id': item['id'],
-                    'values': features,
-                    'metadata': item['metadata']
-                })
-            
-            # Batch upsert (Pinecone supports up to 100-200 vectors per batch)
-            # Using 100 for optimal performance
-            batch_size = 100
-            total_batches = (len(batch) + batch_size - 1) // batch_size
-            
-            for i in range(0, len(batch), batch_size):
-                batch_chunk = batch[i:i+batch_size]
-                self.index.upsert(vectors=batch_chunk)
-                batch_num = (i // batch_size) + 1
-                logger.info(f"✅ Batch {batch_num}/{total_batches}: {len(batch_chunk)} vectors indexed")
-            
-            logger.info(f"🎯 Total indexed: {len(batch)} vectors in {total_batches} batches")
-            return True
+        return self.upsert_vectors_batch_detailed(vectors_data).ok
+    
+    def upsert_vectors_batch_detailed(self, vectors_data: List[Dict[str, Any]]) -> UpsertReport:
+        """
+        Batch upsert with concurrent, retried requests
+        
+        The batch is split into requests that fit PINECONE_UPSERT_MAX_BYTES
+        (a 2048D vector is ~45 KB of JSON) and at most PINECONE_UPSERT_BATCH_SIZE
+        vectors. Up to PINECONE_UPSERT_CONCURRENCY requests are in flight;
+        throttling, server errors and timeouts are retried with exponential
+        backoff, and a request rejected as too large is split in half.
+        
+        Args:
+            vectors_data: List of dicts with 'id', 'values', 'metadata'
             
-        except Exception as e:
-            logger.error(f"❌ Batch upsert failed: {e}")
-            return False
+        Returns:
+            UpsertReport with one entry per request
+        """
+        report = UpsertReport()
+        if not vectors_data:
+            return report
+        
+        batch = [{
+            'id': item['id'],
+            'values': self._fit_dimension(item['values']),
+            'metadata': item['metadata']
+        } for item in vectors_data]
+        chunks = self._plan_chunks(batch)
+        
+        start = time.perf_counter()
+        if len(chunks) == 1 or config.PINECONE_UPSERT_CONCURRENCY <= 1:
+            results = [self._upsert_chunk(chunk) for chunk in chunks]
+        else:
+            results = list(self._get_upsert_pool().map(self._upsert_chunk, chunks))
+        for entries in results:
+            for ids, attempts, seconds, error in entries:
+                report.add_chunk(ids, attempts, seconds, error)
+        
+        elapsed = time.perf_counter() - start
+        if report.ok:
+            logger.info(
+                f"🎯 Total indexed: {report.succeeded} vectors in {len(report.chunks)} requests "
+                f"({elapsed:.2f}s)"
+            )
+        else:
+            logger.error(
+                f"❌ Batch upsert: {report.succeeded} indexed, {report.failed} failed "
+                f"in {len(report.chunks)} requests"
+            )
+        return report
+    
+    @staticmethod
+    def _request_bytes(vector: Dict[str, Any]) -> int:
+        """Estimated JSON size of one vector in an upsert request"""
+        return (
+            len(vector['id'])
+            + len(vector['values']) * _FLOAT_JSON_BYTES
+            + len(json.dumps(vector['metadata'], default=str))
+            + 64
+        )
+    
+    def _plan_chunks(self, batch: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split vectors into requests under the size and count limits"""
+        chunks, current, current_bytes = [], [], 0
+        for vector in batch:
+            size = self._request_bytes(vector)
+            if current and (
+                len(current) >= config.PINECONE_UPSERT_BATCH_SIZE
+                or current_bytes + size > config.PINECONE_UPSERT_MAX_BYTES
+            ):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(vector)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _upsert_chunk(self, chunk: List[Dict[str, Any]]):
+        """
+        Send one request, retrying transient failures
+        
+        Returns:
+            List of (ids, attempts, seconds, error) - more than one entry
+            when an oversized request had to be split
+        """
+        ids = [vector['id'] for vector in chunk]
+        start = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                self.index.upsert(vectors=chunk)
+                self._notify_listeners('on_upsert', chunk)
+                return [(ids, attempts, time.perf_counter() - start, None)]
+            except Exception as e:
+                if _is_too_large(e) and len(chunk) > 1:
+                    logger.warning(f"⚠️ Upsert of {len(chunk)} vectors too large - splitting")
+                    half = len(chunk) // 2
+                    return self._upsert_chunk(chunk[:half]) + self._upsert_chunk(chunk[half:])
+                if attempts > config.PINECONE_UPSERT_RETRIES or not _is_transient(e):
+                    logger.error(f"❌ Upsert of {len(chunk)} vectors failed after {attempts} attempts: {e}")
+                    return [(ids, attempts, time.perf_counter() - start, str(e))]
+                delay = config.PINECONE_UPSERT_BACKOFF * 2 ** (attempts - 1) * random.uniform(0.5, 1.5)
+                logger.warning(f"⚠️ Upsert attempt {attempts} failed ({e}) - retrying in {delay:.2f}s")
+                time.sleep(delay)
+    
+    def _get_upsert_pool(self) -> ThreadPoolExecutor:
+        """Threads that keep PINECONE_UPSERT_CONCURRENCY requests in flight"""
+        with _UPSERT_POOL_LOCK:
+            if getattr(self, '_upsert_pool', None) is None:
+                self._upsert_pool = ThreadPoolExecutor(
+                    max_workers=config.PINECONE_UPSERT_CONCURRENCY,
+                    thread_name_prefix='pinecone-upsert'
+                )
+            return self._upsert_pool
     
     def search(
         self,
         query_features: List[float],
         top_k: int = 10,
         category_filter: Optional[str] = None,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        include_values: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Search for similar vectors
@@ -182,9 +300,11 @@ class PineconeVectorService:
             top_k: Number of results to return
             category_filter: Optional category filter
             min_score: Minimum similarity score threshold
+            include_values: Return vector values (top_k × 2048 floats over the
+                network; only re-ranking needs them)
             
         Returns:
-            List of similar vectors with metadata and scores
+            List of similar vectors with metadata and scores (and values)
         """
         try:
             # Ensure features is a list
@@ -211,7 +331,7 @@ class PineconeVectorService:
                 top_k=top_k,
                 filter=filter_dict,
                 include_metadata=True,
-                include_values=True  # IMPORTANT: Include vectors for quantum re-ranking
+                include_values=include_values
             )
             
             # Process results
@@ -221,12 +341,14 @@ class PineconeVectorService:
                 
                 # Apply minimum score threshold
                 if score >= min_score:
-                    matches.append({
+                    result = {
                         'id': match['id'],
                         'score': float(score),
-                        'metadata': match.get('metadata', {}),
-                        'values': match.get('values', [])  # Include vector values
-                    })
+                        'metadata': match.get('metadata', {})
+                    }
+                    if include_values:
+                        result['values'] = match.get('values', [])
+                    matches.append(result)
             
             logger.info(f"✅ Found {len(matches)} matches (threshold: {min_score})")
             
@@ -236,6 +358,26 @@ class PineconeVectorService:
             logger.error(f"❌ Search failed: {e}")
             return []
     
+    def fetch(self, vector_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get stored vectors by ID
+        
+        Args:
+            vector_ids: Vector IDs to fetch
+            
+        Returns:
+            Dict of vector ID -> {'id', 'values', 'metadata'} (missing IDs omitted)
+        """
+        response = self.index.fetch(ids=list(vector_ids))
+        return {
+            vector_id: {
+                'id': vector_id,
+                'values': list(vector.values),
+                'metadata': dict(vector.metadata or {})
+            }
+            for vector_id, vector in response.vectors.items()
+        }
+    
     def delete_vector(self, vector_id: str) -> bool:
         """
         Delete a vector from Pinecone
@@ -248,6 +390,7 @@ class PineconeVectorService:
         """
         try:
             self.index.delete(ids=[vector_id])
+            self._notify_listeners('on_delete', [vector_id])
             logger.info(f"🗑️ Deleted vector: {vector_id}")
             return True
             
@@ -255,6 +398,21 @@ class PineconeVectorService:
             logger.error(f"❌ Delete failed: {e}")
             return False
     
+    def list_vector_ids(self, page_size: int = 100) -> Iterator[List[str]]:
+        """
+        Page through every vector ID in the index
+        
+        Args:
+            page_size: IDs per page (1-100)
+            
+        Yields:
+            Lists of vector IDs
+        """
+        for page in self.index.list(limit=page_size):
+            # Older SDKs yield ID lists, newer ones ListResponse objects
+            items = getattr(page, 'vectors', page)
+            yield [getattr(item, 'id', item) for item in items]
+    
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get index statistics
@@ -291,6 +449,7 @@ class PineconeVectorService:
         """
         try:
             self.index.delete(delete_all=True)
+            self._notify_listeners('on_delete_all')
             logger.warning("🗑️ All vectors deleted from index!")
             return True
             
@@ -0,0 +1,245 @@
+"""
+Query Result Cache
+Similarity-search results keyed by a quantized query vector and the search
+parameters, invalidated by per-category generation counters on index writes
+and expired after a maximum age
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of search results
+
+    - Key: hash of the L2-normalized query rounded to 1/quantization steps,
+      plus top_k, category filter and min_score. Identical queries and queries
+      whose embeddings differ by less than the step share an entry.
+    - Invalidation: every write bumps the generation of the categories it
+      touches and a global generation; deletes (whose category is unknown)
+      bump every generation. An entry is served only while the generations it
+      was computed under are unchanged: a category-filtered entry depends on
+      its category, an unfiltered entry on the global generation.
+    - Registered as a vector-store write listener. Writers this process
+      never hears about (the ingestion CLI, snapshot loads, other servers)
+      are covered by sync_external_writes(), fed from the index statistics
+      refresh, and by max_age: no entry is served after max_age seconds.
+
+    Cached vector values are held as float32 arrays; every hit returns fresh
+    dicts, so callers can annotate and re-sort results.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_mb: float = 64.0,
+        quantization: int = 256,
+        max_age: float = 300.0
+    ):
+        """
+        Args:
+            max_entries: Maximum cached queries
+            max_mb: Maximum memory for cached vector values
+            quantization: Steps per unit of a normalized query component
+            max_age: Seconds an entry may be served (0: no limit)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.quantization = quantization
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        # key -> (generation, results, bytes, created at (monotonic))
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]], int, float]]" = OrderedDict()
+        self._bytes = 0
+
+        self._global_generation = 0
+        self._delete_generation = 0
+        self._category_generations: Dict[str, int] = {}
+        self._external_writes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._expired = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------- keys
+
+    def key_for(
+        self,
+        features,
+        top_k: int,
+        category_filter: Optional[str] = None,
+        min_score: float = 0.0,
+        **options
+    ) -> str:
+        """Cache key for a query (extra search options are part of the key)"""
+        vector = np.asarray(features, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        quantized = np.rint(vector * self.quantization).astype(np.int16)
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        digest.update(repr((top_k, category_filter, round(float(min_score), 6), sorted(options.items()))).encode())
+        return digest.hexdigest()
+
+    def _generation(self, category_filter: Optional[str]) -> Tuple[int, int]:
+        """Generations a result depends on (caller holds the lock)"""
+        if category_filter is None:
+            return (self._global_generation, 0)
+        return (self._category_generations.get(category_filter, 0), self._delete_generation)
+
+    # ---------------------------------------------------------- lookups/puts
+
+    def lookup(
+        self,
+        features,
+        top_k: int,
+        category_filter: Optional[str] = None,
+        min_score: float = 0.0,
+        **options
+    ) -> Tuple[str, Tuple[int, int], Optional[List[Dict[str, Any]]]]:
+        """
+        Look up a query
+
+        Returns:
+            Tuple of (cache key, current generation, results or None). Pass the
+            key and generation to put() after searching, so a write that lands
+            during the search invalidates the new entry.
+        """
+        key = self.key_for(features, top_k, category_filter, min_score, **options)
+        with self._lock:
+            generation = self._generation(category_filter)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return key, generation, None
+            if entry[0] != generation:
+                self._stale += 1
+                self._drop(key)
+                return key, generation, None
+            if self.max_age > 0 and time.monotonic() - entry[3] >= self.max_age:
+                self._expired += 1
+                self._drop(key)
+                return key, generation, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            results = entry[1]
+        return key, generation, [self._copy(match) for match in results]
+
+    def put(self, key: str, generation: Tuple[int, int], results: List[Dict[str, Any]]):
+        """Cache search results computed under the given generation"""
+        stored, size = [], 0
+        for match in results:
+            match = dict(match)
+            match['metadata'] = dict(match.get('metadata') or {})
+            if match.get('values') is not None and len(match['values']) > 0:
+                match['values'] = np.asarray(match['values'], dtype=np.float32)
+                size += match['values'].nbytes
+            stored.append(match)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (generation, stored, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    @staticmethod
+    def _copy(match: Dict[str, Any]) -> Dict[str, Any]:
+        match = dict(match)
+        match['metadata'] = dict(match['metadata'])
+        if isinstance(match.get('values'), np.ndarray):
+            match['values'] = match['values'].tolist()
+        return match
+
+    def _drop(self, key: str):
+        """Remove an entry (caller holds the lock)"""
+        size = self._entries.pop(key)[2]
+        self._bytes -= size
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def sync_external_writes(self, count: int):
+        """
+        Invalidate every query when the index changed behind this process
+
+        Args:
+            count: Number of external index changes observed so far
+                (IndexStatsService.external_changes); a new value bumps
+                every generation
+        """
+        with self._lock:
+            if count == self._external_writes:
+                return
+            self._external_writes = count
+            self._global_generation += 1
+            self._delete_generation += 1
+
+    # ----------------------------------------------------- listener interface
+
+    def on_upsert(self, vectors: List[Dict[str, Any]]):
+        """Invalidate unfiltered queries and queries on the written categories"""
+        categories = {(v.get('metadata') or {}).get('category') for v in vectors}
+        with self._lock:
+            self._global_generation += 1
+            for category in categories:
+                if category is None:
+                    # Unknown category: could affect any filtered query
+                    self._delete_generation += 1
+                else:
+                    self._category_generations[category] = self._category_generations.get(category, 0) + 1
+
+    def on_delete(self, vector_ids: List[str]):
+        """Invalidate every query (deleted vectors' categories are unknown)"""
+        with self._lock:
+            self._global_generation += 1
+            self._delete_generation += 1
+
+    def on_delete_all(self):
+        with self._lock:
+            self._global_generation += 1
+            self._delete_generation += 1
+        self.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with hit ratio, lookups by outcome, age limit, size and evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses + self._stale + self._expired
+            return {
+                'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+                'hits': self._hits,
+                'misses': self._misses,
+                'invalidated': self._stale,
+                'expired': self._expired,
+                'max_age_s': self.max_age,
+                'entries': len(self._entries),
+                'capacity': self.max_entries,
+                'size_mb': self._bytes / 1024 / 1024,
+                'max_mb': self.max_bytes / 1024 / 1024,
+                'evictions': self._evictions,
+                'quantization': self.quantization,
+            }
@@ -0,0 +1,212 @@
+"""
+Index Statistics Service
+Cached vector index statistics, refreshed in the background and kept
+current between refreshes by write-listener counters
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IndexStatsService:
+    """
+    O(1) index statistics
+
+    - Reads return the last get_statistics() result plus the writes seen since
+      that refresh started; they never call the vector store
+    - A read older than the TTL starts one background refresh
+    - Registered as a vector-store write listener: upserts of IDs not written
+      since the last refresh count as new vectors and deletes count down.
+      Overwrites of vectors that were already in the index, and the category
+      of such vectors when they are deleted, are corrected at the next refresh.
+
+    A refresh whose total differs from the count predicted by the listener
+    counters means the index was written elsewhere (ingestion CLI, snapshot
+    load, another worker); external_changes counts those refreshes so
+    caches can invalidate on them.
+
+    Per-category counts need a base from the store ('categories' in its
+    statistics, reported by the embedded store); without one only the total
+    is maintained.
+    """
+
+    def __init__(self, vector_store, ttl: float = 30.0):
+        """
+        Args:
+            vector_store: VectorStore whose get_statistics() is cached
+            ttl: Seconds before a read triggers a background refresh
+        """
+        self.vector_store = vector_store
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshed_at: Optional[float] = None  # monotonic
+        self._refreshing = False
+        self._last_error: Optional[str] = None
+
+        # Cumulative write counters, and their values when the snapshot was taken
+        self._added = 0
+        self._removed = 0
+        self._category_added: Counter = Counter()
+        self._category_removed: Counter = Counter()
+        self._base = (0, 0, Counter(), Counter())
+        # Category of every ID written since the current refresh started
+        # (None: deleted); IDs absent here may or may not be in the index
+        self._recent: Dict[str, Optional[str]] = {}
+
+        self.refreshes = 0
+        self.reads = 0
+        self.external_changes = 0
+
+    # ------------------------------------------------------------------ reads
+
+    def get_statistics(self) -> Optional[Dict[str, Any]]:
+        """
+        Current statistics without touching the vector store
+
+        Returns:
+            Store statistics with 'total_vector_count' (and 'categories')
+            adjusted for recent writes, plus 'cached_at' and 'age_s';
+            None before the first refresh has finished
+        """
+        with self._lock:
+            self.reads += 1
+            snapshot = self._snapshot
+            stale = self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.ttl
+            if snapshot is None:
+                result = None
+            else:
+                result = self._current(snapshot)
+        if stale:
+            self.refresh_async()
+        return result
+
+    def _current(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Snapshot plus writes since it was taken (lock held)"""
+        added, removed, category_added, category_removed = self._base
+        stats = dict(snapshot)
+        stats['total_vector_count'] = max(
+            0, snapshot['total_vector_count'] + (self._added - added) - (self._removed - removed)
+        )
+        if 'categories' in snapshot:
+            categories = Counter(snapshot['categories'])
+            categories.update(self._category_added - category_added)
+            categories.subtract(self._category_removed - category_removed)
+            stats['categories'] = {name: count for name, count in sorted(categories.items()) if count > 0}
+        stats['cached_at'] = snapshot['cached_at']
+        stats['age_s'] = round(time.monotonic() - self._refreshed_at, 3)
+        if self._last_error:
+            stats['refresh_error'] = self._last_error
+        return stats
+
+    # -------------------------------------------------------------- refreshes
+
+    def refresh(self) -> Dict[str, Any]:
+        """Fetch statistics from the vector store now (blocking)"""
+        with self._lock:
+            # Writes from here on are counted on top of the new snapshot
+            base = (self._added, self._removed, Counter(self._category_added), Counter(self._category_removed))
+            recent, self._recent = self._recent, {}
+            expected = self._current(self._snapshot)['total_vector_count'] if self._snapshot else None
+
+        start = time.perf_counter()
+        stats = self.vector_store.get_statistics()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._refreshing = False
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            if 'error' in stats and self._snapshot is not None:
+                # Keep serving the last good snapshot; retry after the TTL
+                self._last_error = stats['error']
+                self._recent = {**recent, **self._recent}
+                logger.warning(f"⚠️ Index stats refresh failed, serving cached stats: {stats['error']}")
+                return self._current(self._snapshot)
+            self._last_error = stats.get('error')
+            self._snapshot = {**stats, 'cached_at': datetime.utcnow().isoformat()}
+            self._base = base
+            if expected is not None and stats['total_vector_count'] != expected:
+                self.external_changes += 1
+                logger.info(f"📊 Index changed elsewhere ({expected} → {stats['total_vector_count']} vectors)")
+            logger.info(f"📊 Index stats refreshed in {elapsed * 1000:.0f} ms "
+                        f"({stats['total_vector_count']} vectors)")
+            return self._current(self._snapshot)
+
+    def refresh_async(self) -> bool:
+        """Start a background refresh unless one is running; returns True if started"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self._refresh_quietly, name='index-stats-refresh', daemon=True).start()
+        return True
+
+    def _refresh_quietly(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            with self._lock:
+                self._refreshing = False
+                self._refreshed_at = time.monotonic()
+                self._last_error = str(e)
+            logger.error(f"❌ Index stats refresh failed: {e}")
+
+    # ----------------------------------------------------- listener interface
+
+    def on_upsert(self, vectors: List[Dict[str, Any]]):
+        """Count vectors not written since the last refresh as new"""
+        with self._lock:
+            for vector in vectors:
+                category = (vector.get('metadata') or {}).get('category')
+                if vector['id'] in self._recent:
+                    previous = self._recent[vector['id']]
+                    if previous is not None:
+                        # Overwrite of a vector counted already: move its category
+                        self._category_removed[previous] += 1
+                        self._removed += 1
+                self._added += 1
+                if category:
+                    self._category_added[category] += 1
+                self._recent[vector['id']] = category
+
+    def on_delete(self, vector_ids: List[str]):
+        """Count down deleted vectors (category known for recently written IDs)"""
+        with self._lock:
+            for vector_id in vector_ids:
+                if vector_id in self._recent:
+                    category = self._recent[vector_id]
+                    if category is None:
+                        continue  # already deleted
+                    self._category_removed[category] += 1
+                self._removed += 1
+                self._recent[vector_id] = None
+
+    def on_delete_all(self):
+        """Index emptied: known exactly without a refresh"""
+        with self._lock:
+            self._recent = {}
+            self._base = (self._added, self._removed, Counter(self._category_added), Counter(self._category_removed))
+            if self._snapshot is not None:
+                self._snapshot['total_vector_count'] = 0
+                if 'categories' in self._snapshot:
+                    self._snapshot['categories'] = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Service counters"""
+        with self._lock:
+            return {
+                'reads': self.reads,
+                'refreshes': self.refreshes,
+                'external_changes': self.external_changes,
+                'ttl_s': self.ttl,
+                'age_s': round(time.monotonic() - self._refreshed_at, 3) if self._refreshed_at else None,
+                'tracked_ids': len(self._recent),
+            }
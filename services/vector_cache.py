@@ -0,0 +1,197 @@
+"""
+Vector Value Cache
+Local memory-mapped copy of stored vector values, so searches can skip
+include_values and re-ranking reads candidate vectors from the page cache
+"""
+
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.local_store import MmapRowStore
+
+logger = logging.getLogger(__name__)
+
+# Metadata field every writer (ingestion CLI, upload endpoint) sets per write
+VERSION_FIELD = 'uploaded_at'
+# Stored tag of rows whose write carried no version
+_UNTAGGED = (-1.0, -1.0)
+
+
+def version_tag(metadata: Optional[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+    """
+    Version tag of a vector write: a 48-bit hash of its VERSION_FIELD
+
+    Split into two 24-bit halves, which float32 rows hold exactly.
+    Returns None when the metadata carries no version.
+    """
+    version = (metadata or {}).get(VERSION_FIELD)
+    if not version:
+        return None
+    digest = int.from_bytes(hashlib.blake2b(str(version).encode('utf-8'), digest_size=6).digest(), 'big')
+    return float(digest >> 24), float(digest & 0xFFFFFF)
+
+
+class VectorValueCache:
+    """
+    On-disk float32 ID -> vector cache
+
+    - Filled on upsert (this class is a vector-store write listener) and on
+      the first fetch of a vector written elsewhere (e.g. by another server
+      or before the cache existed)
+    - Every row keeps the version tag of the write it came from; a search
+      candidate whose metadata carries a different version (the ingestion
+      CLI re-wrote the ID, say) is refetched instead of served stale
+    - Deletes seen by this process drop the cached row
+    """
+
+    def __init__(self, directory: str, feature_dim: int):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Directory for the memory-mapped vector file
+            feature_dim: Feature vector dimension
+        """
+        self.feature_dim = feature_dim
+        # Row = vector values followed by the two version tag halves
+        self.store = MmapRowStore(directory, (feature_dim + 2,), name='tagged_vectors')
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._fetched = 0
+        self._fetch_errors = 0
+
+    # ----------------------------------------------------- listener interface
+
+    def on_upsert(self, vectors: List[Dict[str, Any]]):
+        """Cache values of vectors written to the vector store"""
+        vectors = [v for v in vectors if v.get('values') is not None and len(v['values']) == self.feature_dim]
+        if not vectors:
+            return
+        self._put(vectors, np.asarray([v['values'] for v in vectors], dtype=np.float32))
+
+    def _put(self, vectors: List[Dict[str, Any]], matrix: np.ndarray):
+        """Store values with the version tag of each vector's metadata"""
+        tags = np.asarray(
+            [version_tag(v.get('metadata')) or _UNTAGGED for v in vectors], dtype=np.float32
+        )
+        self.store.put_many([v['id'] for v in vectors], np.hstack([matrix, tags]))
+
+    def on_delete(self, vector_ids: List[str]):
+        """Drop deleted vectors"""
+        self.store.delete_many(vector_ids)
+
+    def on_delete_all(self):
+        """Drop every cached vector"""
+        self.store.clear()
+
+    # ------------------------------------------------------------------ reads
+
+    def get_values(
+        self,
+        vector_ids: Sequence[str],
+        fetch: Optional[Callable[[List[str]], Dict[str, Dict[str, Any]]]] = None,
+        versions: Optional[Sequence[Optional[Tuple[float, float]]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get vector values, fetching (and caching) the ones not held locally
+
+        Args:
+            vector_ids: Vector IDs
+            fetch: VectorStore.fetch-like callable for missing IDs (None: local only)
+            versions: Optional expected version tag per ID (see version_tag);
+                cached rows with another tag are treated as missing
+
+        Returns:
+            Dict of vector ID -> float32 vector (IDs that could not be found are omitted)
+        """
+        vector_ids = list(vector_ids)
+        rows, found = self.store.get_many(vector_ids)
+        if versions is not None:
+            tags = rows[:, self.feature_dim:]
+            stale = np.array([
+                bool(found[i]) and expected is not None and tuple(tags[i]) != expected
+                for i, expected in enumerate(versions)
+            ], dtype=bool)
+            self._stale += int(stale.sum())
+            found &= ~stale
+        self._hits += int(found.sum())
+        self._misses += int((~found).sum())
+        values = {vector_id: rows[i, :self.feature_dim] for i, vector_id in enumerate(vector_ids) if found[i]}
+
+        missing = [vector_id for i, vector_id in enumerate(vector_ids) if not found[i]]
+        if missing and fetch is not None:
+            try:
+                fetched = fetch(missing)
+            except Exception as e:
+                self._fetch_errors += 1
+                logger.error(f"❌ Vector fetch failed for {len(missing)} IDs: {e}")
+                fetched = {}
+            fetched = [v for v in fetched.values() if v.get('values') is not None and len(v['values']) == self.feature_dim]
+            if fetched:
+                matrix = np.asarray([v['values'] for v in fetched], dtype=np.float32)
+                self._put(fetched, matrix)
+                self._fetched += len(fetched)
+                values.update((v['id'], row) for v, row in zip(fetched, matrix))
+        return values
+
+    def attach(
+        self,
+        candidates: List[Dict[str, Any]],
+        fetch: Optional[Callable[[List[str]], Dict[str, Dict[str, Any]]]] = None,
+        skip: Optional[Callable[[str], bool]] = None
+    ) -> int:
+        """
+        Set 'values' on search candidates that were returned without them
+
+        Cached values whose version tag differs from the candidate's metadata
+        are refetched.
+
+        Args:
+            candidates: Search results (modified in place)
+            fetch: VectorStore.fetch-like callable for IDs not cached locally
+            skip: Optional predicate for IDs that need no values
+
+        Returns:
+            Number of candidates given values
+        """
+        needed = [
+            c for c in candidates
+            if not (c.get('values') is not None and len(c['values']) > 0)
+            and not (skip is not None and skip(c['id']))
+        ]
+        if not needed:
+            return 0
+        values = self.get_values(
+            [c['id'] for c in needed],
+            fetch,
+            [version_tag(c.get('metadata')) for c in needed]
+        )
+        attached = 0
+        for candidate in needed:
+            if candidate['id'] in values:
+                candidate['values'] = values[candidate['id']]
+                attached += 1
+        return attached
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with stored vectors, size, hit ratio, stale rows and remote fetches
+        """
+        lookups = self._hits + self._misses
+        return {
+            'vectors': len(self.store),
+            'size_mb': self.store.nbytes / 1024 / 1024,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+            'stale': self._stale,
+            'fetched': self._fetched,
+            'fetch_errors': self._fetch_errors,
+        }
@@ -0,0 +1,220 @@
+"""
+Vector Store Interface
+Common API for the vector database backends (Pinecone, embedded)
+"""
+
+import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Setup path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Handle both module and direct imports
+try:
+    from backend.config import Config
+    config = Config
+except ImportError:
+    from config import Config
+    config = Config
+
+logger = logging.getLogger(__name__)
+
+
+class UpsertReport:
+    """
+    Outcome of a batch upsert, chunk by chunk
+
+    Each chunk is a dict with 'ids', 'attempts', 'seconds' and 'error'
+    (None when the chunk landed).
+    """
+
+    def __init__(self):
+        self.chunks: List[Dict[str, Any]] = []
+
+    def add_chunk(self, ids: List[str], attempts: int, seconds: float, error: Optional[str] = None):
+        self.chunks.append({'ids': list(ids), 'attempts': attempts, 'seconds': seconds, 'error': error})
+
+    @property
+    def succeeded(self) -> int:
+        return sum(len(chunk['ids']) for chunk in self.chunks if chunk['error'] is None)
+
+    @property
+    def failed(self) -> int:
+        return sum(len(chunk['ids']) for chunk in self.chunks if chunk['error'] is not None)
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk['error'] is None for chunk in self.chunks)
+
+    def errors(self) -> Dict[str, str]:
+        """Vector ID -> error for every vector that did not land"""
+        return {
+            vector_id: chunk['error']
+            for chunk in self.chunks if chunk['error'] is not None
+            for vector_id in chunk['ids']
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'chunks': [{
+                'size': len(chunk['ids']),
+                'attempts': chunk['attempts'],
+                'seconds': chunk['seconds'],
+                'error': chunk['error'],
+            } for chunk in self.chunks],
+        }
+
+
+class VectorStore(ABC):
+    """
+    Base class for vector store backends
+
+    Search results are dicts with 'id', 'score', 'metadata' and 'values';
+    fetched vectors are dicts with 'id', 'values' and 'metadata'.
+    """
+
+    def __init__(self):
+        # Local replicas/caches notified after successful writes
+        self._write_listeners = []
+
+    def add_write_listener(self, listener: Any):
+        """
+        Register a listener for successful index writes
+
+        Listeners implement on_upsert(vectors), on_delete(vector_ids) and
+        on_delete_all(); they keep local derived data (precomputed terms,
+        replicas, caches) in sync with the index.
+
+        Args:
+            listener: Object implementing the listener methods
+        """
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def _notify_listeners(self, event: str, *args):
+        """Forward a write event to every listener (errors are logged only)"""
+        for listener in self._write_listeners:
+            handler = getattr(listener, event, None)
+            if handler is None:
+                continue
+            try:
+                handler(*args)
+            except Exception as e:
+                logger.warning(f"⚠️ Write listener {type(listener).__name__}.{event} failed: {e}")
+
+    @staticmethod
+    def _fit_dimension(features, dimension: Optional[int] = None) -> List[float]:
+        """Convert to a list and pad/truncate to the index dimension"""
+        dimension = dimension or config.FEATURE_DIMENSION
+        if isinstance(features, np.ndarray):
+            features = features.tolist()
+        if len(features) < dimension:
+            features = list(features) + [0.0] * (dimension - len(features))
+        elif len(features) > dimension:
+            features = features[:dimension]
+        return features
+
+    @abstractmethod
+    def upsert_vector(
+        self,
+        vector_id: str,
+        features: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """Insert or update one vector; returns True if successful"""
+
+    @abstractmethod
+    def upsert_vectors_batch(self, vectors_data: List[Dict[str, Any]]) -> bool:
+        """Insert or update vectors given as dicts with 'id', 'values', 'metadata'"""
+
+    def upsert_vectors_batch_detailed(self, vectors_data: List[Dict[str, Any]]) -> UpsertReport:
+        """
+        Batch upsert that reports which vectors landed
+
+        Backends that split batches into requests override this with one
+        report entry per request; the default treats the batch as one chunk.
+        """
+        report = UpsertReport()
+        start = time.perf_counter()
+        try:
+            error = None if self.upsert_vectors_batch(vectors_data) else 'upsert_vectors_batch returned False'
+        except Exception as e:
+            error = str(e)
+        report.add_chunk([v['id'] for v in vectors_data], 1, time.perf_counter() - start, error)
+        return report
+
+    @abstractmethod
+    def search(
+        self,
+        query_features: List[float],
+        top_k: int = 10,
+        category_filter: Optional[str] = None,
+        min_score: float = 0.0,
+        include_values: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Cosine similarity search ('values' is set on matches only when include_values)"""
+
+    @abstractmethod
+    def fetch(self, vector_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get stored vectors by ID (missing IDs are omitted)"""
+
+    @abstractmethod
+    def delete_vector(self, vector_id: str) -> bool:
+        """Delete one vector; returns True if successful"""
+
+    @abstractmethod
+    def delete_all_vectors(self) -> bool:
+        """Delete every vector; returns True if successful"""
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Any]:
+        """Index statistics (at least 'total_vector_count' and 'dimension')"""
+
+    @abstractmethod
+    def list_vector_ids(self, page_size: int = 100) -> Iterator[List[str]]:
+        """Page through every vector ID"""
+
+    def export_vectors(self, page_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Export all vectors with values and metadata
+
+        Args:
+            page_size: Vectors per yielded batch
+
+        Yields:
+            Lists of dicts with 'id', 'values', 'metadata'
+        """
+        for ids in self.list_vector_ids(page_size):
+            yield list(self.fetch(ids).values())
+
+
+def create_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    Create the configured vector store backend
+
+    Args:
+        backend: 'pinecone' or 'embedded' (default: config.VECTOR_STORE_BACKEND)
+
+    Returns:
+        VectorStore instance
+    """
+    backend = (backend or config.VECTOR_STORE_BACKEND).lower()
+    if backend == 'pinecone':
+        from services.pinecone_service import PineconeVectorService
+        return PineconeVectorService()
+    if backend == 'embedded':
+        from services.embedded_vector_store import EmbeddedVectorStore
+        return EmbeddedVectorStore(
+            config.EMBEDDED_STORE_DIR,
+            config.FEATURE_DIMENSION,
+            read_only=config.EMBEDDED_STORE_READ_ONLY
+        )
+    raise ValueError(f"Unknown vector store backend: {backend}")
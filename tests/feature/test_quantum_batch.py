@@ -0,0 +1,170 @@
+"""
+Test vectorized AE-QIP batch scoring against the per-pair path
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.quantum.ae_qip_v3 import AEQIPAlgorithm
+
+
+def _make_candidates(n=50, dim=2048, seed=42):
+    rng = np.random.default_rng(seed)
+    query = np.abs(rng.standard_normal(dim))
+    candidates = 0.8 * query + 0.5 * np.abs(rng.standard_normal((n, dim)))
+    return query.astype(np.float32), candidates.astype(np.float32)
+
+
+def test_batch_matches_per_pair():
+    """calculate_similarity_batch equals calculate_similarity for every row"""
+    algo = AEQIPAlgorithm(use_quantum_inspired=True)
+    query, candidates = _make_candidates()
+
+    batch_scores = algo.calculate_similarity_batch(query.tolist(), candidates)
+    pair_scores = np.array([
+        algo.calculate_similarity(query.tolist(), row.tolist())
+        for row in candidates
+    ])
+
+    assert batch_scores.shape == (len(candidates),)
+    np.testing.assert_allclose(batch_scores, pair_scores, rtol=0, atol=1e-9)
+    print(f"✅ Batch scores match per-pair (max diff "
+          f"{np.max(np.abs(batch_scores - pair_scores)):.2e})")
+
+
+def test_breakdown_batch_matches_per_pair():
+    """Every breakdown component matches the per-pair breakdown"""
+    algo = AEQIPAlgorithm(use_quantum_inspired=True)
+    query, candidates = _make_candidates(n=20)
+
+    batch = algo.calculate_similarity_with_breakdown_batch(query.tolist(), candidates)
+    assert len(batch) == len(candidates)
+
+    for row, batch_breakdown in zip(candidates, batch):
+        pair_breakdown = algo.calculate_similarity_with_breakdown(
+            query.tolist(), row.tolist()
+        )
+        for key, value in pair_breakdown.items():
+            assert abs(batch_breakdown[key] - value) < 1e-9, key
+    print("✅ Breakdown components match per-pair")
+
+
+def test_precomputed_terms_match_batch():
+    """Scores from stored float32 terms match the on-the-fly batch path"""
+    algo = AEQIPAlgorithm(use_quantum_inspired=True)
+    query, candidates = _make_candidates()
+
+    terms = algo.precompute_terms(candidates)
+    assert terms.shape == (len(candidates), 4, candidates.shape[1])
+    assert terms.dtype == np.float32
+
+    precomputed = algo.calculate_similarity_precomputed(query.tolist(), terms)
+    batch = algo.calculate_similarity_batch(query.tolist(), candidates)
+
+    np.testing.assert_allclose(precomputed, batch, rtol=0, atol=1e-5)
+    print("✅ Precomputed-term scores match batch scores")
+
+
+def test_exact_match_scores_are_finite():
+    """float32 rounding on an identical candidate must not produce NaN"""
+    algo = AEQIPAlgorithm(use_quantum_inspired=True)
+    rng = np.random.default_rng(0)
+    vectors = np.abs(rng.standard_normal((100, 2048))).astype(np.float32)
+    terms = algo.precompute_terms(vectors)
+
+    for i, query in enumerate(vectors):
+        scores = algo.calculate_similarity_precomputed(query.tolist(), terms[i:i + 1])
+        assert np.isfinite(scores[0]) and scores[0] > 0.99
+    print("✅ Exact-match scores stay finite")
+
+
+def test_entanglement_closed_form_matches_svd():
+    """Rank-1 closed form equals the full SVD entropy"""
+    from ml.quantum.ae_qip_v3 import QuantumKernels
+
+    rng = np.random.default_rng(7)
+    v1 = rng.standard_normal(256)
+    v1 /= np.linalg.norm(v1)
+    candidates = rng.standard_normal((4, 256)) * np.array([[1], [1e-3], [1e-11], [0]])
+
+    closed_form = QuantumKernels.quantum_entanglement_measure_batch(v1, candidates)
+    for v2, value in zip(candidates, closed_form):
+        singular_vals = np.linalg.svd(np.outer(v1, v2), compute_uv=False)
+        singular_vals = singular_vals / (np.sum(singular_vals) + 1e-10)
+        entropy = -np.sum(singular_vals * np.log(singular_vals + 1e-10))
+        expected = np.clip(entropy / (np.log(len(singular_vals)) + 1e-10), 0, 1)
+        assert abs(value - expected) < 1e-9
+        assert abs(QuantumKernels.quantum_entanglement_measure(v1, v2) - expected) < 1e-9
+    print("✅ Closed-form entanglement matches SVD")
+
+
+def test_qiskit_scores_each_candidate():
+    """Qiskit mode follows the cosine order of 2048-D candidates"""
+    from ml.quantum.qiskit_circuits import QiskitSimilarityCircuit
+
+    rng = np.random.default_rng(3)
+    dim = 2048
+    query = np.abs(rng.standard_normal(dim))
+    q = query / np.linalg.norm(query)
+    noise = rng.standard_normal((5, dim))
+    noise -= np.outer(noise @ q, q)
+    noise /= np.linalg.norm(noise, axis=1, keepdims=True)
+    cosines = np.array([1.0, 0.91, 0.79, 0.65, 0.55])
+    candidates = cosines[:, None] * q + np.sqrt(1 - cosines[:, None] ** 2) * noise
+
+    algo = AEQIPAlgorithm(use_quantum_inspired=False, exact_probabilities=True)
+    scores = algo.calculate_similarity_batch(query.tolist(), candidates)
+    assert abs(scores[0] - 1.0) < 1e-9
+    assert np.all(np.diff(scores) < 0), scores
+
+    # Exact circuit probabilities equal the product of squared block cosines
+    circuit = QiskitSimilarityCircuit(exact=True)
+    blocks = np.array_split(np.arange(dim), 3)
+    block_cosines = np.stack([
+        candidates[:, b] @ q[b] / (np.linalg.norm(q[b]) * np.linalg.norm(candidates[:, b], axis=1))
+        for b in blocks
+    ], axis=1)
+    expected = np.prod(np.clip(block_cosines, 0, 1) ** 2, axis=1)
+    np.testing.assert_allclose(circuit.similarity_batch(q, candidates), expected, atol=1e-9)
+    np.testing.assert_allclose(scores, expected, atol=1e-9)
+
+    # Shot noise does not reorder them
+    sampled = AEQIPAlgorithm(use_quantum_inspired=False).calculate_similarity_batch(
+        query.tolist(), candidates
+    )
+    assert np.all(np.diff(sampled) < 0), sampled
+    np.testing.assert_allclose(sampled, scores, atol=0.1)
+    print(f"✅ Qiskit scores follow the cosine order ({np.round(scores, 3).tolist()})")
+
+
+def benchmark_batch_speedup():
+    """Compare per-pair loop and vectorized batch wall time"""
+    algo = AEQIPAlgorithm(use_quantum_inspired=True)
+    query, candidates = _make_candidates(n=50)
+
+    start = time.perf_counter()
+    for row in candidates:
+        algo.calculate_similarity(query.tolist(), row.tolist())
+    per_pair_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    algo.calculate_similarity_batch(query.tolist(), candidates)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    print(f"   Per-pair: {per_pair_ms:.2f} ms | Batch: {batch_ms:.2f} ms "
+          f"({per_pair_ms / batch_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    test_batch_matches_per_pair()
+    test_breakdown_batch_matches_per_pair()
+    test_precomputed_terms_match_batch()
+    test_exact_match_scores_are_finite()
+    test_entanglement_closed_form_matches_svd()
+    test_qiskit_scores_each_candidate()
+    benchmark_batch_speedup()
@@ -0,0 +1,107 @@
+"""Test embedded vector store search, writes and persistence"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from services.embedded_vector_store import EmbeddedVectorStore
+
+
+class RecordingListener:
+    def __init__(self):
+        self.events = []
+
+    def on_upsert(self, vectors):
+        self.events.append(('upsert', [v['id'] for v in vectors]))
+
+    def on_delete(self, vector_ids):
+        self.events.append(('delete', list(vector_ids)))
+
+
+def test_exact_search_writes_and_reopen():
+    rng = np.random.default_rng(0)
+    categories = ['healthcare', 'satellite']
+    vectors = [{
+        'id': f'id{i}',
+        'values': rng.standard_normal(16).tolist(),
+        'metadata': {'category': categories[i % 2], 'filename': f'{i}.jpg'}
+    } for i in range(50)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddedVectorStore(tmp, 16, initial_capacity=8)
+        listener = RecordingListener()
+        store.add_write_listener(listener)
+        assert store.upsert_vectors_batch(vectors)
+
+        matrix = np.array([v['values'] for v in vectors])
+        query = np.array(vectors[3]['values'])
+        cosine = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+        expected = [f'id{i}' for i in np.argsort(-cosine)[:5]]
+
+        results = store.search(query.tolist(), top_k=5)
+        assert [r['id'] for r in results] == expected
+        assert abs(results[0]['score'] - 1.0) < 1e-5
+        assert results[0]['metadata']['filename'] == '3.jpg'
+
+        filtered = store.search(query.tolist(), top_k=5, category_filter='healthcare')
+        assert all(r['metadata']['category'] == 'healthcare' for r in filtered)
+
+        assert store.delete_vector('id3')
+        assert store.upsert_vector('id99', vectors[0]['values'], {'category': 'satellite'})
+        assert 'id3' not in [r['id'] for r in store.search(query.tolist(), top_k=5)]
+        assert listener.events[-2:] == [('delete', ['id3']), ('upsert', ['id99'])]
+        store.close()
+
+        reopened = EmbeddedVectorStore(tmp, 16)
+        assert reopened.get_statistics()['total_vector_count'] == 50
+        fetched = reopened.fetch(['id99', 'id3'])
+        assert list(fetched) == ['id99']
+        np.testing.assert_allclose(fetched['id99']['values'], vectors[0]['values'], rtol=1e-6)
+        assert sum(len(ids) for ids in reopened.list_vector_ids(page_size=7)) == 50
+    print("✅ Embedded store search, writes and persistence work")
+
+
+def test_read_only_store_searches_and_rejects_writes():
+    rng = np.random.default_rng(1)
+    vectors = [{
+        'id': f'id{i}',
+        'values': rng.standard_normal(16).tolist(),
+        'metadata': {'category': 'healthcare'}
+    } for i in range(20)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            EmbeddedVectorStore(tmp, 16, read_only=True)
+            assert False, "opened a missing store read-only"
+        except FileNotFoundError:
+            pass
+
+        writer = EmbeddedVectorStore(tmp, 16)
+        writer.upsert_vectors_batch(vectors)
+
+        reader = EmbeddedVectorStore(tmp, 16, read_only=True)
+        matches = reader.search(vectors[5]['values'], top_k=3)
+        assert matches[0]['id'] == 'id5'
+        assert reader.get_statistics()['total_vector_count'] == 20
+
+        assert not reader.upsert_vector('new', vectors[0]['values'], {})
+        assert not reader.delete_vector('id5')
+        assert not reader.delete_all_vectors()
+        assert reader.get_statistics()['total_vector_count'] == 20
+        reader.close()
+        assert writer.get_statistics()['total_vector_count'] == 20
+        writer.close()
+    print("✅ Read-only embedded store searches and refuses writes")
+
+
+if __name__ == "__main__":
+    test_exact_search_writes_and_reopen()
+    test_read_only_store_searches_and_rejects_writes()
@@ -0,0 +1,43 @@
+"""Test content-addressed embedding cache tiers"""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.embedding_cache import EmbeddingCache
+
+
+def test_memory_and_disk_tiers():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(tmp, "model-v1", 4, memory_items=2, disk_items=3)
+        blobs = [bytes([i]) * 100 for i in range(4)]
+        for i, blob in enumerate(blobs):
+            key, features = cache.lookup(blob)
+            assert features is None
+            cache.put(key, [float(i)] * 4)
+
+        stats = cache.get_stats()
+        assert stats['memory_size'] == 2 and stats['memory_evictions'] == 2
+        assert stats['disk_size'] == 3 and stats['disk_evictions'] == 1
+
+        # Newest entry is in memory, an older one only on disk, the oldest is gone
+        assert cache.lookup(blobs[3])[1] == [3.0] * 4
+        assert cache.lookup(blobs[1])[1] == [1.0] * 4
+        assert cache.lookup(blobs[0])[1] is None
+        stats = cache.get_stats()
+        assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 5)
+        cache.close()
+
+        # Disk tier survives restarts, but only for the same model version
+        reopened = EmbeddingCache(tmp, "model-v1", 4, memory_items=2, disk_items=3)
+        np.testing.assert_array_equal(reopened.lookup(blobs[2])[1], [2.0] * 4)
+        other = EmbeddingCache(tmp, "model-v2", 4)
+        assert other.lookup(blobs[2])[1] is None
+    print("✅ Embedding cache tiers, evictions and versioning work")
+
+
+if __name__ == "__main__":
+    test_memory_and_disk_tiers()
@@ -0,0 +1,101 @@
+"""Test local FAISS replica sync, filtering and persistence"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.faiss_replica import FaissReplica
+
+
+def _vectors(n=200, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ['healthcare', 'satellite', 'surveillance']
+    return [{
+        'id': f'id{i}',
+        'values': rng.standard_normal(dim).tolist(),
+        'metadata': {'category': categories[i % 3], 'filename': f'{i}.jpg'}
+    } for i in range(n)]
+
+
+def test_replica_matches_exact_search_and_persists():
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors = _vectors()
+        replica = FaissReplica(tmp, 32, save_every=0)
+        replica.build([vectors[:100], vectors[100:]])
+
+        matrix = np.array([v['values'] for v in vectors])
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query = vectors[7]['values']
+        exact = np.argsort(-(matrix @ (np.array(query) / np.linalg.norm(query))))[:10]
+
+        results = replica.search(query, top_k=10)
+        assert results[0]['id'] == 'id7' and abs(results[0]['score'] - 1.0) < 1e-5
+        recall = len({r['id'] for r in results} & {f'id{i}' for i in exact}) / 10
+        assert recall >= 0.9
+
+        # Deletes and overwrites are hidden from search
+        replica.on_delete(['id7'])
+        replica.on_upsert([{**vectors[8], 'metadata': {'category': 'satellite'}}])
+        assert 'id7' not in [r['id'] for r in replica.search(query, top_k=10)]
+        filtered = replica.search(query, top_k=10, category_filter='satellite')
+        assert filtered and all(r['metadata']['category'] == 'satellite' for r in filtered)
+        assert len(replica) == 199
+
+        # Callers annotate results; the stored records stay untouched
+        filtered[0]['metadata']['category'] = 'changed'
+        assert replica.search(query, top_k=10, category_filter='satellite')[0]['metadata']['category'] == 'satellite'
+        replica.save()
+
+        reopened = FaissReplica(tmp, 32)
+        assert len(reopened) == 199
+        assert reopened.search(vectors[8]['values'], top_k=1)[0]['id'] == 'id8'
+        assert all(r['metadata']['category'] != 'changed' for r in reopened.search(query, top_k=200))
+    print("✅ Replica search, deletes, filters and persistence work")
+
+
+def test_narrow_filter_returns_top_k():
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(1)
+        vectors = [{
+            'id': f'id{i}',
+            'values': rng.standard_normal(32).tolist(),
+            'metadata': {'category': 'healthcare' if i % 100 == 0 else 'satellite'}
+        } for i in range(3000)]
+        replica = FaissReplica(tmp, 32, ef_search=16, save_every=0)
+        replica.build([vectors])
+
+        rare = [v for v in vectors if v['metadata']['category'] == 'healthcare']
+        matrix = np.array([v['values'] for v in rare])
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query = rng.standard_normal(32)
+        exact = [rare[i]['id'] for i in np.argsort(-(matrix @ (query / np.linalg.norm(query))))[:10]]
+
+        results = replica.search(query.tolist(), top_k=10, category_filter='healthcare', min_score=-1)
+        assert [r['id'] for r in results] == exact
+        assert replica.get_stats()['exact_fallbacks'] == 1
+    print("✅ Narrow category filters still return top_k matches")
+
+
+def test_periodic_save_runs_in_background():
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors = _vectors(n=20)
+        replica = FaissReplica(tmp, 32, save_every=10)
+        for vector in vectors[:10]:
+            replica.on_upsert([vector])
+
+        deadline = time.time() + 10
+        while replica.get_stats()['unsaved_writes'] and time.time() < deadline:
+            time.sleep(0.01)
+        assert replica.get_stats()['unsaved_writes'] == 0
+        assert len(FaissReplica(tmp, 32)) == 10
+    print("✅ Replica saves after save_every writes without blocking the writer")
+
+
+if __name__ == "__main__":
+    test_replica_matches_exact_search_and_persists()
+    test_narrow_filter_returns_top_k()
+    test_periodic_save_runs_in_background()
@@ -0,0 +1,86 @@
+"""Test single-read image loading"""
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageFilter
+from torchvision import transforms
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.image_loading import decode_rgb, load_rgb, peak_rss_mb, read_file
+
+
+def test_rgb_images_are_not_copied():
+    image = Image.new('RGB', (4, 4), (1, 2, 3))
+    assert load_rgb(image) is image
+
+    gray = Image.new('L', (4, 4), 7)
+    rgb = load_rgb(gray)
+    assert rgb.mode == 'RGB' and rgb.getpixel((0, 0)) == (7, 7, 7)
+    # Caller-owned images stay usable
+    assert gray.getpixel((0, 0)) == 7
+    print("✅ RGB images pass through, other modes are converted once")
+
+
+def test_file_read_once_decodes_like_the_upload():
+    """The ingestion decode stage: one read, the same buffer decoded and uploaded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'scan.png'
+        Image.new('L', (64, 32), 200).save(path)
+
+        data = read_file(path)
+        assert data == path.read_bytes()
+        image = decode_rgb(data)
+        assert image.mode == 'RGB' and image.size == (64, 32)
+
+        # Paths given to the extractor decode identically
+        assert load_rgb(str(path)).tobytes() == image.tobytes()
+
+    rss = peak_rss_mb()
+    assert rss is None or rss > 0
+    print(f"✅ Read {len(data)} bytes once and decoded them (peak RSS {rss:.0f} MB)")
+
+
+def encode(image, fmt, **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def test_reduced_decode_stays_above_resize_target():
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+    scene = Image.fromarray(noise).resize((4000, 3000), Image.BICUBIC).filter(ImageFilter.GaussianBlur(3))
+
+    jpeg = encode(scene, 'JPEG', quality=90)
+    assert decode_rgb(jpeg).size == (4000, 3000)
+    reduced = decode_rgb(jpeg, 256)
+    assert 256 <= min(reduced.size) < 512
+    assert reduced.mode == 'RGB'
+
+    png = decode_rgb(encode(scene.convert('L'), 'PNG'), 256)
+    assert png.mode == 'RGB' and 256 <= min(png.size) < 512
+
+    # Small images are decoded as-is
+    small = Image.new('RGB', (300, 400), (5, 6, 7))
+    assert decode_rgb(encode(small, 'JPEG'), 256).size == (300, 400)
+
+    # Accuracy guard: model input after Resize(256)/CenterCrop(224) barely changes
+    preprocess = transforms.Compose([
+        transforms.Resize(256), transforms.CenterCrop(224), transforms.ToTensor()
+    ])
+    full_input = preprocess(decode_rgb(jpeg)).flatten()
+    reduced_input = preprocess(reduced).flatten()
+    cosine = float(full_input @ reduced_input / (full_input.norm() * reduced_input.norm()))
+    assert cosine > 0.999
+    assert float((full_input - reduced_input).abs().mean()) < 0.02
+    print(f"✅ 12MP JPEG decoded at {reduced.size}, model input cosine {cosine:.5f}")
+
+
+if __name__ == "__main__":
+    test_rgb_images_are_not_copied()
+    test_file_read_once_decodes_like_the_upload()
+    test_reduced_decode_stays_above_resize_target()
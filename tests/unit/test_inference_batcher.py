@@ -0,0 +1,125 @@
+"""Test micro-batching inference queue groups concurrent requests"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.inference_batcher import InferenceBatcher
+
+
+class SlowBatchExtractor:
+    """Fake extractor that records batch sizes"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.batch_sizes = []
+
+    def extract_batch_features(self, images):
+        self.batch_sizes.append(len(images))
+        time.sleep(self.delay)
+        return [[float(image), 0.0] for image in images]
+
+
+def test_each_caller_gets_its_own_vector():
+    extractor = SlowBatchExtractor()
+    batcher = InferenceBatcher(extractor, max_batch_size=8, max_wait_ms=20)
+
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.extract_features(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.shutdown()
+
+    assert all(results[i] == [float(i), 0.0] for i in range(16))
+    assert max(extractor.batch_sizes) <= 8
+    assert len(extractor.batch_sizes) < 16
+
+    stats = batcher.get_stats()
+    assert stats['requests'] == 16
+    assert stats['batches'] == len(extractor.batch_sizes)
+    assert sum(stats['queue_wait_histogram'].values()) == 16
+    print(f"✅ 16 requests served in {stats['batches']} batches "
+          f"(mean batch size {stats['mean_batch_size']:.1f})")
+
+
+def test_errors_propagate_to_every_caller():
+    class FailingExtractor:
+        def extract_batch_features(self, images):
+            raise RuntimeError("model failure")
+
+    batcher = InferenceBatcher(FailingExtractor(), max_batch_size=4, max_wait_ms=1)
+    future = batcher.submit(object())
+    try:
+        future.result(timeout=5)
+        raised = False
+    except RuntimeError:
+        raised = True
+    batcher.shutdown()
+
+    assert raised
+    assert batcher.get_stats()['errors'] == 1
+    print("✅ Batch failure propagated to caller")
+
+
+def test_short_result_fails_every_caller():
+    class ShortExtractor:
+        def extract_batch_features(self, images):
+            time.sleep(0.02)
+            return [[1.0, 0.0] for _ in images[1:]]  # one image dropped
+
+    batcher = InferenceBatcher(ShortExtractor(), max_batch_size=4, max_wait_ms=50)
+    futures = [batcher.submit(i) for i in range(4)]
+    failed = 0
+    for future in futures:
+        try:
+            future.result(timeout=5)
+        except RuntimeError:
+            failed += 1
+    batcher.shutdown()
+
+    assert failed == 4
+    assert batcher.get_stats()['errors'] == 1
+    print("✅ Short batch result fails every caller instead of hanging")
+
+
+def test_torch_threads_fit_the_cores():
+    os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+    os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+    from backend import executors
+    config = executors.config
+
+    saved = (config.ENABLE_INFERENCE_BATCHING, config.CPU_POOL_WORKERS,
+             config.TORCH_THREADS_PER_WORKER, config.WEB_WORKERS)
+    cpu_share = executors.cpu_share
+    executors.cpu_share = lambda: 8
+    try:
+        config.TORCH_THREADS_PER_WORKER, config.WEB_WORKERS = 0, 1
+        config.ENABLE_INFERENCE_BATCHING, config.CPU_POOL_WORKERS = True, 0
+        assert executors.inference_threads() == 8  # one batcher thread runs every pass
+        config.ENABLE_INFERENCE_BATCHING = False
+        assert executors.inference_threads() == 1  # eight pool threads, one core each
+        config.CPU_POOL_WORKERS = 2
+        assert executors.inference_threads() == 4
+        config.TORCH_THREADS_PER_WORKER = 3
+        assert executors.inference_threads() == 3
+    finally:
+        executors.cpu_share = cpu_share
+        (config.ENABLE_INFERENCE_BATCHING, config.CPU_POOL_WORKERS,
+         config.TORCH_THREADS_PER_WORKER, config.WEB_WORKERS) = saved
+    print("✅ Concurrent inferences x torch threads stay within the cores")
+
+
+if __name__ == "__main__":
+    test_each_caller_gets_its_own_vector()
+    test_errors_propagate_to_every_caller()
+    test_short_result_fails_every_caller()
+    test_torch_threads_fit_the_cores()
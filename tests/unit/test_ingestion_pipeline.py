@@ -0,0 +1,208 @@
+"""Test the staged ingestion pipeline end to end with fake backends"""
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from ingestion.manifest import IngestionManifest
+from ingestion.parallel import shard_paths, thread_budget
+from ingestion.pipeline import CategoryLayout, IngestionPipeline, IngestionSettings
+from services.vector_store import VectorStore
+
+
+class FakeExtractor:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def extract_batch_features(self, images):
+        self.batch_sizes.append(len(images))
+        return [[float(image.getpixel((0, 0))[0]), 1.0] for image in images]
+
+
+class FakeImageService:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.uploaded = []
+
+    def upload_image(self, data, filename, category):
+        with self.lock:
+            self.uploaded.append(filename)
+        stem = Path(filename).stem
+        return {'public_id': f'quantum-images/{category}/{stem}', 'secure_url': f'/img/{filename}'}
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.vectors = {}
+
+    def upsert_vectors_batch(self, vectors):
+        for vector in vectors:
+            self.vectors[vector['id']] = vector
+        return True
+
+    def delete_vector(self, vector_id):
+        return self.vectors.pop(vector_id, None) is not None
+
+    upsert_vectors_batch_detailed = VectorStore.upsert_vectors_batch_detailed
+
+
+def make_images(root: Path):
+    (root / 'brain').mkdir()
+    for i in range(10):
+        Image.new('RGB', (8, 8), (i, 0, 0)).save(root / f'top_{i}.png')
+    for i in range(10, 15):
+        Image.new('L', (8, 8), i).save(root / 'brain' / f'scan_{i}.jpg')
+    (root / 'notes.txt').write_text('not an image')
+    (root / 'broken.png').write_bytes(b'not a png')
+
+
+def test_pipeline_ingests_every_image_in_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_images(root)
+
+        extractor = FakeExtractor()
+        images = FakeImageService()
+        store = FakeVectorStore()
+        settings = IngestionSettings(
+            decode_workers=3, inference_batch_size=4, upload_workers=2,
+            upsert_batch_size=6, queue_size=2, trace_memory=True
+        )
+        pipeline = IngestionPipeline(extractor, images, store, settings)
+        report = pipeline.run(CategoryLayout('healthcare', [tmp]))
+
+    assert report['discovered'] == 16
+    assert report['succeeded'] == 15
+    assert [f['stage'] for f in report['failures']] == ['decode']
+    assert max(extractor.batch_sizes) == 4
+    assert sum(extractor.batch_sizes) == 15
+
+    # Top-level images keep the storage public ID, subfolders get a subcategory
+    assert 'quantum-images_healthcare_top_3' in store.vectors
+    scan = store.vectors['quantum-images_healthcare_brain_scan_12']
+    assert scan['values'] == [12.0, 1.0]
+    assert scan['metadata']['subcategory'] == 'brain'
+    assert scan['metadata']['cloudinary_url'] == '/img/scan_12.jpg'
+
+    assert len(report['images']) == 15
+    assert report['bytes_read'] == sum(trace['bytes_read'] for trace in report['images']) + len(b'not a png')
+    assert all(trace['pixels'] == 64 for trace in report['images'])
+
+    stages = {stage['stage']: stage for stage in report['stages']}
+    assert stages['decode']['processed'] == 15 and stages['decode']['failed'] == 1
+    assert stages['upsert']['processed'] == 15
+    print(f"✅ 16 files → {report['succeeded']} vectors in {len(extractor.batch_sizes)} inference batches")
+
+
+def test_flat_layout_and_failing_upsert():
+    class FailingStore:
+        def upsert_vectors_batch(self, vectors):
+            return False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_images(Path(tmp))
+        layout = CategoryLayout('satellite', [tmp], include_subfolders=False)
+        report = IngestionPipeline(FakeExtractor(), FakeImageService(), FailingStore()).run(layout, limit=5)
+
+    assert report['discovered'] == 5
+    assert report['succeeded'] == 0
+    assert sorted(f['stage'] for f in report['failures']) == ['decode'] + ['upsert'] * 4
+    print("✅ Upsert failures are reported without stalling the pipeline")
+
+
+def test_manifest_turns_reruns_into_delta_syncs():
+    class FlakyImageService(FakeImageService):
+        fail_on = 'top_2.png'
+
+        def upload_image(self, data, filename, category):
+            if filename == self.fail_on:
+                raise ConnectionError('upload timed out')
+            return super().upload_image(data, filename, category)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'images'
+        root.mkdir()
+        make_images(root)
+        (root / 'broken.png').unlink()
+        layout = CategoryLayout('healthcare', [str(root)])
+        manifest = IngestionManifest(Path(tmp) / 'manifest.sqlite')
+        store = FakeVectorStore()
+
+        def run(images, extractor=None):
+            pipeline = IngestionPipeline(extractor or FakeExtractor(), images, store, manifest=manifest)
+            return pipeline.run(layout)
+
+        # First run: one upload fails and is recorded
+        first = run(FlakyImageService())
+        assert first['succeeded'] == 14 and first['failed'] == 1
+        assert manifest.get(root / 'top_2.png')['failed_stage'] == 'upload'
+
+        # Second run only redoes the failed file
+        images = FakeImageService()
+        extractor = FakeExtractor()
+        second = run(images, extractor)
+        assert second['succeeded'] == 1 and second['skipped'] == 14
+        assert images.uploaded == ['top_2.png'] and sum(extractor.batch_sizes) == 1
+        assert manifest.get(root / 'top_2.png')['error'] is None
+
+        # Touched but identical file: skipped by content hash; changed file: redone
+        (root / 'top_4.png').touch()
+        Image.new('RGB', (8, 8), (99, 0, 0)).save(root / 'top_5.png')
+        os.utime(root / 'top_5.png', ns=(1, 1))
+        images = FakeImageService()
+        third = run(images)
+        assert third['succeeded'] == 1 and third['skipped'] == 14
+        assert images.uploaded == ['top_5.png']
+        assert store.vectors['quantum-images_healthcare_top_5']['values'] == [99.0, 1.0]
+
+        # Index wiped: vectors are rewritten but uploads are reused
+        store.vectors.clear()
+        manifest.reset_upserts()
+        images = FakeImageService()
+        fourth = run(images)
+        assert fourth['succeeded'] == 15 and fourth['reused_uploads'] == 15
+        assert images.uploaded == []
+        manifest.close()
+    print("✅ Manifest skips finished files, retries failures and reuses uploads")
+
+
+def test_shards_cover_every_file_and_run_on_their_own():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        files = []
+        for i in range(9):
+            path = root / f"f{i}.jpg"
+            Image.new('RGB', (8 + 40 * i, 8 + 40 * i), (i * 20, 0, 0)).save(path)
+            files.append(path)
+
+        shards = shard_paths(files, 2)
+        assert sorted(p for shard in shards for p in shard) == sorted(files)
+        assert sorted(len(shard) for shard in shards) == [4, 5]
+        sizes = [sum(p.stat().st_size for p in shard) for shard in shards]
+        assert max(sizes) - min(sizes) <= max(p.stat().st_size for p in files)
+
+        assert thread_budget(4, 3) == 3
+        assert thread_budget(10 ** 6) == 1
+
+        store = FakeVectorStore()
+        pipeline = IngestionPipeline(FakeExtractor(), FakeImageService(), store, IngestionSettings())
+        report = pipeline.run(CategoryLayout('satellite', [tmp]), root, paths=shards[0])
+        assert report['discovered'] == report['succeeded'] == len(shards[0])
+        assert {v['metadata']['filename'] for v in store.vectors.values()} == {p.name for p in shards[0]}
+    print("✅ Shards are balanced and each ingests only its own files")
+
+
+if __name__ == "__main__":
+    test_pipeline_ingests_every_image_in_batches()
+    test_flat_layout_and_failing_upsert()
+    test_manifest_turns_reruns_into_delta_syncs()
+    test_shards_cover_every_file_and_run_on_their_own()
@@ -0,0 +1,94 @@
+"""Test memory-mapped keyed row store persistence and sharing between processes"""
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.local_store import MmapRowStore
+
+
+def test_rows_survive_reopen_and_growth():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MmapRowStore(tmp, (2, 3), initial_capacity=2)
+        rows = np.arange(5 * 6, dtype=np.float32).reshape(5, 2, 3)
+        store.put_many([f"id{i}" for i in range(5)], rows)
+        store.delete("id1")
+        store.put("id0", np.ones((2, 3)))
+        store.close()
+
+        reopened = MmapRowStore(tmp, (2, 3))
+        assert len(reopened) == 4
+        assert "id1" not in reopened
+        np.testing.assert_array_equal(reopened.get("id0"), np.ones((2, 3)))
+        np.testing.assert_array_equal(reopened.get("id4"), rows[4])
+
+        values, found = reopened.get_many(["id3", "missing"])
+        assert found.tolist() == [True, False]
+        np.testing.assert_array_equal(values[0], rows[3])
+        reopened.close()
+    print("✅ Row store persists rows across reopen")
+
+
+def test_two_writers_never_share_a_row():
+    with tempfile.TemporaryDirectory() as tmp:
+        server, ingest = MmapRowStore(tmp, (3,)), MmapRowStore(tmp, (3,))
+        server.put('server_backfill', np.ones(3))
+        ingest.put('ingested', np.full(3, 2.0))
+
+        # Each instance sees the other's keys without reopening
+        np.testing.assert_array_equal(server.get('ingested'), np.full(3, 2.0))
+        np.testing.assert_array_equal(ingest.get('server_backfill'), np.ones(3))
+
+        ingest.delete('server_backfill')
+        assert 'server_backfill' not in server
+        server.put('reused', np.full(3, 3.0))
+        np.testing.assert_array_equal(ingest.get('ingested'), np.full(3, 2.0))
+
+        ingest.clear()
+        assert len(server) == 0
+        server.put('after_clear', np.full(3, 4.0))
+        assert ingest.keys() == ['after_clear']
+        server.close()
+        ingest.close()
+
+        reopened = MmapRowStore(tmp, (3,))
+        np.testing.assert_array_equal(reopened.get('after_clear'), np.full(3, 4.0))
+        reopened.close()
+    print("✅ Two instances on one directory allocate distinct rows and see each other's keys")
+
+
+def write_rows(directory, prefix, count):
+    store = MmapRowStore(directory, (4,), initial_capacity=2)
+    for i in range(count):
+        store.put(f'{prefix}{i}', np.full(4, i, dtype=np.float32))
+    store.close()
+
+
+def test_concurrent_processes_keep_their_rows():
+    fork = multiprocessing.get_context('fork')
+    with tempfile.TemporaryDirectory() as tmp:
+        writers = [fork.Process(target=write_rows, args=(tmp, prefix, 300)) for prefix in 'ab']
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join(60)
+            assert writer.exitcode == 0
+
+        store = MmapRowStore(tmp, (4,))
+        assert len(store) == 600
+        for prefix in 'ab':
+            values, found = store.get_many([f'{prefix}{i}' for i in range(300)])
+            assert found.all()
+            np.testing.assert_array_equal(values[:, 0], np.arange(300))
+        store.close()
+    print("✅ Concurrent writer processes keep every row")
+
+
+if __name__ == "__main__":
+    test_rows_survive_reopen_and_growth()
+    test_two_writers_never_share_a_row()
+    test_concurrent_processes_keep_their_rows()
@@ -0,0 +1,69 @@
+"""Test streaming latency aggregation in the metrics collector"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'scripts'))
+
+from metrics_core import MetricsCollector, StreamingHistogram
+
+
+def test_histogram_quantiles_within_bucket_error():
+    latencies = np.random.default_rng(0).lognormal(3, 1, 20000)
+    histogram = StreamingHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    assert histogram.count == len(latencies)
+    assert histogram.min == latencies.min() and histogram.max == latencies.max()
+    assert abs(histogram.mean - latencies.mean()) < 1e-9 * latencies.mean()
+    for q in (0.5, 0.95, 0.99):
+        exact = np.quantile(latencies, q)
+        assert abs(histogram.quantile(q) - exact) / exact < 0.02
+
+    # Out-of-range values are clamped to the exact extremes
+    edge = StreamingHistogram()
+    edge.record(1e-6)
+    edge.record(1e9)
+    assert edge.quantile(0) == 1e-6 and edge.quantile(1) == 1e9
+
+    restored = StreamingHistogram.from_dict(histogram.to_dict())
+    restored.merge(histogram)
+    assert restored.count == 2 * histogram.count
+    assert restored.quantile(0.95) == histogram.quantile(0.95)
+    print("✅ Histogram quantiles are within the bucket error; state round-trips and merges")
+
+
+def test_collector_memory_is_bounded():
+    collector = MetricsCollector(reservoir_size=100)
+    rng = np.random.default_rng(1)
+    for i in range(5000):
+        collector.record_latency('search', float(rng.uniform(10, 20)), throughput=50.0)
+        if i % 10 == 0:
+            collector.record_latency('upload', 100.0)
+
+    assert len(collector.metrics['latency']) == 100
+    operations = {record['operation'] for record in collector.metrics['latency']}
+    assert 'search' in operations
+
+    summary = collector.get_latency_summary()
+    assert summary['search']['count'] == 5000 and summary['upload']['count'] == 500
+    assert 10 <= summary['search']['median'] <= 20
+    assert summary['upload']['p99'] == 100.0
+    assert collector.get_throughput_summary() == {'search': 50.0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'metrics.json')
+        collector.save_metrics(path)
+        loaded = MetricsCollector()
+        loaded.load_metrics(path)
+        assert loaded.get_latency_summary() == summary
+    print("✅ Collector keeps fixed-size aggregates and a bounded sample of raw records")
+
+
+if __name__ == "__main__":
+    test_histogram_quantiles_within_bucket_error()
+    test_collector_memory_is_bounded()
@@ -0,0 +1,95 @@
+"""Test model weight artifacts: seeded heads, checksums and memory-mapped loading"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import torch
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from ml.model_artifacts import artifact_paths, build_model, load_artifact, load_or_create
+from ml.unified_feature_extractor import UnifiedFeatureExtractor, calibration_fingerprint
+
+DIM = 64
+
+
+def test_projection_head_is_seeded():
+    first, second = build_model(DIM, pretrained=False), build_model(DIM, pretrained=False)
+    assert torch.equal(first[2].weight, second[2].weight)
+    assert torch.equal(first[2].bias, second[2].bias)
+    print("✅ Projection head is identical across builds")
+
+
+def test_round_trip_is_memory_mapped():
+    with tempfile.TemporaryDirectory() as tmp:
+        model, manifest = load_or_create(tmp, DIM, pretrained=False)
+        assert manifest['feature_dim'] == DIM and len(manifest['sha256']) == 64
+
+        reloaded, again = load_artifact(tmp, DIM)
+        assert again['sha256'] == manifest['sha256']
+        assert not any(p.is_meta for p in reloaded.parameters())
+
+        batch = torch.randn(2, 3, 224, 224)
+        with torch.no_grad():
+            assert torch.equal(model(batch), reloaded(batch))
+    print("✅ Saved artifact reloads with identical outputs")
+
+
+def test_checksum_mismatch_is_rebuilt():
+    with tempfile.TemporaryDirectory() as tmp:
+        _, manifest = load_or_create(tmp, DIM, pretrained=False)
+        _, manifest_path = artifact_paths(tmp, DIM)
+        manifest['sha256'] = '0' * 64
+        manifest_path.write_text(json.dumps(manifest))
+
+        try:
+            load_artifact(tmp, DIM)
+            assert False, "tampered artifact loaded"
+        except ValueError:
+            pass
+        _, rebuilt = load_or_create(tmp, DIM, pretrained=False)
+        assert rebuilt['sha256'] != '0' * 64
+        load_artifact(tmp, DIM)
+    print("✅ Checksum mismatches are detected and rebuilt")
+
+
+def test_extractor_loads_artifact():
+    with tempfile.TemporaryDirectory() as tmp:
+        _, manifest = load_or_create(tmp, DIM, pretrained=False)
+        image = Image.new('RGB', (64, 48), (120, 30, 200))
+
+        first = UnifiedFeatureExtractor(feature_dim=DIM, artifact_dir=tmp, use_amp=False)
+        second = UnifiedFeatureExtractor(feature_dim=DIM, artifact_dir=tmp, use_amp=False)
+        assert first.model_version.endswith(manifest['sha256'][:8])
+        assert first.model_version == second.model_version
+        assert list(first.extract_features(image)) == list(second.extract_features(image))
+    print("✅ Extractors on the same artifact produce identical embeddings")
+
+
+def test_calibration_fingerprint_tracks_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            path = Path(tmp) / f'{i}.png'
+            Image.new('RGB', (8, 8), (i, i, i)).save(path)
+            paths.append(str(path))
+
+        base = calibration_fingerprint(paths)
+        assert base == calibration_fingerprint(list(paths))
+        assert base != calibration_fingerprint(paths[:2])
+        Image.new('RGB', (16, 16), (9, 9, 9)).save(paths[0])  # same name, new content
+        assert base != calibration_fingerprint(paths)
+
+    images = [Image.new('RGB', (8, 8), (1, 2, 3))]
+    assert calibration_fingerprint(images) != calibration_fingerprint([Image.new('RGB', (8, 8), (3, 2, 1))])
+    print("✅ INT8 cache name changes with the calibration set")
+
+
+if __name__ == "__main__":
+    test_projection_head_is_seeded()
+    test_round_trip_is_memory_mapped()
+    test_checksum_mismatch_is_rebuilt()
+    test_extractor_loads_artifact()
+    test_calibration_fingerprint_tracks_files()
@@ -0,0 +1,107 @@
+"""Test request sizing, retries and per-chunk reporting of Pinecone batch upserts"""
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from backend.config import Config
+from services.pinecone_service import PineconeVectorService
+from services.vector_store import VectorStore
+
+
+class ApiError(Exception):
+    def __init__(self, status, message=''):
+        super().__init__(f"({status}) {message}")
+        self.status = status
+
+
+class FakeIndex:
+    """Fails the first request containing a 'flaky' ID, always rejects 'bad' IDs"""
+
+    def __init__(self, max_vectors_per_request):
+        self.max_vectors = max_vectors_per_request
+        self.lock = threading.Lock()
+        self.requests = []
+        self.stored = {}
+        self.flaky_failed = False
+
+    def upsert(self, vectors):
+        ids = [v['id'] for v in vectors]
+        with self.lock:
+            self.requests.append(len(vectors))
+            if len(vectors) > self.max_vectors:
+                raise ApiError(413, 'Request size too large')
+            if any('bad' in i for i in ids):
+                raise ApiError(400, 'Invalid metadata')
+            if any('flaky' in i for i in ids) and not self.flaky_failed:
+                self.flaky_failed = True
+                raise ApiError(503, 'Service unavailable')
+            for vector in vectors:
+                self.stored[vector['id']] = vector
+
+
+def make_service(index):
+    service = PineconeVectorService.__new__(PineconeVectorService)
+    VectorStore.__init__(service)
+    service.index = index
+    return service
+
+
+def test_chunks_are_sized_retried_and_reported():
+    saved = {name: getattr(Config, name) for name in (
+        'FEATURE_DIMENSION', 'PINECONE_UPSERT_BATCH_SIZE', 'PINECONE_UPSERT_MAX_BYTES',
+        'PINECONE_UPSERT_CONCURRENCY', 'PINECONE_UPSERT_BACKOFF'
+    )}
+    Config.FEATURE_DIMENSION = 2048
+    Config.PINECONE_UPSERT_BATCH_SIZE = 100
+    Config.PINECONE_UPSERT_MAX_BYTES = 1_800_000
+    Config.PINECONE_UPSERT_CONCURRENCY = 3
+    Config.PINECONE_UPSERT_BACKOFF = 0.0
+    try:
+        # 2048D vectors are ~45 KB of JSON each: the byte budget, not the
+        # 100-vector cap, decides the request size
+        service = make_service(FakeIndex(max_vectors_per_request=1000))
+        vectors = [{'id': f'v{i}', 'values': [0.1] * 2048, 'metadata': {'category': 'satellite'}}
+                   for i in range(200)]
+        chunks = service._plan_chunks(vectors)
+        assert all(sum(service._request_bytes(v) for v in chunk) <= Config.PINECONE_UPSERT_MAX_BYTES
+                   for chunk in chunks)
+        assert 1 < len(chunks[0]) < 100
+
+        vectors[5]['id'] = 'v5-flaky'
+        vectors[150]['id'] = 'v150-bad'
+        upserted = []
+        service.add_write_listener(type('Listener', (), {
+            'on_upsert': lambda self, chunk: upserted.extend(v['id'] for v in chunk)
+        })())
+
+        report = service.upsert_vectors_batch_detailed(vectors)
+        assert not report.ok
+        bad_chunk = next(c for c in report.chunks if 'v150-bad' in c['ids'])
+        assert report.failed == len(bad_chunk['ids']) and bad_chunk['attempts'] == 1
+        assert report.succeeded == 200 - len(bad_chunk['ids'])
+        assert next(c for c in report.chunks if 'v5-flaky' in c['ids'])['attempts'] == 2
+        assert set(report.errors()) == set(bad_chunk['ids'])
+        assert sorted(upserted) == sorted(service.index.stored) and 'v5-flaky' in upserted
+        assert service.upsert_vectors_batch(vectors[:10])
+
+        # A request the server rejects as too large is split until it fits
+        Config.PINECONE_UPSERT_MAX_BYTES = 10 ** 9
+        service = make_service(FakeIndex(max_vectors_per_request=16))
+        report = service.upsert_vectors_batch_detailed(vectors[:100])
+        assert report.ok and report.succeeded == 100
+        assert all(len(c['ids']) <= 16 for c in report.chunks)
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+    print("✅ Upserts are split by size, retried when transient and reported per request")
+
+
+if __name__ == "__main__":
+    test_chunks_are_sized_retried_and_reported()
@@ -0,0 +1,148 @@
+"""Test search result caching, LRU bounds and write invalidation"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.query_cache import QueryCache
+from services.stats_service import IndexStatsService
+
+
+def results(n=3, dim=64):
+    rng = np.random.default_rng(n)
+    return [{
+        'id': f'r{i}', 'score': 0.9 - i * 0.01,
+        'metadata': {'category': 'satellite'}, 'values': rng.standard_normal(dim).tolist()
+    } for i in range(n)]
+
+
+def test_hits_near_duplicates_and_returns_copies():
+    cache = QueryCache(max_entries=10)
+    query = np.random.default_rng(0).standard_normal(64)
+
+    key, generation, cached = cache.lookup(query, 10)
+    assert cached is None
+    cache.put(key, generation, results())
+
+    # Scaled and slightly perturbed queries share the entry; other parameters don't
+    near = query * 3 + 1e-6
+    assert cache.lookup(near, 10)[2] is not None
+    assert cache.lookup(query, 5)[2] is None
+    assert cache.lookup(query, 10, 'satellite')[2] is None
+    assert cache.lookup(-query, 10)[2] is None
+
+    hit = cache.lookup(query, 10)[2]
+    hit[0]['quantum_score'] = 1.0
+    hit[0]['metadata']['category'] = 'changed'
+    hit.sort(key=lambda m: m['score'])
+    again = cache.lookup(query, 10)[2]
+    assert 'quantum_score' not in again[0] and again[0]['metadata']['category'] == 'satellite'
+    assert again[0]['id'] == 'r0' and isinstance(again[0]['values'], list)
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 3 and stats['misses'] == 4
+    assert abs(stats['hit_ratio'] - 3 / 7) < 1e-9
+    print("✅ Identical and near-identical queries hit, hits are independent copies")
+
+
+def test_writes_invalidate_affected_queries_only():
+    cache = QueryCache()
+    query = np.ones(16)
+    for category in (None, 'satellite', 'healthcare'):
+        key, generation, _ = cache.lookup(query, 10, category)
+        cache.put(key, generation, results(dim=16))
+
+    cache.on_upsert([{'id': 'x', 'values': [1.0] * 16, 'metadata': {'category': 'satellite'}}])
+    assert cache.lookup(query, 10)[2] is None
+    assert cache.lookup(query, 10, 'satellite')[2] is None
+    assert cache.lookup(query, 10, 'healthcare')[2] is not None
+
+    # Deleted vectors have no known category: everything is invalidated
+    cache.on_delete(['x'])
+    assert cache.lookup(query, 10, 'healthcare')[2] is None
+
+    # A write that lands while a search runs invalidates its result
+    key, generation, _ = cache.lookup(query, 10, 'healthcare')
+    cache.on_upsert([{'id': 'y', 'values': [1.0] * 16, 'metadata': {'category': 'healthcare'}}])
+    cache.put(key, generation, results(dim=16))
+    assert cache.lookup(query, 10, 'healthcare')[2] is None
+    assert cache.get_stats()['invalidated'] >= 4
+    print("✅ Writes invalidate unfiltered queries and queries on the written category")
+
+
+def test_lru_bounds():
+    cache = QueryCache(max_entries=3, max_mb=1)
+    rng = np.random.default_rng(1)
+    queries = [rng.standard_normal(16) for _ in range(4)]
+    for query in queries:
+        key, generation, _ = cache.lookup(query, 10)
+        cache.put(key, generation, results(dim=16))
+    assert cache.lookup(queries[0], 10)[2] is None
+    assert cache.lookup(queries[3], 10)[2] is not None
+
+    # Values count against the memory budget (~1.2 MB here > 1 MB)
+    big = QueryCache(max_entries=100, max_mb=1)
+    for query in queries:
+        key, generation, _ = big.lookup(query, 50)
+        big.put(key, generation, results(n=50, dim=2048))
+    stats = big.get_stats()
+    assert stats['size_mb'] <= 1 and stats['entries'] == 2 and stats['evictions'] == 2
+    print("✅ Cache stays within its entry and memory bounds")
+
+
+class CountStore:
+    """Vector store stand-in whose count other writers change"""
+    total = 10
+
+    def get_statistics(self):
+        return {'total_vector_count': self.total}
+
+
+def test_external_writes_and_max_age_expire_entries():
+    store = CountStore()
+    stats = IndexStatsService(store, ttl=3600)
+    stats.refresh()
+    cache = QueryCache(max_age=3600)
+    query = np.ones(16)
+
+    def fill(category=None):
+        key, generation, _ = cache.lookup(query, 10, category)
+        cache.put(key, generation, results(dim=16))
+
+    # Writes this process saw don't count as external
+    fill()
+    fill('healthcare')
+    stats.on_upsert([{'id': 'x', 'metadata': {'category': 'satellite'}}])
+    store.total = 11
+    stats.refresh()
+    cache.sync_external_writes(stats.external_changes)
+    assert stats.external_changes == 0
+    assert cache.lookup(query, 10, 'healthcare')[2] is not None
+
+    # A bulk load by another process changes the count behind the listeners
+    store.total = 500
+    stats.refresh()
+    cache.sync_external_writes(stats.external_changes)
+    assert stats.external_changes == 1
+    assert cache.lookup(query, 10)[2] is None
+    assert cache.lookup(query, 10, 'healthcare')[2] is None
+
+    # Overwrites keep the count: entries still expire after max_age
+    aged = QueryCache(max_age=0.05)
+    key, generation, _ = aged.lookup(query, 10)
+    aged.put(key, generation, results(dim=16))
+    assert aged.lookup(query, 10)[2] is not None
+    time.sleep(0.1)
+    assert aged.lookup(query, 10)[2] is None
+    assert aged.get_stats()['expired'] == 1
+    print("✅ External index changes and max_age expire cached results")
+
+
+if __name__ == "__main__":
+    test_hits_near_duplicates_and_returns_copies()
+    test_writes_invalidate_affected_queries_only()
+    test_lru_bounds()
+    test_external_writes_and_max_age_expire_entries()
@@ -0,0 +1,96 @@
+"""Test startup warmup, the /ready endpoint and single-flight singleton getters"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends with throwaway data directories
+_data = tempfile.mkdtemp(prefix='readiness-')
+for key, value in {
+    'VECTOR_STORE_BACKEND': 'embedded',
+    'IMAGE_STORAGE_BACKEND': 'local',
+    'EMBEDDED_STORE_DIR': os.path.join(_data, 'vectors'),
+    'LOCAL_IMAGE_DIR': os.path.join(_data, 'images'),
+    'QUANTUM_TERM_STORE_DIR': os.path.join(_data, 'terms'),
+    'EMBEDDING_CACHE_DIR': os.path.join(_data, 'embeddings'),
+    'VECTOR_CACHE_DIR': os.path.join(_data, 'vector_cache'),
+}.items():
+    os.environ.setdefault(key, value)
+
+from fastapi.testclient import TestClient
+
+import backend.backend_server as server
+
+
+class SlowExtractor:
+    """Stands in for ResNet-50: records warmup batch sizes, takes a while to run"""
+    model_version = 'fake'
+    decode_min_side = None
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def get_feature_dim(self):
+        return server.config.FEATURE_DIMENSION
+
+    def extract_features(self, image):
+        return self.extract_batch_features([image])[0]
+
+    def extract_batch_features(self, images):
+        time.sleep(0.05)
+        self.batch_sizes.append(len(images))
+        return [[1.0] + [0.0] * (self.get_feature_dim() - 1) for _ in images]
+
+
+def test_single_flight_builds_once():
+    built = []
+
+    @server.single_flight
+    def get_thing():
+        if not built:
+            time.sleep(0.05)
+            built.append(object())
+        return built[0]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_thing())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1 and all(r is built[0] for r in results)
+    print("✅ Concurrent first calls build a singleton once")
+
+
+def test_ready_after_warmup():
+    extractor = SlowExtractor()
+    server.feature_extractor = extractor
+    server.config.ENABLE_WARMUP = True
+
+    with TestClient(server.app) as client:
+        assert client.get('/health').status_code == 200
+        response = client.get('/ready')
+        deadline = time.time() + 30
+        while response.status_code == 503 and response.json()['status'] == 'warming' and time.time() < deadline:
+            time.sleep(0.02)
+            response = client.get('/ready')
+
+        body = response.json()
+        assert response.status_code == 200, body
+        assert body['status'] == 'ready' and body['error'] is None
+        assert body['steps']['feature_extractor']['status'] == 'ready'
+        assert server.vector_store is not None and server.index_stats is not None
+
+    expected = [1, server.config.INFERENCE_MAX_BATCH_SIZE] if server.config.ENABLE_INFERENCE_BATCHING else [1]
+    assert sorted(set(extractor.batch_sizes)) == sorted(set(expected))
+    assert len(extractor.batch_sizes) == len(expected) * server.config.WARMUP_ITERATIONS
+    print("✅ /ready turns 200 once the extractor and vector store are warm")
+
+
+if __name__ == "__main__":
+    test_single_flight_builds_once()
+    test_ready_after_warmup()
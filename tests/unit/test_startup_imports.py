@@ -0,0 +1,40 @@
+"""Test that importing the API server does not load plotting, report or model libraries"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Loaded on first use only (/api/metrics/export, feature extraction, replicas)
+DEFERRED = ['torch', 'torchvision', 'matplotlib', 'seaborn', 'pptx', 'scipy', 'pandas', 'faiss']
+
+
+def test_server_import_defers_heavy_libraries():
+    env = dict(os.environ, VECTOR_STORE_BACKEND='embedded', IMAGE_STORAGE_BACKEND='local')
+    code = (
+        "import sys, json, backend.backend_server; "
+        f"print(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert loaded == [], f"Imported at server start: {loaded}"
+    print("✅ Server import loads no plotting, report or model libraries")
+
+
+def test_metrics_core_is_shared_with_reports():
+    sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+    import metrics_core
+    import performance_metrics
+
+    assert performance_metrics.MetricsCollector is metrics_core.MetricsCollector
+    print("✅ Report module reuses the metrics core collector")
+
+
+if __name__ == "__main__":
+    test_server_import_defers_heavy_libraries()
+    test_metrics_core_is_shared_with_reports()
@@ -0,0 +1,73 @@
+"""Test cached index statistics kept current by write-listener counters"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from services.embedded_vector_store import EmbeddedVectorStore
+from services.stats_service import IndexStatsService
+
+
+class CountingStore(EmbeddedVectorStore):
+    calls = 0
+
+    def get_statistics(self):
+        self.calls += 1
+        return super().get_statistics()
+
+
+def vector(vector_id, category):
+    return {'id': vector_id, 'values': [1.0, 0.0, 0.5, 0.2], 'metadata': {'category': category}}
+
+
+def test_reads_are_cached_and_follow_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CountingStore(tmp, 4)
+        store.upsert_vectors_batch([vector(f'h{i}', 'healthcare') for i in range(3)])
+
+        stats = IndexStatsService(store, ttl=3600)
+        store.add_write_listener(stats)
+        assert stats.get_statistics() is None  # nothing cached yet: starts a background refresh
+        deadline = time.time() + 5
+        while stats.get_statistics() is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.calls == 1
+
+        store.upsert_vectors_batch([vector('s1', 'satellite'), vector('s2', 'satellite')])
+        store.upsert_vector('s2', [0.0, 1.0, 0.0, 0.0], {'category': 'surveillance'})  # overwrite
+        store.delete_vector('s1')
+        store.delete_vector('s1')
+        store.delete_vector('h0')
+        for _ in range(100):
+            current = stats.get_statistics()
+        assert store.calls == 1
+        truth = store.get_statistics()
+        assert current['total_vector_count'] == truth['total_vector_count'] == 3
+        # h0 predates the snapshot: its category is only known after a refresh
+        assert current['categories'] == {'healthcare': 3, 'surveillance': 1}
+        assert stats.refresh()['categories'] == truth['categories'] == {'healthcare': 2, 'surveillance': 1}
+
+        store.delete_all_vectors()
+        assert stats.get_statistics()['total_vector_count'] == 0
+        assert stats.get_statistics()['categories'] == {}
+
+        # A stale read returns immediately and refreshes in the background
+        stats.ttl = 0
+        store.calls = 0
+        stats.get_statistics()
+        deadline = time.time() + 5
+        while stats.get_stats()['refreshes'] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        assert store.calls >= 1 and stats.get_stats()['refreshes'] >= 3
+    print("✅ Stats are served from cache and follow upserts, overwrites and deletes")
+
+
+if __name__ == "__main__":
+    test_reads_are_cached_and_follow_writes()
@@ -0,0 +1,110 @@
+"""Test lazy vector values: searches without values and the local vector cache"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from services.embedded_vector_store import EmbeddedVectorStore
+from services.vector_cache import VectorValueCache
+
+DIM = 32
+
+
+class CountingStore(EmbeddedVectorStore):
+    fetched = 0
+
+    def fetch(self, vector_ids):
+        self.fetched += len(vector_ids)
+        return super().fetch(vector_ids)
+
+
+def vectors(prefix, n, seed):
+    rng = np.random.default_rng(seed)
+    return [{
+        'id': f'{prefix}{i}', 'values': rng.standard_normal(DIM).tolist(),
+        'metadata': {'category': 'satellite'}
+    } for i in range(n)]
+
+
+def test_search_without_values():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddedVectorStore(tmp, DIM)
+        store.upsert_vectors_batch(vectors('v', 5, 0))
+        query = np.ones(DIM)
+        assert all('values' not in m for m in store.search(query, 3, include_values=False))
+        assert all(len(m['values']) == DIM for m in store.search(query, 3))
+    print("✅ Searches return vector values only when asked to")
+
+
+def test_cache_filled_on_upsert_and_first_fetch():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CountingStore(os.path.join(tmp, 'index'), DIM)
+        early = vectors('old', 4, 1)
+        store.upsert_vectors_batch(early)  # written before the cache existed
+
+        cache = VectorValueCache(os.path.join(tmp, 'cache'), DIM)
+        store.add_write_listener(cache)
+        late = vectors('new', 4, 2)
+        store.upsert_vectors_batch(late)
+
+        candidates = store.search(np.ones(DIM), 8, min_score=-1, include_values=False)
+        assert cache.attach(candidates, store.fetch) == 8
+        assert store.fetched == 4  # only the vectors the cache never saw
+        expected = {v['id']: v['values'] for v in early + late}
+        for candidate in candidates:
+            assert np.allclose(candidate['values'], expected[candidate['id']], atol=1e-6)
+
+        # Second time everything is local; deletes drop cached rows
+        assert cache.attach(store.search(np.ones(DIM), 8, min_score=-1, include_values=False), store.fetch) == 8
+        assert store.fetched == 4
+        store.delete_vector('new0')
+        assert 'new0' not in cache.get_values(['new0'], store.fetch)
+        assert cache.attach([{'id': 'new1', 'values': [1.0] * DIM}]) == 0  # already has values
+
+        stats = cache.get_stats()
+        assert stats['vectors'] == 7 and stats['fetched'] == 4
+        assert stats['hits'] == 12 and stats['misses'] == 5
+
+        # The cache persists across restarts
+        cache.store.flush()
+        reopened = VectorValueCache(os.path.join(tmp, 'cache'), DIM)
+        assert len(reopened.get_values([v['id'] for v in early])) == 4
+    print("✅ Vector values are cached on upsert and first fetch, and served locally")
+
+
+def test_rewritten_vector_is_refetched():
+    """A vector re-written without this cache seeing it (e.g. by the ingestion CLI) is not served stale"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CountingStore(os.path.join(tmp, 'index'), DIM)
+        cache = VectorValueCache(os.path.join(tmp, 'cache'), DIM)
+        old, new = vectors('img', 1, 3)[0], vectors('img', 1, 4)[0]
+        old['metadata']['uploaded_at'] = '2026-01-01T00:00:00Z'
+        new['metadata']['uploaded_at'] = '2026-02-01T00:00:00Z'
+        cache.on_upsert([old])
+        store.upsert_vectors_batch([new])  # the cache is not a listener of this writer
+
+        candidates = store.search(np.ones(DIM), 1, min_score=-1, include_values=False)
+        assert cache.attach(candidates, store.fetch) == 1
+        assert np.allclose(candidates[0]['values'], new['values'], atol=1e-6)
+        assert store.fetched == 1 and cache.get_stats()['stale'] == 1
+
+        # The refetched row carries the new version and is served locally
+        candidates = store.search(np.ones(DIM), 1, min_score=-1, include_values=False)
+        assert cache.attach(candidates, store.fetch) == 1
+        assert np.allclose(candidates[0]['values'], new['values'], atol=1e-6)
+        assert store.fetched == 1 and cache.get_stats()['stale'] == 1
+    print("✅ Cached vectors with an outdated version are refetched")
+
+
+if __name__ == "__main__":
+    test_search_without_values()
+    test_cache_filled_on_upsert_and_first_fetch()
+    test_rewritten_vector_is_refetched()
@@ -0,0 +1,65 @@
+"""Test snapshot export and bulk load between embedded vector stores"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Offline backends: no cloud credentials needed
+os.environ.setdefault('VECTOR_STORE_BACKEND', 'embedded')
+os.environ.setdefault('IMAGE_STORAGE_BACKEND', 'local')
+
+from ingestion.snapshot import export_snapshot, iter_snapshot, load_snapshot
+from services.embedded_vector_store import EmbeddedVectorStore
+
+
+def test_export_and_load_round_trip():
+    rng = np.random.default_rng(0)
+    vectors = [{
+        'id': f'id{i}',
+        'values': rng.standard_normal(16).tolist(),
+        'metadata': {'category': 'satellite', 'filename': f'{i}.jpg', 'subcategory': 'ship'}
+    } for i in range(45)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = EmbeddedVectorStore(tmp / 'source', 16)
+        assert source.upsert_vectors_batch(vectors)
+
+        for dtype, tolerance in (('float32', 1e-7), ('float16', 1e-2)):
+            snapshot = export_snapshot(source, tmp / dtype, dtype=dtype, shard_size=20, page_size=7)
+            assert snapshot['count'] == 45
+            assert [shard['count'] for shard in snapshot['shards']] == [20, 20, 5]
+
+            target = EmbeddedVectorStore(tmp / f'target-{dtype}', 16)
+            report = load_snapshot(target, tmp / dtype, batch_size=8, workers=3)
+            assert report['loaded'] == 45 and report['failed'] == 0
+
+            loaded = target.fetch([v['id'] for v in vectors])
+            for vector in vectors:
+                assert loaded[vector['id']]['metadata'] == vector['metadata']
+                assert np.allclose(loaded[vector['id']]['values'], vector['values'], atol=tolerance)
+
+        with pytest.raises(FileExistsError):
+            export_snapshot(source, tmp / 'float32')
+
+        # A corrupted shard is refused
+        with open(tmp / 'float16' / 'snapshot.json') as f:
+            snapshot = json.load(f)
+        (tmp / 'float16' / snapshot['shards'][1]['file']).write_bytes(b'corrupt')
+        with pytest.raises(ValueError):
+            list(iter_snapshot(tmp / 'float16'))
+
+        # Dimensions must match the target index
+        with pytest.raises(ValueError):
+            load_snapshot(EmbeddedVectorStore(tmp / 'wrong', 8), tmp / 'float32')
+    print("✅ Snapshots round-trip vectors and metadata, and are checked before loading")
+
+
+if __name__ == "__main__":
+    test_export_and_load_round_trip()
@@ -0,0 +1,178 @@
+"""Test multi-worker serving: metrics merged across forked workers, pre-fork model sharing and single-writer stores"""
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+
+# Offline backends with throwaway data directories
+_data = tempfile.mkdtemp(prefix='workers-')
+for key, value in {
+    'VECTOR_STORE_BACKEND': 'embedded',
+    'IMAGE_STORAGE_BACKEND': 'local',
+    'EMBEDDED_STORE_DIR': os.path.join(_data, 'vectors'),
+    'LOCAL_IMAGE_DIR': os.path.join(_data, 'images'),
+    'METRICS_SHARED_DIR': os.path.join(_data, 'metrics'),
+}.items():
+    os.environ.setdefault(key, value)
+
+from metrics_core import MetricsCollector, SharedMetrics
+
+FORK = multiprocessing.get_context('fork')
+
+
+def latencies(seed, n=500):
+    return np.random.default_rng(seed).lognormal(3, 1, n)
+
+
+def test_merge_matches_single_collector():
+    single, first, second = (MetricsCollector(reservoir_size=100) for _ in range(3))
+    for collector, seed in ((first, 0), (second, 1)):
+        for value in latencies(seed):
+            collector.record_latency('search', value, throughput=2.0)
+            single.record_latency('search', value, throughput=2.0)
+
+    first.merge(second)
+    merged, expected = first.get_latency_summary()['search'], single.get_latency_summary()['search']
+    assert merged['count'] == 1000
+    for key in ('min', 'max', 'median', 'p95', 'p99'):
+        assert merged[key] == expected[key], key
+    assert abs(merged['mean'] - expected['mean']) < 1e-9
+    assert first.get_throughput_summary() == {'search': 2.0}
+    assert len(first.metrics['latency']) == 100
+    print("✅ Merged collectors report the same quantiles as one collector")
+
+
+def record_and_publish(directory, seed):
+    collector = MetricsCollector()
+    for value in latencies(seed):
+        collector.record_latency('upload', value)
+    SharedMetrics(directory).publish(collector)
+
+
+def test_shared_metrics_across_processes():
+    with tempfile.TemporaryDirectory() as tmp:
+        share = SharedMetrics(tmp)
+        workers = [FORK.Process(target=record_and_publish, args=(tmp, seed)) for seed in (1, 2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            assert worker.exitcode == 0
+
+        local = MetricsCollector()
+        for value in latencies(0):
+            local.record_latency('upload', value)
+        share.publish(local)  # the caller's own snapshot is replaced by its live collector
+        local.record_latency('upload', 1.0)
+
+        merged, count = share.merged(local)
+        assert count == 3
+        assert merged.get_latency_summary()['upload']['count'] == 1501
+
+        share.clear()
+        assert share.merged(local)[0].get_latency_summary()['upload']['count'] == 501
+    print("✅ Worker snapshots merge into one summary")
+
+
+# Runs in a fresh interpreter, like a gunicorn master: preload, fork, serve in the child
+PREFORK_SCRIPT = """
+import json, multiprocessing
+import numpy as np, torch
+from PIL import Image
+import backend.backend_server as server
+
+def serve(queue):
+    server.configure_worker(2)
+    features = server.feature_extractor.extract_features(Image.new('RGB', (64, 64), (10, 200, 30)))
+    local_stores = any(getattr(server.config, flag) for flag in server.SINGLE_PROCESS_STORES)
+    queue.put([torch.get_num_threads(), server.metrics_share is not None, local_stores,
+               [float(v) for v in features[:4]]])
+
+server.prepare_prefork(2)
+parent_threads = torch.get_num_threads()
+fork = multiprocessing.get_context('fork')
+queue = fork.Queue()
+worker = fork.Process(target=serve, args=(queue,))
+worker.start()
+threads, shares, local_stores, features = queue.get(timeout=60)
+worker.join(30)
+expected = server.feature_extractor.extract_features(Image.new('RGB', (64, 64), (10, 200, 30)))
+print(json.dumps({'parent_threads': parent_threads, 'threads': threads, 'shares_metrics': shares,
+                  'local_stores': local_stores, 'same_features': bool(np.allclose(features, expected[:4]))}))
+"""
+
+
+def test_forked_worker_uses_preloaded_model():
+    from ml.model_artifacts import load_or_create
+
+    models_dir = os.path.join(_data, 'models')
+    load_or_create(models_dir, 64, pretrained=False)
+    env = dict(
+        os.environ, FEATURE_DIMENSION='64', MODEL_ARTIFACT_DIR=models_dir,
+        TORCH_THREADS_PER_WORKER='2', EMBEDDED_STORE_READ_ONLY='true'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', PREFORK_SCRIPT], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True, timeout=180
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # One thread in the parent leaves no OpenMP pool for fork to break
+    assert report['parent_threads'] == 1
+    assert report['threads'] == 2 and report['shares_metrics'] and report['same_features']
+    assert not report['local_stores']
+    print("✅ Forked worker runs the model loaded before fork with its own thread count")
+
+
+def test_workers_refuse_single_writer_stores():
+    from backend import backend_server as server
+
+    config = server.config
+    shared = ['ENABLE_QUANTUM_TERM_STORE', 'ENABLE_VECTOR_CACHE']
+    flags = list(server.SINGLE_PROCESS_STORES) + shared + [
+        'ENABLE_EMBEDDING_CACHE', 'EMBEDDING_CACHE_DISK_ITEMS', 'VECTOR_STORE_BACKEND', 'EMBEDDED_STORE_READ_ONLY'
+    ]
+    saved = {flag: getattr(config, flag) for flag in flags}
+    try:
+        for flag in list(server.SINGLE_PROCESS_STORES) + shared:
+            setattr(config, flag, True)
+        config.ENABLE_EMBEDDING_CACHE, config.EMBEDDING_CACHE_DISK_ITEMS = True, 1000
+        config.VECTOR_STORE_BACKEND, config.EMBEDDED_STORE_READ_ONLY = 'embedded', False
+
+        server.restrict_local_stores(1)
+        assert all(getattr(config, flag) for flag in server.SINGLE_PROCESS_STORES)
+        assert config.EMBEDDING_CACHE_DISK_ITEMS == 1000
+
+        try:
+            server.restrict_local_stores(2)
+            assert False, "several workers started on a writable embedded store"
+        except RuntimeError:
+            pass
+
+        config.EMBEDDED_STORE_READ_ONLY = True
+        server.restrict_local_stores(2)
+        assert not any(getattr(config, flag) for flag in server.SINGLE_PROCESS_STORES)
+        # Row-store backed caches lock row allocation and stay on
+        assert all(getattr(config, flag) for flag in shared)
+        assert config.ENABLE_EMBEDDING_CACHE and config.EMBEDDING_CACHE_DISK_ITEMS == 1000
+    finally:
+        for flag, value in saved.items():
+            setattr(config, flag, value)
+    print("✅ Several workers run only on stores they can share")
+
+
+if __name__ == "__main__":
+    test_merge_matches_single_collector()
+    test_shared_metrics_across_processes()
+    test_forked_worker_uses_preloaded_model()
+    test_workers_refuse_single_writer_stores()